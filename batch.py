@@ -0,0 +1,196 @@
+"""
+녹음 폴더 일괄 처리 CLI.
+
+폴더의 녹음 파일을 웹 업로드와 같은 파이프라인(전사 → AI 분석 → 노트 빌드 → Vault 저장)으로 처리한다.
+이미 처리한 파일은 내용 해시(SHA-256)로 건너뛴다 (DATA_DIR/batch_manifest.json).
+--auto-confirm이 없으면 분석 결과는 검토 대기(review)로 작업 저장소에 남고, 웹 UI나 /confirm으로 확정한다.
+
+사용:
+    python batch.py D:\\Recordings --workers 2 --category meeting --auto-confirm
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+import config
+import main as app
+from pipeline.job_store import SQLiteJobBackend
+from pipeline.prompts import PROMPTS
+from pipeline.transcriber import cleanup_pcm_files
+from pipeline.uploads import file_sha256
+
+AUDIO_EXTENSIONS = app.ALLOWED_EXTENSIONS - {".md"}
+
+
+class BatchManifest:
+    """처리한 파일 기록 (sha256 → {file, status, job_id, note_path, processed_at})."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        try:
+            self._entries = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def __contains__(self, sha256: str) -> bool:
+        with self._lock:
+            return sha256 in self._entries
+
+    def mark(self, sha256: str, entry: dict) -> None:
+        with self._lock:
+            self._entries[sha256] = {**entry, "processed_at": datetime.now().isoformat(timespec="seconds")}
+            text = json.dumps(self._entries, ensure_ascii=False, indent=1)
+            # 중간에 끊겨도 기록이 깨지지 않도록 임시 파일에 쓴 뒤 교체
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            tmp.write_text(text, encoding="utf-8")
+            tmp.replace(self.path)
+
+
+def find_recordings(folder: Path, recursive: bool = True) -> list[Path]:
+    """folder 안의 오디오/영상 파일 (이름순)."""
+    pattern = "**/*" if recursive else "*"
+    return sorted(p for p in Path(folder).glob(pattern) if p.is_file() and p.suffix.lower() in AUDIO_EXTENSIONS)
+
+
+def duration_sec(duration: str) -> int:
+    """"MM:SS" 또는 "HH:MM:SS" → 초 (형식이 다르면 0)."""
+    try:
+        parts = [int(p) for p in str(duration).split(":")]
+    except ValueError:
+        return 0
+    sec = 0
+    for p in parts:
+        sec = sec * 60 + p
+    return sec
+
+
+def ingest_file(path: Path, sha256: str, category: str = "meeting", project: str = "", context: str = "",
+                auto_confirm: bool = False) -> dict:
+    """
+    파일 하나를 웹 업로드와 같은 작업으로 처리 (원본 파일은 지우지 않음).
+    auto_confirm이면 분석 결과를 수정 없이 확정해 바로 노트를 저장한다.
+    Returns: 끝난 작업 상태 (status는 done, review, error, cancelled 중 하나)
+    """
+    job_id = str(uuid.uuid4())
+    app.job_status[job_id] = {
+        "status": "queued", "step": "", "progress": 0, "detail": "", "elapsed": 0, "result": None, "error": None,
+        "logs": [], "upload_path": str(path), "upload_size": path.stat().st_size, "upload_sha256": sha256,
+        "batch": True,
+    }
+    app._process(job_id, path, path.stem, project, path.name, context, category, keep_source=True)
+
+    if auto_confirm and app.job_status[job_id].get("status") == "review":
+        job = app.job_status.resume(job_id)
+        job["analysis_edited"] = {}
+        job["status"] = "confirmed"
+        app.job_status.save(job_id)
+        app._finalize(job_id)
+    return {"job_id": job_id, **app.job_status.view(job_id)}
+
+
+def run_batch(folder: Path, workers: int = 1, category: str = "meeting", project: str = "", context: str = "",
+              auto_confirm: bool = False, recursive: bool = True, manifest: BatchManifest | None = None) -> dict:
+    """
+    folder의 녹음 파일을 workers개씩 동시에 처리하고 요약을 반환.
+    성공(done)했거나 검토 대기(review)로 남은 파일만 manifest에 기록하므로 실패한 파일은 다음 실행에서 다시 시도한다.
+    """
+    manifest = manifest or BatchManifest(config.DATA_DIR / "batch_manifest.json")
+    files = find_recordings(folder, recursive)
+    summary = {"files": len(files), "done": 0, "review": 0, "skipped": 0, "failed": 0, "audio_sec": 0}
+    claimed: set[str] = set()
+    lock = threading.Lock()
+    print(f"[Batch] {folder}: 녹음 파일 {len(files)}개, 동시 처리 {workers}개"
+          f"{', 자동 확정' if auto_confirm else ''}")
+
+    def work(path: Path) -> tuple[Path, str, dict | None]:
+        sha256 = file_sha256(path)
+        with lock:
+            # 같은 내용의 파일이 이번 실행에서 이미 처리 중이어도 건너뜀
+            if sha256 in claimed or sha256 in manifest:
+                return path, sha256, None
+            claimed.add(sha256)
+        return path, sha256, ingest_file(path, sha256, category, project, context, auto_confirm)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(work, p) for p in files]
+        for n, fut in enumerate(as_completed(futures), 1):
+            try:
+                path, sha256, job = fut.result()
+            except Exception as e:
+                # 해시 계산 실패 등 작업을 만들기 전 오류
+                summary["failed"] += 1
+                print(f"[Batch] ({n}/{len(files)}) 실패: {e}")
+                continue
+            name = path.relative_to(folder)
+            if job is None:
+                summary["skipped"] += 1
+                print(f"[Batch] ({n}/{len(files)}) {name} — 이미 처리됨, 건너뜀")
+                continue
+            status = job.get("status")
+            if status in ("done", "review"):
+                summary[status] += 1
+                summary["audio_sec"] += duration_sec(job.get("duration", ""))
+                manifest.mark(sha256, {
+                    "file": str(path), "status": status, "job_id": job["job_id"],
+                    "note_path": (job.get("result") or {}).get("note_path"),
+                })
+                where = (job.get("result") or {}).get("note_path") if status == "done" else f"검토 대기 {job['job_id']}"
+                print(f"[Batch] ({n}/{len(files)}) {name} — {job.get('duration', '?')} → {where}")
+            else:
+                summary["failed"] += 1
+                print(f"[Batch] ({n}/{len(files)}) {name} — {status}: {job.get('error') or job.get('detail')}")
+    summary["wall_sec"] = time.perf_counter() - t0
+
+    audio_h, wall_h = summary["audio_sec"] / 3600, summary["wall_sec"] / 3600
+    summary["audio_hours_per_hour"] = audio_h / wall_h if wall_h else 0.0
+    print(f"[Batch] 완료 {summary['done']} / 검토 대기 {summary['review']} / 건너뜀 {summary['skipped']} / "
+          f"실패 {summary['failed']} — 오디오 {audio_h:.2f}시간, 경과 {wall_h:.2f}시간 "
+          f"→ 처리량 {summary['audio_hours_per_hour']:.1f} 오디오시간/시간")
+    return summary
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="녹음 폴더 일괄 전사·분석·Vault 저장")
+    parser.add_argument("folder", type=Path, help="녹음 파일 폴더")
+    parser.add_argument("--workers", type=int, default=config.TRANSCRIBE_WORKERS,
+                        help="동시에 처리할 파일 수 (기본: TRANSCRIBE_WORKERS)")
+    parser.add_argument("--category", default="meeting", choices=list(PROMPTS))
+    parser.add_argument("--project", default="", help="노트에 연결할 프로젝트 (예: [[P Dashboard]])")
+    parser.add_argument("--context", default="", help="전사·분석에 넘길 맥락 (참석자, 용어 등)")
+    parser.add_argument("--auto-confirm", action="store_true", help="검토 없이 분석 결과 그대로 노트 저장")
+    parser.add_argument("--no-recursive", action="store_true", help="하위 폴더는 처리하지 않음")
+    args = parser.parse_args(argv)
+
+    if not args.folder.is_dir():
+        print(f"[Batch] 폴더를 찾을 수 없습니다: {args.folder}")
+        return 2
+    config.validate_config()
+    removed = cleanup_pcm_files()
+    if removed:
+        print(f"[Batch] 남아 있던 PCM 임시 파일 {removed}개 삭제")
+    if config.JOB_STORE == "sqlite":
+        # 서버와 같은 작업 저장소 사용 (검토 대기 작업을 웹 UI/`/confirm`에서 이어서 확정)
+        # 실행 중인 서버의 작업을 건드리지 않도록 _open_job_store()의 중단 작업 복구는 하지 않는다
+        app.job_status.open(SQLiteJobBackend(config.DATA_DIR / "jobs.db"), ttl_sec=config.JOB_TTL_HOURS * 3600)
+    elif not args.auto_confirm:
+        print("[Batch] JOB_STORE=sqlite가 아니면 검토 대기 작업이 남지 않습니다. --auto-confirm을 사용하세요.")
+        return 2
+
+    summary = run_batch(
+        args.folder, workers=args.workers, category=args.category, project=args.project.strip(),
+        context=args.context.strip(), auto_confirm=args.auto_confirm, recursive=not args.no_recursive,
+    )
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,7 +9,33 @@ OPENAI_API_KEY: str = os.environ.get("OPENAI_API_KEY", "").strip()
 GEMINI_API_KEY: str = os.environ.get("GEMINI_API_KEY", "").strip()
 HF_TOKEN: str = os.environ.get("HF_TOKEN", "").strip()
 WHISPER_MODEL: str = os.getenv("WHISPER_MODEL", "base")
+MODEL_CACHE_MAX_MB: int = int(os.getenv("MODEL_CACHE_MAX_MB", "8192"))
+AUDIO_MMAP_MIN_MB: int = int(os.getenv("AUDIO_MMAP_MIN_MB", "128"))
+CHUNK_MIN_SEC: int = int(os.getenv("CHUNK_MIN_SEC", "1800"))
+CHUNK_SEC: int = int(os.getenv("CHUNK_SEC", "600"))
+CHUNK_OVERLAP_SEC: float = float(os.getenv("CHUNK_OVERLAP_SEC", "2"))
+DIARIZE_PARALLEL: bool = os.getenv("DIARIZE_PARALLEL", "true").strip().lower() == "true"
+TRANSCRIPT_CACHE: bool = os.getenv("TRANSCRIPT_CACHE", "true").strip().lower() == "true"
+TRANSCRIPT_CACHE_MAX_MB: int = int(os.getenv("TRANSCRIPT_CACHE_MAX_MB", "1024"))
+WHISPER_PRELOAD: bool = os.getenv("WHISPER_PRELOAD", "false").strip().lower() == "true"
 LLM_MODEL: str = os.getenv("LLM_MODEL", "").strip() or "gemini-2.0-flash"
+ANALYSIS_CHUNK_CHARS: int = int(os.getenv("ANALYSIS_CHUNK_CHARS", "40000"))
+LLM_INPUT_TOKEN_BUDGET: int = int(os.getenv("LLM_INPUT_TOKEN_BUDGET", "30000"))
+ANALYSIS_MAP_WORKERS: int = int(os.getenv("ANALYSIS_MAP_WORKERS", "4"))
+TRANSCRIPT_COMPACT: bool = os.getenv("TRANSCRIPT_COMPACT", "true").strip().lower() == "true"
+COMPACT_FILLERS: str = os.getenv("COMPACT_FILLERS", "어,음,으음,음음,아,에,엄,흠,그러니까,뭐랄까,있잖아")
+LLM_STREAM: bool = os.getenv("LLM_STREAM", "true").strip().lower() == "true"
+LLM_JSON: bool = os.getenv("LLM_JSON", "false").strip().lower() == "true"
+LLM_HEDGE: bool = os.getenv("LLM_HEDGE", "false").strip().lower() == "true"
+LLM_HEDGE_PERCENTILE: float = float(os.getenv("LLM_HEDGE_PERCENTILE", "90"))
+LLM_HEDGE_DELAY_SEC: float = float(os.getenv("LLM_HEDGE_DELAY_SEC", "20"))
+API_RETRIES: int = int(os.getenv("API_RETRIES", "2"))
+API_RETRY_BASE_SEC: float = float(os.getenv("API_RETRY_BASE_SEC", "1"))
+API_RETRY_MAX_SEC: float = float(os.getenv("API_RETRY_MAX_SEC", "20"))
+BREAKER_FAILURES: int = int(os.getenv("BREAKER_FAILURES", "5"))
+BREAKER_RESET_SEC: float = float(os.getenv("BREAKER_RESET_SEC", "60"))
+LLM_CACHE: bool = os.getenv("LLM_CACHE", "true").strip().lower() == "true"
+LLM_CACHE_MAX_MB: int = int(os.getenv("LLM_CACHE_MAX_MB", "256"))
 VAULT_PATH: Path = Path(os.environ.get("VAULT_PATH", "."))
 MEETINGS_FOLDER: str = os.getenv("MEETINGS_FOLDER", "10_Calendar/13_Meetings")
 INBOX_FOLDER: str = os.getenv("INBOX_FOLDER", "00_Inbox")
@@ -18,6 +44,14 @@ AREAS_FOLDER: str = os.getenv("AREAS_FOLDER", "30_Areas")
 PROJECTS_FOLDER: str = os.getenv("PROJECTS_FOLDER", "20_Projects")
 RESOURCES_FOLDER: str = os.getenv("RESOURCES_FOLDER", "40_Resources")
 UPLOAD_DIR: Path = Path(__file__).parent / "uploads"
+MAX_UPLOAD_MB: int = int(os.getenv("MAX_UPLOAD_MB", "2048"))
+MAX_MD_UPLOAD_MB: int = int(os.getenv("MAX_MD_UPLOAD_MB", "5"))
+UPLOAD_RESUME_TTL_HOURS: float = float(os.getenv("UPLOAD_RESUME_TTL_HOURS", "24"))
+DATA_DIR: Path = Path(os.getenv("DATA_DIR", "").strip() or Path(__file__).parent / "data")
+JOB_STORE: str = os.getenv("JOB_STORE", "sqlite").strip().lower()
+JOB_TTL_HOURS: float = float(os.getenv("JOB_TTL_HOURS", "168"))
+TRANSCRIBE_WORKERS: int = int(os.getenv("TRANSCRIBE_WORKERS", "1"))
+LIGHT_WORKERS: int = int(os.getenv("LIGHT_WORKERS", "2"))
 ALLOW_CPU: bool = os.getenv("ALLOW_CPU", "false").strip().lower() == "true"
 DOMAIN_VOCAB: str = os.getenv("DOMAIN_VOCAB", "함정, 선박, 전투체계, 소나, 레이더, 추진체계, 함교, 수상함, 잠수함, 어뢰, 기관실, 항법, 통신체계").strip()
 ACCESS_PIN: str = os.getenv("ACCESS_PIN", "").strip()
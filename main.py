@@ -1,6 +1,9 @@
 import os
+import json
 import uuid
+import asyncio
 import time
+import threading
 from pathlib import Path
 from datetime import date
 from contextlib import asynccontextmanager
@@ -14,26 +17,41 @@ try:
 except Exception:
     pass
 
-from fastapi import FastAPI, Request, UploadFile, File, Form, BackgroundTasks, HTTPException
+from fastapi import FastAPI, Request, Form, HTTPException
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, RedirectResponse, StreamingResponse
 from starlette.middleware.sessions import SessionMiddleware
 from pydantic import BaseModel
 
 import config
 from config import validate_config
-from pipeline.transcriber import transcribe
+from pipeline import clients, model_registry
+from pipeline.transcriber import transcribe, preload_model, cleanup_pcm_files
 from pipeline.analyzer import analyze_transcript
+from pipeline.compactor import compact_segments, estimate_tokens
+from pipeline.latency import get_latency_stats
+from pipeline.resilience import breaker_states
+from pipeline.usage import UsageMeter, get_usage_totals
 from pipeline.note_builder import (
     NoteData, build_meeting_note, build_transcript_note,
     build_discussion_note, build_note, build_source_note,
 )
 from pipeline.vault_writer import VaultWriter
+from pipeline.job_store import JobStore, SQLiteJobBackend, TERMINAL_STATUSES
+from pipeline.scheduler import JobScheduler
+from pipeline.uploads import (
+    OffsetMismatch, ResumableUploads, UploadNotFound, UploadTooLarge,
+    max_upload_bytes, save_multipart,
+)
+
+# 작업 상태 저장소: 진행 중 작업은 메모리, 종료된 작업은 SQLite (lifespan에서 연결)
+job_status = JobStore()
 
-# in-memory job store (단일 프로세스)
-job_status: dict[str, dict] = {}
+# 작업 스케줄러: 전사 슬롯 수를 제한하고, MD 임포트는 별도 레인에서 처리 (lifespan에서 시작)
+scheduler = JobScheduler({"audio": config.TRANSCRIBE_WORKERS, "light": config.LIGHT_WORKERS})
 
 ALLOWED_EXTENSIONS = {".mp3", ".wav", ".m4a", ".mp4", ".webm", ".ogg", ".md"}
+_MULTIPART_OVERHEAD = 64 * 1024  # 업로드 본문 중 파일 외 폼 필드/경계 문자열 여유분
 
 
 def read_md_text(path: Path) -> str:
@@ -54,7 +72,44 @@ def read_md_text(path: Path) -> str:
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     validate_config()
+    _open_job_store()
+    removed = resumable_uploads.cleanup(config.UPLOAD_RESUME_TTL_HOURS * 3600)
+    if removed:
+        print(f"[Server] 만료된 미완료 업로드 {removed}건 삭제")
+    removed = cleanup_pcm_files()
+    if removed:
+        print(f"[Server] 남아 있던 PCM 임시 파일 {removed}개 삭제")
+    if config.WHISPER_PRELOAD:
+        _start_preload()
+    scheduler.start()
     yield
+    scheduler.shutdown()
+
+
+def _open_job_store() -> None:
+    """JOB_STORE=sqlite면 DATA_DIR/jobs.db에 작업 이력을 보존하고 만료된 작업을 정리."""
+    ttl_sec = config.JOB_TTL_HOURS * 3600
+    if config.JOB_STORE == "sqlite":
+        job_status.open(SQLiteJobBackend(config.DATA_DIR / "jobs.db"), ttl_sec=ttl_sec)
+    else:
+        job_status.ttl_sec = ttl_sec
+    # 검토 대기 작업은 처리 스레드가 없으므로 재시작 후에도 그대로 이어서 검토/저장 가능
+    interrupted = job_status.recover_interrupted(keep=("review", "confirmed"))
+    if interrupted:
+        print(f"[Server] 재시작으로 중단된 작업 {len(interrupted)}건을 오류로 표시")
+    for job_id in job_status.backend.ids_with_status(("confirmed",)):
+        scheduler.submit(job_id, _finalize, job_id, lane="light")
+    job_status.gc()
+
+
+def _start_preload() -> None:
+    """ASR 모델을 백그라운드에서 미리 로드 (첫 작업의 모델 로딩 대기 제거)."""
+    def _run():
+        try:
+            preload_model()
+        except Exception as e:
+            print(f"[Server] 모델 사전 로드 실패: {e}")
+    threading.Thread(target=_run, daemon=True).start()
 
 
 app = FastAPI(title="MeetScribe", lifespan=lifespan)
@@ -72,6 +127,20 @@ async def pin_auth_middleware(request: Request, call_next):
     return RedirectResponse(url="/login", status_code=302)
 
 
+# ── 업로드 크기 제한: 본문을 읽기 전에 Content-Length로 명백히 큰 요청을 거절한다
+#    (형식별 상한은 핸들러가 본문을 스트리밍으로 파싱하면서 파일명을 안 순간부터 검사) ──
+@app.middleware("http")
+async def upload_size_middleware(request: Request, call_next):
+    if request.method == "POST" and request.url.path == "/upload":
+        length = request.headers.get("content-length", "")
+        if not length.isdigit():
+            return JSONResponse({"detail": "Content-Length 헤더가 필요합니다"}, status_code=411)
+        limit = max(max_upload_bytes(".m4a"), max_upload_bytes(".md"))
+        if int(length) > limit + _MULTIPART_OVERHEAD:
+            return JSONResponse({"detail": str(UploadTooLarge(limit))}, status_code=413)
+    return await call_next(request)
+
+
 # ── SESSION MIDDLEWARE (나중에 추가 = outermost = 먼저 실행됨) ──
 app.add_middleware(
     SessionMiddleware,
@@ -154,39 +223,231 @@ def index():
 
 
 @app.post("/upload")
-async def upload(
-    background_tasks: BackgroundTasks,
-    file: UploadFile = File(...),
-    title: str = Form(""),
-    project: str = Form(""),
-    context: str = Form(""),
-    category: str = Form("meeting"),
-):
-    suffix = Path(file.filename).suffix.lower()
+async def upload(request: Request):
+    """
+    multipart 폼(file, title, project, context, category, priority)을 받는 대로 파싱해
+    파일을 UPLOAD_DIR에 바로 기록 (형식별 크기 상한은 바이트가 도착하는 동안 검사).
+    """
+    job_id = str(uuid.uuid4())
+    try:
+        fields, saved = await save_multipart(
+            request.stream(), request.headers.get("content-type", ""),
+            config.UPLOAD_DIR / job_id, ALLOWED_EXTENSIONS,
+        )
+    except UploadTooLarge as e:
+        raise HTTPException(413, str(e))
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    try:
+        priority = int(fields.get("priority") or 0)
+    except ValueError:
+        saved["path"].unlink(missing_ok=True)
+        raise HTTPException(400, "priority는 정수여야 합니다")
+
+    return _enqueue_upload(
+        job_id, saved["path"], saved["size"], saved["sha256"], saved["filename"],
+        fields.get("title", ""), fields.get("project", ""), fields.get("context", ""),
+        fields.get("category") or "meeting", priority,
+    )
+
+
+def _enqueue_upload(job_id: str, save_path: Path, size: int, sha256: str, filename: str,
+                    title: str, project: str, context: str, category: str, priority: int) -> dict:
+    """저장된 업로드로 작업을 만들어 대기열에 넣는다."""
+    suffix = save_path.suffix.lower()
+    effective_title = title.strip() or Path(filename).stem
+    job_status[job_id] = {"status": "queued", "step": "", "progress": 0, "detail": "", "elapsed": 0, "result": None, "error": None, "logs": [],
+                          "upload_path": str(save_path), "upload_size": size, "upload_sha256": sha256,
+                          "category": category.strip()}
+    # MD 임포트는 전사가 없으므로 가벼운 레인에서 처리 (긴 오디오 뒤에 줄 서지 않음)
+    lane = "light" if suffix == ".md" else "audio"
+    position = scheduler.submit(
+        job_id, _process, job_id, save_path, effective_title,
+        project.strip(), filename, context.strip(), category.strip(),
+        lane=lane, priority=priority,
+    )
+    return {"job_id": job_id, "queue_position": position}
+
+
+# ── 이어받기 업로드: POST /uploads → PUT /uploads/{id}?offset=N → POST /uploads/{id}/finalize ──
+resumable_uploads = ResumableUploads(config.UPLOAD_DIR)
+
+
+class UploadInitPayload(BaseModel):
+    filename: str
+    size: int
+    title: str = ""
+    project: str = ""
+    context: str = ""
+    category: str = "meeting"
+    priority: int = 0
+
+
+@app.post("/uploads")
+def init_upload(payload: UploadInitPayload):
+    suffix = Path(payload.filename).suffix.lower()
     if suffix not in ALLOWED_EXTENSIONS:
         raise HTTPException(400, f"지원하지 않는 파일 형식: {suffix}")
+    if payload.size <= 0:
+        raise HTTPException(400, "빈 파일은 업로드할 수 없습니다")
+    meta = payload.model_dump(exclude={"filename", "size"})
+    try:
+        return resumable_uploads.init(payload.filename, payload.size, meta)
+    except UploadTooLarge as e:
+        raise HTTPException(413, str(e))
 
-    job_id = str(uuid.uuid4())
-    save_path = config.UPLOAD_DIR / f"{job_id}{suffix}"
-    content = await file.read()
-    if suffix == ".md" and len(content) > 5 * 1024 * 1024:
-        raise HTTPException(400, "MD 파일은 5MB 이하만 허용됩니다")
-    save_path.write_bytes(content)
-
-    effective_title = title.strip() or Path(file.filename).stem
-    job_status[job_id] = {"status": "queued", "step": "", "progress": 0, "detail": "", "elapsed": 0, "result": None, "error": None, "logs": []}
-    background_tasks.add_task(
-        _process, job_id, save_path, effective_title,
-        project.strip(), file.filename, context.strip(), category.strip()
+
+@app.get("/uploads/{upload_id}")
+def get_upload(upload_id: str):
+    """받은 바이트 수 조회 (연결이 끊긴 뒤 이어 올릴 위치)."""
+    try:
+        return resumable_uploads.status(upload_id)
+    except UploadNotFound:
+        raise HTTPException(404, "Upload not found")
+
+
+@app.put("/uploads/{upload_id}")
+async def put_upload_chunk(upload_id: str, request: Request, offset: int):
+    try:
+        new_offset = await resumable_uploads.append(upload_id, offset, request.stream())
+    except UploadNotFound:
+        raise HTTPException(404, "Upload not found")
+    except OffsetMismatch as e:
+        return JSONResponse({"detail": str(e), "offset": e.offset}, status_code=409)
+    except UploadTooLarge as e:
+        raise HTTPException(413, str(e))
+    return {"upload_id": upload_id, "offset": new_offset}
+
+
+@app.post("/uploads/{upload_id}/finalize")
+async def finalize_upload(upload_id: str):
+    try:
+        info = resumable_uploads.info(upload_id)
+        job_id = str(uuid.uuid4())
+        save_path = config.UPLOAD_DIR / f"{job_id}{Path(info['filename']).suffix.lower()}"
+        size, sha256 = await resumable_uploads.finalize(upload_id, save_path)
+    except UploadNotFound:
+        raise HTTPException(404, "Upload not found")
+    except OffsetMismatch as e:
+        return JSONResponse({"detail": "아직 모든 데이터를 받지 못했습니다", "offset": e.offset}, status_code=409)
+    meta = info["meta"]
+    return _enqueue_upload(
+        job_id, save_path, size, sha256, info["filename"],
+        meta.get("title", ""), meta.get("project", ""), meta.get("context", ""),
+        meta.get("category", "meeting"), meta.get("priority", 0),
     )
-    return {"job_id": job_id}
+
+
+def _light_status(job_id: str, logs_from: int = 0, partial_from: int = 0) -> dict:
+    """
+    segments/analysis 등 큰 필드를 뺀 작업 상태.
+    logs와 partial_segments는 각각 logs_from, partial_from 이후의 새 항목만 담는다.
+    """
+    job = job_status.view(job_id, fields=("logs", "partial_segments"))
+    logs = job.pop("logs", None) or []
+    partial = job.pop("partial_segments", None)
+    logs_from = min(max(logs_from, 0), len(logs))
+    job["logs"] = logs[logs_from:]
+    job["logs_from"] = logs_from
+    if partial is not None:
+        # 새 전사가 시작돼 목록이 줄었으면 처음부터 다시 보냄
+        if partial_from > len(partial) or partial_from < 0:
+            partial_from = 0
+        job["partial_segments"] = partial[partial_from:]
+        job["partial_from"] = partial_from
+    if job.get("status") == "queued":
+        job["queue_position"] = scheduler.position(job_id)
+    return job
 
 
 @app.get("/status/{job_id}")
-def get_status(job_id: str):
+def get_status(job_id: str, full: bool = False, logs_from: int = 0, partial_from: int = 0):
+    """
+    기본은 가벼운 상태 (큰 필드 제외, 로그/부분 전사는 새 항목만).
+    full=1이면 segments, analysis 등을 포함한 전체 작업 (검토 화면용).
+    """
+    if job_id not in job_status:
+        raise HTTPException(404, "Job not found")
+    if not full:
+        return _light_status(job_id, logs_from, partial_from)
+    job = job_status[job_id]
+    if job.get("status") == "queued":
+        return {**job, "queue_position": scheduler.position(job_id)}
+    return job
+
+
+_EVENT_POLL_SEC = 0.5
+_EVENT_KEEPALIVE_SEC = 15.0
+_STREAM_END_STATUSES = (*TERMINAL_STATUSES, "review")
+
+
+async def _job_events(job_id: str, request: Request, logs_from: int = 0):
+    """
+    작업 상태 변화를 SSE로 전송. 바뀐 필드와 새 로그/부분 전사만 보내고,
+    검토 대기 또는 종료 상태가 되면 end 이벤트 후 닫는다 (검토 화면은 /status?full=1로 조회).
+    """
+    sent: dict = {}
+    partial_from = 0
+    last_send = time.monotonic()
+    while True:
+        if await request.is_disconnected():
+            return
+        try:
+            cur = _light_status(job_id, logs_from, partial_from)
+        except KeyError:
+            yield "event: end\ndata: {}\n\n"
+            return
+        delta = {
+            k: v for k, v in cur.items()
+            if k not in ("logs", "logs_from", "partial_segments", "partial_from") and sent.get(k, ...) != v
+        }
+        if cur["logs"]:
+            delta.update(logs=cur["logs"], logs_from=cur["logs_from"])
+            logs_from = cur["logs_from"] + len(cur["logs"])
+        if cur.get("partial_segments"):
+            delta.update(partial_segments=cur["partial_segments"], partial_from=cur["partial_from"])
+            partial_from = cur["partial_from"] + len(cur["partial_segments"])
+        if delta:
+            sent.update({k: v for k, v in delta.items() if k not in ("logs", "partial_segments")})
+            yield f"event: update\ndata: {json.dumps(delta, ensure_ascii=False, default=str)}\n\n"
+            last_send = time.monotonic()
+        elif time.monotonic() - last_send >= _EVENT_KEEPALIVE_SEC:
+            # Cloudflare 등 프록시가 유휴 연결을 끊지 않도록
+            yield ": keep-alive\n\n"
+            last_send = time.monotonic()
+        if cur.get("status") in _STREAM_END_STATUSES:
+            yield "event: end\ndata: {}\n\n"
+            return
+        await asyncio.sleep(_EVENT_POLL_SEC)
+
+
+@app.get("/events/{job_id}")
+async def job_events(job_id: str, request: Request, logs_from: int = 0):
+    """작업 진행 상황 스트림 (Server-Sent Events). logs_from: 클라이언트가 이미 받은 로그 수."""
     if job_id not in job_status:
         raise HTTPException(404, "Job not found")
-    return job_status[job_id]
+    return StreamingResponse(
+        _job_events(job_id, request, logs_from),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/queue")
+def get_queue():
+    """레인별 실행/대기 작업 수."""
+    return scheduler.stats()
+
+
+@app.get("/metrics")
+def get_metrics():
+    """누적 LLM 토큰·호출 시간, provider별 API 지연 백분위, 서킷 브레이커, 큐 상태."""
+    return {
+        "llm_usage": get_usage_totals().snapshot(),
+        "api_latency": get_latency_stats().summary(),
+        "breakers": breaker_states(),
+        "queue": scheduler.stats(),
+    }
 
 
 _ENV_PATH = Path(__file__).parent / ".env"
@@ -258,8 +519,25 @@ def get_projects():
 def cancel_job(job_id: str):
     if job_id not in job_status:
         raise HTTPException(404, "Job not found")
-    if job_status[job_id]["status"] not in ("done", "error", "cancelled"):
-        job_status[job_id]["status"] = "cancelling"
+    # 재시작 후 다시 예약된 확정 작업처럼 park된 작업은 job_status[job_id]가 읽기 전용 사본이므로
+    # 수정할 때는 resume()으로 메모리에 올려 save()/finish()가 백엔드에 반영되게 한다
+    if scheduler.cancel(job_id):
+        # 아직 시작 전이면 대기열에서 빼고 바로 취소 처리
+        job = job_status.resume(job_id)
+        job["logs"].append("[00:00] 대기 중 취소됨")
+        job.update({"status": "cancelled", "step": "취소됨", "progress": 0, "detail": "취소됨"})
+        upload_path = Path(job.get("upload_path", ""))
+        if upload_path.is_file():
+            upload_path.unlink()
+        job_status.finish(job_id)
+    elif job_status[job_id]["status"] == "review":
+        # 검토 대기 작업은 처리 스레드가 없으므로 바로 취소
+        job_status.resume(job_id)
+        _mark_cancelled(job_id)
+        job_status.finish(job_id)
+    elif job_status[job_id]["status"] not in ("done", "error", "cancelled"):
+        job_status.resume(job_id)["status"] = "cancelling"
+        job_status.save(job_id)
     return {"ok": True}
 
 
@@ -310,11 +588,61 @@ def confirm_job(job_id: str, payload: ConfirmPayload):
         legacy = {k: edited[k] for k in ("purpose", "discussion", "decisions", "action_items", "follow_up") if edited.get(k)}
         if legacy:
             edited["analysis"] = legacy
-    job_status[job_id]["analysis_edited"] = edited
-    job_status[job_id]["status"] = "confirmed"
+    job = job_status.resume(job_id)
+    job["analysis_edited"] = edited
+    job["status"] = "confirmed"
+    job_status.save(job_id)
+    # 노트 생성/저장은 가벼운 레인에서 처리 (검토 대기 동안 점유한 스레드 없음)
+    scheduler.submit(job_id, _finalize, job_id, lane="light")
     return {"ok": True}
 
 
+class ReanalyzePayload(BaseModel):
+    # 비워두면 원래 작업의 값 사용
+    category: str = ""
+    context: str | None = None
+    title: str = ""
+    project: str | None = None
+
+
+@app.post("/reanalyze/{job_id}")
+def reanalyze_job(job_id: str, payload: ReanalyzePayload):
+    """
+    끝난 작업의 전사 결과를 재사용해 분석 → 검토 → 노트 저장만 다시 실행.
+    새 작업 id를 돌려주며, 이후 흐름(/status, /confirm)은 일반 업로드와 같다.
+    """
+    if job_id not in job_status:
+        raise HTTPException(404, "Job not found")
+    src = job_status[job_id]
+    if src.get("status") not in ("done", "review"):
+        raise HTTPException(400, "완료된 작업만 다시 분석할 수 있습니다")
+    segments = src.get("segments")
+    if segments is None:
+        raise HTTPException(400, "저장된 전사 결과가 없습니다")
+    source_type = src.get("source_type", "audio")
+    # full_text 저장 이전 작업은 세그먼트(MD는 원문)로 복원
+    full_text = src.get("full_text") or (
+        src.get("md_source_text", "") if source_type == "md"
+        else " ".join(seg["text"] for seg in segments if seg.get("text"))
+    )
+
+    new_id = str(uuid.uuid4())
+    category = payload.category.strip() or src.get("category", "meeting")
+    context = src.get("context", "") if payload.context is None else payload.context.strip()
+    job_status[new_id] = {
+        "status": "queued", "step": "", "progress": 0, "detail": "", "elapsed": 0,
+        "result": None, "error": None, "logs": [],
+        "reanalyzed_from": job_id, "category": category,
+        "segments": segments, "full_text": full_text, "duration": src.get("duration", "0:00"),
+        "title": payload.title.strip() or src.get("title") or Path(src.get("original_filename", "")).stem,
+        "project": src.get("project", "") if payload.project is None else payload.project.strip(),
+        "original_filename": src.get("original_filename", ""),
+        "source_type": source_type, "md_source_text": src.get("md_source_text", ""),
+    }
+    position = scheduler.submit(new_id, _reanalyze, new_id, category, context, lane="light")
+    return {"job_id": new_id, "queue_position": position}
+
+
 class SettingsPayload(BaseModel):
     WHISPER_MODEL: str = ""
     GEMINI_API_KEY: str = ""
@@ -340,53 +668,181 @@ def save_settings(payload: SettingsPayload):
     # config 리로드
     import importlib
     from dotenv import load_dotenv
+    prev_model, prev_hf_token = config.WHISPER_MODEL, config.HF_TOKEN
+    prev_keys = {"gemini": config.GEMINI_API_KEY, "openai": config.OPENAI_API_KEY}
     load_dotenv(_ENV_PATH, override=True)
     importlib.reload(config)
+    # Whisper 모델이 바뀌면 이전 모델을 해제하고 (설정 시) 새 모델을 미리 로드
+    if config.WHISPER_MODEL != prev_model:
+        model_registry.unload(prev_model)
+        if config.WHISPER_PRELOAD:
+            _start_preload()
+    if config.HF_TOKEN != prev_hf_token:
+        model_registry.unload(kind="diarize")
+    # API 키가 바뀐 provider의 클라이언트(및 keep-alive 연결)는 버리고 다음 호출에서 새로 생성
+    for provider, new_key in (("gemini", config.GEMINI_API_KEY), ("openai", config.OPENAI_API_KEY)):
+        if new_key != prev_keys[provider]:
+            clients.reset(provider)
     return {"ok": True}
 
 
-def _process(job_id: str, audio_path: Path, title: str, project: str, original_filename: str, context: str = "", category: str = "meeting"):
+_TIMING_LABELS = {
+    "decode": "디코딩", "model_load": "모델 로드", "transcribe": "전사", "align": "정렬",
+    "diarize": "화자 분리", "diarize_wait": "화자 분리 대기", "total": "전체",
+}
+
+
+def _format_timings(timings: dict[str, float]) -> str:
+    """단계별 소요 시간 로그 문자열. 화자 분리가 병렬이면 대기 시간이 실행 시간보다 짧다."""
+    parts = [f"{label} {timings[k]:.1f}초" for k, label in _TIMING_LABELS.items() if k in timings]
+    return "단계별 소요 — " + ", ".join(parts)
+
+
+def _log(job_id: str, detail: str) -> None:
+    job = job_status[job_id]
+    elapsed = int(time.time() - job.get("started_at", time.time()))
+    m, s = divmod(elapsed, 60)
+    job["logs"].append(f"[{m:02d}:{s:02d}] {detail}")
+
+
+def _update(job_id: str, status: str, step: str, progress: int = 0, detail: str = "") -> None:
+    job = job_status[job_id]
+    job.update({
+        "status": status, "step": step,
+        "progress": progress, "detail": detail,
+        "elapsed": int(time.time() - job.get("started_at", time.time())),
+    })
+    if detail:
+        _log(job_id, detail)
+    job_status.save(job_id)
+
+
+def _is_cancelled(job_id: str) -> bool:
+    return job_status[job_id].get("status") == "cancelling"
+
+
+def _mark_cancelled(job_id: str) -> None:
+    job = job_status[job_id]
+    _log(job_id, "사용자에 의해 취소됨")
+    job.update({
+        "status": "cancelled", "step": "취소됨", "progress": 0,
+        "detail": "취소됨", "elapsed": int(time.time() - job.get("started_at", time.time())),
+    })
+
+
+def _mark_error(job_id: str, e: Exception) -> None:
+    _log(job_id, f"오류: {e}")
+    job_status[job_id].update({
+        "status": "error", "step": "오류", "progress": 0,
+        "detail": str(e), "result": None, "error": str(e),
+    })
+
+
+def _analyze_for_review(job_id: str, transcript_result: dict, category: str, context: str,
+                        title: str, project: str, original_filename: str,
+                        source_type: str, md_raw: str) -> bool:
+    """
+    AI 분석 후 검토 대기(review) 상태로 저장하고 메모리에서 내린다.
+    노트 생성에 필요한 값과 전사 결과를 작업에 함께 저장해 /confirm 후 _finalize, /reanalyze가 재사용한다.
+    Returns: review로 저장했으면 True (취소되면 False)
+    """
+    # 분석 중 미리보기(partial_analysis)를 카테고리 양식으로 그리도록 검토 전부터 기록
+    job_status[job_id]["category"] = category
+    _update(job_id, "analyzing", "AI 분석 중...", 96, "Gemini 분석 중...")
+
+    def on_partial(sections: dict):
+        # 완성된 섹션부터 검토 화면에 미리 표시 (/status, /events로 전달)
+        job_status[job_id]["partial_analysis"] = sections
+
+    llm_text, llm_segments = transcript_result["full_text"], transcript_result["segments"]
+    budget = config.LLM_INPUT_TOKEN_BUDGET
+    # 압축을 꺼 두었어도 예산을 넘는 전사본은 압축부터 시도 (그래도 넘으면 analyzer가 구간 분석)
+    over_budget = budget > 0 and estimate_tokens(llm_text) > budget
+    if (config.TRANSCRIPT_COMPACT or over_budget) and source_type != "md" and llm_segments:
+        # LLM 입력만 압축 (노트에 저장하는 전사본은 원본 유지)
+        llm_segments, report = compact_segments(llm_segments)
+        llm_text = "\n".join(s["text"] for s in llm_segments)
+        job_status[job_id]["compaction"] = report
+        _log(job_id, f"전사본 압축: 약 {report['tokens_before']:,} → {report['tokens_after']:,} 토큰 "
+                     f"(추임새 {report['fillers_removed']}개, 반복 {report['repeats_removed']}단어 제거)")
+
+    # 작업별 LLM 토큰·호출 시간 (/status의 llm_usage로 진행 중에도 갱신)
+    meter = UsageMeter(on_change=lambda snap: job_status[job_id].update(llm_usage=snap))
+    analysis = analyze_transcript(
+        llm_text, category=category, context=context,
+        segments=llm_segments, on_partial=on_partial, usage=meter,
+    )
+    job_status[job_id].pop("partial_analysis", None)
+    used = meter.snapshot()
+    job_status[job_id]["llm_usage"] = used
+    if used["calls"] or used["cache_hits"]:
+        _log(job_id, f"LLM 사용량: 입력 {used['input_tokens']:,} / 출력 {used['output_tokens']:,} 토큰, "
+                     f"호출 {used['calls']}회 ({used['latency_sec']:.1f}초), 캐시 {used['cache_hits']}회")
+
+    if _is_cancelled(job_id):
+        _mark_cancelled(job_id)
+        return False
+
+    # 사용자 검토 대기 (speakers는 review panel 표시용으로 미리 계산)
+    review_speakers = sorted({seg["speaker"] for seg in transcript_result["segments"]})
+    _log(job_id, "AI 분석 완료. 결과를 확인하고 저장 버튼을 클릭하세요.")
+    job = job_status[job_id]
+    job.update({
+        "status": "review", "step": "검토 중...", "progress": 97,
+        "detail": "분석 결과를 확인하고 저장 버튼을 클릭하세요.",
+        "analysis": analysis,
+        "category": category,
+        "context": context,
+        "speakers": review_speakers,
+        "segments": transcript_result["segments"],
+        "full_text": transcript_result["full_text"],
+        "duration": transcript_result["duration"],
+        "title": title,
+        "project": project,
+        "original_filename": original_filename,
+        "source_type": source_type,
+        "md_source_text": md_raw,
+        "elapsed": int(time.time() - job.get("started_at", time.time())),
+    })
+    # 검토 대기 작업은 저장소로 내려 메모리와 워커를 비움
+    job_status.park(job_id)
+    return True
+
+
+def _process(job_id: str, audio_path: Path, title: str, project: str, original_filename: str, context: str = "",
+             category: str = "meeting", keep_source: bool = False):
+    """
+    검토 전 단계: 전사 → AI 분석 후 review 상태로 저장하고 반환 (검토 대기 중에는 스레드를 점유하지 않음).
+    keep_source: 끝난 뒤 audio_path를 지우지 않음 (업로드 사본이 아닌 원본 파일을 처리할 때, batch.py)
+    """
     start_time = time.time()
+    job_status[job_id]["started_at"] = start_time
+    parked = False
 
-    def _log(detail: str):
-        elapsed = int(time.time() - start_time)
-        m, s = divmod(elapsed, 60)
-        job_status[job_id]["logs"].append(f"[{m:02d}:{s:02d}] {detail}")
-
-    def update(status: str, step: str, progress: int = 0, detail: str = ""):
+    def on_transcribe_progress(pct: int, detail: str, segments: list[dict] | None = None,
+                               eta_sec: int | None = None):
+        prev_detail = job_status[job_id].get("detail")
         job_status[job_id].update({
-            "status": status, "step": step,
-            "progress": progress, "detail": detail,
+            "progress": pct, "detail": detail, "eta_sec": eta_sec,
             "elapsed": int(time.time() - start_time),
         })
-        if detail:
-            _log(detail)
-
-    def on_transcribe_progress(pct: int, detail: str):
-        job_status[job_id].update({
-            "progress": pct, "detail": detail,
-            "elapsed": int(time.time() - start_time),
-        })
-        if detail:
-            _log(detail)
-
-    def is_cancelled() -> bool:
-        return job_status[job_id].get("status") == "cancelling"
-
-    def mark_cancelled():
-        _log("사용자에 의해 취소됨")
-        job_status[job_id].update({
-            "status": "cancelled", "step": "취소됨", "progress": 0,
-            "detail": "취소됨", "elapsed": int(time.time() - start_time),
-        })
+        if segments is not None:
+            job_status[job_id]["partial_segments"] = segments
+        # 주기적 진행률 갱신은 같은 detail로 반복되므로 로그에는 바뀐 메시지만 남김
+        if detail and detail != prev_detail:
+            _log(job_id, detail)
 
     try:
+        if _is_cancelled(job_id):
+            _mark_cancelled(job_id)
+            return
+
         suffix = audio_path.suffix.lower()
         is_md = (suffix == ".md")
         md_raw = ""
 
         if is_md:
-            update("analyzing", "MD 파일 읽는 중...", 10, "MD 파일 읽는 중...")
+            _update(job_id, "analyzing", "MD 파일 읽는 중...", 10, "MD 파일 읽는 중...")
             md_raw = read_md_text(audio_path)
             transcript_result = {
                 "segments": [],
@@ -395,72 +851,105 @@ def _process(job_id: str, audio_path: Path, title: str, project: str, original_f
                 "method": "md-import",
             }
         else:
-            update("transcribing", "전사 중...", 0, "모델 준비 중...")
-            transcript_result = transcribe(audio_path, on_progress=on_transcribe_progress, context=context)
-
-        if is_cancelled():
-            mark_cancelled()
+            _update(job_id, "transcribing", "전사 중...", 0, "모델 준비 중...")
+            transcript_result = transcribe(
+                audio_path, on_progress=on_transcribe_progress, context=context, category=category,
+                audio_sha256=job_status[job_id].get("upload_sha256"),
+            )
+            timings = transcript_result.get("timings", {})
+            job_status[job_id]["timings"] = timings
+            job_status[job_id].pop("partial_segments", None)
+            job_status[job_id]["eta_sec"] = None
+            if transcript_result.get("cached"):
+                _log(job_id, "같은 오디오의 이전 전사 결과를 재사용합니다.")
+            elif timings:
+                _log(job_id, _format_timings(timings))
+
+        if _is_cancelled(job_id):
+            _mark_cancelled(job_id)
             return
 
-        update("analyzing", "AI 분석 중...", 96, "Gemini 분석 중...")
-        analysis = analyze_transcript(transcript_result["full_text"], category=category, context=context)
+        parked = _analyze_for_review(
+            job_id, transcript_result, category, context,
+            title, project, original_filename, "md" if is_md else "audio", md_raw,
+        )
+
+    except Exception as e:
+        _mark_error(job_id, e)
+    finally:
+        # 종료된 작업은 저장소로 내려보내고 메모리에서 해제
+        if not parked:
+            job_status.finish(job_id)
+        if not keep_source and audio_path.exists():
+            audio_path.unlink()
+
 
-        if is_cancelled():
-            mark_cancelled()
+def _reanalyze(job_id: str, category: str, context: str):
+    """저장된 전사 결과로 AI 분석만 다시 실행 (/reanalyze에서 예약)."""
+    job_status[job_id]["started_at"] = time.time()
+    parked = False
+    try:
+        if _is_cancelled(job_id):
+            _mark_cancelled(job_id)
             return
+        job = job_status[job_id]
+        transcript_result = {
+            "segments": job["segments"], "full_text": job["full_text"], "duration": job["duration"],
+        }
+        parked = _analyze_for_review(
+            job_id, transcript_result, category, context,
+            job["title"], job["project"], job["original_filename"],
+            job["source_type"], job.get("md_source_text", ""),
+        )
+    except Exception as e:
+        _mark_error(job_id, e)
+    finally:
+        if not parked:
+            job_status.finish(job_id)
 
-        # 사용자 검토 대기 (speakers는 review panel 표시용으로 미리 계산)
-        review_speakers = sorted({seg["speaker"] for seg in transcript_result["segments"]})
-        _log("AI 분석 완료. 결과를 확인하고 저장 버튼을 클릭하세요.")
-        job_status[job_id].update({
-            "status": "review", "step": "검토 중...", "progress": 97,
-            "detail": "분석 결과를 확인하고 저장 버튼을 클릭하세요.",
-            "analysis": analysis,
-            "category": category,
-            "speakers": review_speakers,
-            "segments": transcript_result["segments"],
-            "source_type": "md" if is_md else "audio",
-            "md_source_text": md_raw,
-            "elapsed": int(time.time() - start_time),
-        })
 
-        while True:
-            time.sleep(0.5)
-            cur = job_status[job_id].get("status")
-            if cur == "confirmed":
-                edited = job_status[job_id].get("analysis_edited") or {}
-                speaker_map = edited.pop("speaker_map", {})
-                # 신규: generic analysis dict 우선
-                if edited.get("analysis"):
-                    analysis = edited["analysis"]
-                elif any(k in edited for k in ("purpose", "discussion", "decisions")):
-                    # 하위 호환: 기존 개별 필드
-                    edited.pop("analysis", None)
-                    analysis = edited
-                if speaker_map:
-                    _apply_speaker_map(transcript_result["segments"], speaker_map)
-                break
-            if cur == "cancelling":
-                mark_cancelled()
-                return
-
-        update("building", "노트 생성 중...", 98, "노트 빌드 중...")
-        speakers = sorted({seg["speaker"] for seg in transcript_result["segments"]})
+def _finalize(job_id: str):
+    """검토 후 단계: 확정된 분석 결과로 노트를 빌드해 Vault에 저장 (/confirm에서 예약)."""
+    job = job_status.resume(job_id)
+    try:
+        if _is_cancelled(job_id):
+            _mark_cancelled(job_id)
+            return
+
+        analysis = job.get("analysis") or {}
+        segments = job.get("segments") or []
+        edited = dict(job.get("analysis_edited") or {})
+        speaker_map = edited.pop("speaker_map", {})
+        # 신규: generic analysis dict 우선
+        if edited.get("analysis"):
+            analysis = edited["analysis"]
+        elif any(k in edited for k in ("purpose", "discussion", "decisions")):
+            # 하위 호환: 기존 개별 필드
+            edited.pop("analysis", None)
+            analysis = edited
+        if speaker_map:
+            _apply_speaker_map(segments, speaker_map)
+
+        _update(job_id, "building", "노트 생성 중...", 98, "노트 빌드 중...")
+        category = job.get("category", "meeting")
+        is_md = job.get("source_type") == "md"
+        md_raw = job.get("md_source_text", "")
+        speakers = sorted({seg["speaker"] for seg in segments})
 
         if category in ("meeting", "discussion"):
             note_data = NoteData(
                 date=date.today(),
-                title=title,
-                audio_filename=original_filename,
-                duration=transcript_result["duration"],
+                title=job["title"],
+                audio_filename=job["original_filename"],
+                duration=job["duration"],
                 speakers=speakers,
                 purpose=analysis.get("purpose", ""),
                 discussion=analysis.get("discussion", []),
                 decisions=analysis.get("decisions", []),
                 action_items=analysis.get("action_items", []),
                 follow_up=analysis.get("follow_up", []),
-                transcript=transcript_result["segments"],
-                project=project,
+                transcript=segments,
+                project=job.get("project", ""),
                 category=category,
                 source_type="md" if is_md else "audio",
                 md_source_text=md_raw,
@@ -470,13 +959,13 @@ def _process(job_id: str, audio_path: Path, title: str, project: str, original_f
         else:
             note_data = NoteData(
                 date=date.today(),
-                title=title,
-                audio_filename=original_filename,
-                duration=transcript_result["duration"],
+                title=job["title"],
+                audio_filename=job["original_filename"],
+                duration=job["duration"],
                 speakers=speakers,
                 purpose="", discussion=[], decisions=[], action_items=[], follow_up=[],
-                transcript=transcript_result["segments"],
-                project=project,
+                transcript=segments,
+                project=job.get("project", ""),
                 category=category,
                 extra=analysis,
                 source_type="md" if is_md else "audio",
@@ -485,27 +974,21 @@ def _process(job_id: str, audio_path: Path, title: str, project: str, original_f
             main_note = build_note(note_data)
             transcript_note = build_source_note(note_data) if is_md else None
 
-        update("saving", "Vault에 저장 중...", 99, "파일 저장 중...")
+        _update(job_id, "saving", "Vault에 저장 중...", 99, "파일 저장 중...")
         writer = VaultWriter(config.VAULT_PATH)
         result = writer.save(note_data, main_note, transcript_note)
 
-        done_msg = f"완료 — 총 {int(time.time() - start_time)}초 소요"
-        _log(done_msg)
-        job_status[job_id].update({
+        elapsed = int(time.time() - job.get("started_at", time.time()))
+        done_msg = f"완료 — 총 {elapsed}초 소요"
+        _log(job_id, done_msg)
+        job.update({
             "status": "done", "step": "완료", "progress": 100,
             "detail": done_msg,
-            "elapsed": int(time.time() - start_time), "result": result, "error": None,
+            "elapsed": elapsed, "result": result, "error": None,
             "category": category,
         })
 
     except Exception as e:
-        _log(f"오류: {e}")
-        job_status[job_id].update({
-            "status": "error", "step": "오류", "progress": 0,
-            "detail": str(e), "result": None, "error": str(e),
-        })
+        _mark_error(job_id, e)
     finally:
-        if audio_path.exists():
-            audio_path.unlink()
-
-
+        job_status.finish(job_id)
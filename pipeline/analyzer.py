@@ -1,7 +1,16 @@
+import json
 import os
 import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 import config
-from pipeline.prompts import PROMPTS
+from pipeline import clients, usage as llm_usage
+from pipeline.compactor import estimate_tokens
+from pipeline.disk_cache import DiskCache, make_key
+from pipeline.latency import get_latency_stats
+from pipeline.resilience import call_with_retry
+from pipeline.prompts import JSON_OUTPUT_INSTRUCTION, PROMPTS
 
 
 def _build_analysis_prompt(context: str, transcript_text: str) -> str:
@@ -10,154 +19,651 @@ def _build_analysis_prompt(context: str, transcript_text: str) -> str:
     return f"{ctx_line}다음 내용을 분석해주세요:\n\n{transcript_text}"
 
 
-def analyze_transcript(transcript_text: str, category: str = "meeting", context: str = "") -> dict:
-    """카테고리별 프롬프트 사용. Gemini 우선, 실패 시 OpenAI, 마지막은 기본 추출."""
+def analyze_transcript(transcript_text: str, category: str = "meeting", context: str = "",
+                       segments: list[dict] | None = None, on_partial=None,
+                       usage: llm_usage.UsageMeter | None = None) -> dict:
+    """
+    카테고리별 프롬프트 사용. Gemini 우선, 실패 시 OpenAI, 마지막은 기본 추출.
+    전사본이 ANALYSIS_CHUNK_CHARS보다 길거나 추정 입력 토큰이 LLM_INPUT_TOKEN_BUDGET을 넘으면
+    구간으로 나눠 병렬 분석한 뒤 결과를 병합 (map-reduce).
+    segments가 있으면 화자가 바뀌는 세그먼트 경계에서 나눈다.
+    on_partial(sections): 완성된 섹션이 늘어날 때마다 호출 (응답 스트리밍 또는 구간 분석 완료 시)
+    usage: 이 분석의 LLM 토큰·호출 시간을 기록할 집계 (전역 누적 집계에는 항상 기록)
+    """
+    with llm_usage.metering(usage):
+        est = estimate_tokens(transcript_text)
+        if usage is not None:
+            usage.set_estimate(est)
+        limit, max_tokens = _chunk_limit(transcript_text, est)
+        if limit > 0 and len(transcript_text) > limit:
+            chunks = _split_transcript(transcript_text, segments, limit, max_tokens)
+            if len(chunks) > 1:
+                return _analyze_map_reduce(chunks, category, context, on_partial)
+        return _analyze_single(transcript_text, category, context, on_partial=on_partial)
+
+
+def _chunk_limit(transcript_text: str, est_tokens: int) -> tuple[int, int | None]:
+    """
+    (구간 크기(글자), 구간 최대 추정 토큰). 구간 크기가 0이면 나누지 않음.
+    추정 토큰이 예산을 넘으면 예산이 구간의 상한이 되고, 구간 크기는 예산에 맞는 글자 수에서
+    화자 경계를 찾을 여유(1.2배)만큼 줄인다.
+    """
+    limit = config.ANALYSIS_CHUNK_CHARS
+    budget = config.LLM_INPUT_TOKEN_BUDGET
+    if budget > 0 and est_tokens > budget:
+        by_budget = max(1, int(len(transcript_text) * budget / est_tokens))
+        print(f"[Analyzer] 추정 입력 {est_tokens:,} 토큰 > 예산 {budget:,} — 구간 분석")
+        target = max(1, int(by_budget / 1.2))
+        return (min(limit, target) if limit > 0 else target), budget
+    return limit, None
+
+
+def _analyze_single(transcript_text: str, category: str = "meeting", context: str = "",
+                    on_partial=None) -> dict:
+    providers = _providers()
+    if config.LLM_HEDGE and len(providers) >= 2:
+        # 두 응답이 경쟁하므로 스트리밍하지 않음 (어느 쪽 섹션을 보여줄지 정할 수 없다)
+        try:
+            return _analyze_hedged(providers[0], providers[1], transcript_text, context, category)
+        except Exception as e:
+            print(f"[Analyzer] {e}. 기본 분석 사용.")
+            return _analyze_basic(transcript_text)
+
+    # 구조화(JSON) 출력은 섹션 문법이 없어 미완성 응답에서 섹션을 뽑을 수 없으므로 스트리밍하지 않음
+    stream = on_partial and config.LLM_STREAM and not config.LLM_JSON
+    on_text = _section_emitter(category, on_partial) if stream else None
+
     if config.GEMINI_API_KEY:
         try:
-            return _analyze_gemini(transcript_text, context, category)
+            return _analyze_gemini(transcript_text, context, category, on_text=on_text)
         except Exception as e:
             print(f"[Analyzer] Gemini 실패: {e}. OpenAI로 폴백.")
 
     if config.OPENAI_API_KEY:
         try:
-            return _analyze_openai(transcript_text, context, category)
+            return _analyze_openai(transcript_text, context, category, on_text=on_text)
         except Exception as e:
             print(f"[Analyzer] OpenAI 실패: {e}. 기본 분석 사용.")
 
     return _analyze_basic(transcript_text)
 
 
-def _analyze_gemini(transcript_text: str, context: str = "", category: str = "meeting") -> dict:
-    from google import genai
+# ── 헤지(hedged) 요청 ─────────────────────────────────────────────────
 
-    client = genai.Client(api_key=config.GEMINI_API_KEY)
-    system = PROMPTS.get(category, PROMPTS["meeting"])
+def _providers() -> list[tuple[str, object]]:
+    """키가 설정된 provider를 우선순위 순으로 (이름, 분석 함수)."""
+    providers = []
+    if config.GEMINI_API_KEY:
+        providers.append(("gemini", _analyze_gemini))
+    if config.OPENAI_API_KEY:
+        providers.append(("openai", _analyze_openai))
+    return providers
+
+
+def _hedge_delay(provider: str) -> float:
+    """주 provider의 LLM_HEDGE_PERCENTILE 백분위 지연. 측정값이 부족하면 LLM_HEDGE_DELAY_SEC."""
+    p = get_latency_stats().percentile(provider, config.LLM_HEDGE_PERCENTILE)
+    return max(1.0, p if p is not None else config.LLM_HEDGE_DELAY_SEC)
+
+
+def _is_parseable(result: dict) -> bool:
+    return any(bool(v) for v in result.values())
+
+
+def _analyze_hedged(primary, secondary, transcript_text: str, context: str, category: str) -> dict:
+    """
+    주 provider가 평소(백분위) 지연 안에 답하지 않으면 보조 provider에도 요청하고,
+    먼저 도착한 파싱 가능한 결과를 사용. 주 provider가 먼저 실패해도 바로 보조로 넘어간다.
+    진행 중인 HTTP 요청은 스레드에서 강제로 끊을 수 없으므로 늦게 온 결과는 버린다.
+    """
+    (p_name, p_fn), (s_name, s_fn) = primary, secondary
+    delay = _hedge_delay(p_name)
+    pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="llm-hedge")
+    args = (transcript_text, context, category)
+    pending = {pool.submit(llm_usage.bind(p_fn), *args): p_name}
+    started = {p_name}
+    errors: dict[str, str] = {}
+    try:
+        done, _ = wait(pending, timeout=delay)
+        if not done:
+            print(f"[Analyzer] {p_name} 응답이 {delay:.1f}초 넘게 없음 — {s_name} 동시 요청")
+            pending[pool.submit(llm_usage.bind(s_fn), *args)] = s_name
+            started.add(s_name)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    errors[name] = str(e)
+                    print(f"[Analyzer] {name} 실패: {e}")
+                    continue
+                if _is_parseable(result):
+                    if len(started) > 1:
+                        print(f"[Analyzer] {name} 응답 사용")
+                    return result
+                errors[name] = "파싱 가능한 응답 없음"
+            if not pending and s_name not in started:
+                pending[pool.submit(llm_usage.bind(s_fn), *args)] = s_name
+                started.add(s_name)
+        raise RuntimeError(f"모든 provider 실패 ({errors})")
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+# ── map-reduce 분석 ────────────────────────────────────────────────────
+
+def _split_transcript(text: str, segments: list[dict] | None, limit: int,
+                      max_tokens: int | None = None) -> list[str]:
+    """
+    limit 글자 안팎의 구간으로 분할.
+    세그먼트가 있으면 limit에 도달한 뒤 화자가 바뀌는 지점에서 자르고 (한 사람 발언이 길면 1.2배에서 강제),
+    없으면(MD 등) 문단 → 문장 경계에서 자른다.
+    limit보다 긴 세그먼트(압축으로 합쳐진 한 화자 발언, 화자 분리 없는 전사본 등)는 문장 단위로 나눠 넣는다.
+    max_tokens(입력 토큰 예산)가 있으면 화자 경계 전이라도 구간의 추정 토큰이 이를 넘기 전에 자른다.
+    """
+    if segments:
+        chunks, cur, size, tokens, prev_speaker = [], [], 0, 0, None
+        for seg in segments:
+            seg_text = seg.get("text", "").strip()
+            if not seg_text:
+                continue
+            speaker = seg.get("speaker")
+            pieces = _sentences(seg_text, limit) if len(seg_text) > limit else [seg_text]
+            for t in pieces:
+                t_tokens = estimate_tokens(t) if max_tokens else 0
+                over_budget = max_tokens is not None and tokens + t_tokens > max_tokens
+                if cur and (over_budget or size >= limit and (speaker != prev_speaker or size >= limit * 1.2)):
+                    chunks.append(" ".join(cur))
+                    cur, size, tokens = [], 0, 0
+                cur.append(t)
+                size += len(t) + 1
+                tokens += t_tokens
+                prev_speaker = speaker
+        if cur:
+            chunks.append(" ".join(cur))
+        return chunks
+
+    chunks, cur, size, tokens = [], [], 0, 0
+    for u in _sentences(text, limit):
+        u_tokens = estimate_tokens(u) if max_tokens else 0
+        if cur and (size + len(u) > limit or max_tokens is not None and tokens + u_tokens > max_tokens):
+            chunks.append(" ".join(cur))
+            cur, size, tokens = [], 0, 0
+        cur.append(u)
+        size += len(u) + 1
+        tokens += u_tokens
+    if cur:
+        chunks.append(" ".join(cur))
+    return chunks
+
+
+def _sentences(text: str, limit: int) -> list[str]:
+    """문단·문장 경계로 나눔. 문장 하나가 limit보다 길면 limit 글자씩 그대로 자른다."""
+    units = []
+    for u in re.split(r"(?<=[.!?。])\s+|\n{2,}", text):
+        if not u.strip():
+            continue
+        while len(u) > limit:
+            units.append(u[:limit])
+            u = u[limit:]
+        units.append(u)
+    return units
+
+
+def _analyze_map_reduce(chunks: list[str], category: str, context: str, on_partial=None) -> dict:
+    """
+    구간별 분석(map)을 병렬로 실행하고 merge_analyses로 합친다(reduce).
+    on_partial이 있으면 구간이 끝날 때마다 지금까지 끝난 구간의 병합 결과를 전달 (구간 내부는 스트리밍하지 않음).
+    """
+    n = len(chunks)
+    print(f"[Analyzer] 긴 전사본 — {n}개 구간으로 나눠 분석")
+
+    def run(i: int) -> dict:
+        part = f"전체 {n}개 구간 중 {i + 1}번째"
+        ctx = f"{context.strip()} / {part}" if context.strip() else part
+        return _analyze_single(chunks[i], category, ctx)
+
+    results: list[dict | None] = [None] * n
+    with ThreadPoolExecutor(max_workers=max(1, config.ANALYSIS_MAP_WORKERS), thread_name_prefix="analyze") as pool:
+        futures = {pool.submit(llm_usage.bind(run), i): i for i in range(n)}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+            if on_partial:
+                on_partial(merge_analyses([r for r in results if r is not None]))
+    return merge_analyses(results)
+
+
+def merge_analyses(results: list[dict]) -> dict:
+    """
+    구간별 분석 결과를 하나로 병합. 값의 타입에 따라 합친다:
+    리스트는 순서를 유지하며 이어붙이고 중복 제거, 문자열은 서로 다른 값을 순서대로 이어붙인다.
+    모든 구간이 같은 카테고리 파서를 거치므로 결과도 parse_llm_response 스키마를 유지한다.
+    """
+    merged: dict = {}
+    str_keys = set()
+    for result in results:
+        for key, value in result.items():
+            if isinstance(value, list):
+                items = merged.setdefault(key, [])
+                seen = {_norm(x) for x in items}
+                for item in value:
+                    if _norm(item) not in seen:
+                        seen.add(_norm(item))
+                        items.append(item)
+            elif isinstance(value, str):
+                str_keys.add(key)
+                parts = merged.setdefault(key, [])
+                if value.strip() and _norm(value) not in {_norm(p) for p in parts}:
+                    parts.append(value.strip())
+            else:
+                merged.setdefault(key, value)
+    for key in str_keys:
+        merged[key] = " ".join(merged[key])
+    return merged
+
+
+def _norm(value) -> str:
+    return " ".join(str(value).split()).lower()
+
+
+def _analyze_gemini(transcript_text: str, context: str = "", category: str = "meeting",
+                    on_text=None) -> dict:
+    """on_text(text): 스트리밍 중 지금까지 받은 응답 원문 (None이면 한 번에 받음)."""
+    structured = config.LLM_JSON
+    system = _system_prompt(category, structured)
     user_part = _build_analysis_prompt(context, transcript_text)
-    prompt = f"{system}\n\n{user_part}"
-    response = client.models.generate_content(model=config.LLM_MODEL, contents=prompt)
-    return parse_llm_response(response.text, category)
-
-
-def _analyze_openai(transcript_text: str, context: str = "", category: str = "meeting") -> dict:
-    from openai import OpenAI
 
+    def call() -> str:
+        client = clients.get_client("gemini", config.GEMINI_API_KEY)
+        prompt = f"{system}\n\n{user_part}"
+        if structured:
+            response = client.models.generate_content(
+                model=config.LLM_MODEL, contents=prompt,
+                config={"response_mime_type": "application/json",
+                        "response_schema": analysis_json_schema(category, gemini=True)},
+            )
+            return response.text, _gemini_usage(response)
+        if on_text is None:
+            response = client.models.generate_content(model=config.LLM_MODEL, contents=prompt)
+            return response.text, _gemini_usage(response)
+        text, used = "", None
+        for chunk in client.models.generate_content_stream(model=config.LLM_MODEL, contents=prompt):
+            text += chunk.text or ""
+            used = _gemini_usage(chunk) or used  # 사용량은 마지막 청크에 온다
+            on_text(text)
+        return text, used
+
+    text = _cached_llm_call("gemini", config.LLM_MODEL, system, user_part, call,
+                            valid=_response_validator(category, structured))
+    return _parse_response(text, category, structured)
+
+
+def _analyze_openai(transcript_text: str, context: str = "", category: str = "meeting",
+                    on_text=None) -> dict:
     openai_model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-    client = OpenAI(api_key=config.OPENAI_API_KEY)
-    system = PROMPTS.get(category, PROMPTS["meeting"])
+    structured = config.LLM_JSON
+    system = _system_prompt(category, structured)
     prompt = _build_analysis_prompt(context, transcript_text)
-    response = client.chat.completions.create(
-        model=openai_model,
-        messages=[
-            {"role": "system", "content": system},
-            {"role": "user", "content": prompt},
-        ],
-        temperature=0.3,
-    )
-    return parse_llm_response(response.choices[0].message.content, category)
 
-
-def _analyze_basic(transcript_text: str) -> dict:
-    """LLM 없이 기본 분석 (전사본에서 핵심 문장 추출)."""
-    lines = [l.strip() for l in transcript_text.split(".") if len(l.strip()) > 10]
-    return {
-        "purpose": lines[0] if lines else "회의 분석 불가 (API 연결 실패)",
-        "discussion": lines[1:4] if len(lines) > 1 else [],
-        "decisions": [],
-        "action_items": [],
-        "follow_up": ["API 연결 복구 후 재분석을 권장합니다."],
+    def call() -> str:
+        client = clients.get_client("openai", config.OPENAI_API_KEY)
+        request = dict(
+            model=openai_model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt},
+            ],
+            temperature=0.3,
+        )
+        if structured:
+            request["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": f"{category}_analysis", "strict": True,
+                                "schema": analysis_json_schema(category)},
+            }
+        if on_text is None:
+            response = client.chat.completions.create(**request)
+            return response.choices[0].message.content, _openai_usage(response)
+        text, used = "", None
+        for chunk in client.chat.completions.create(**request, stream=True, stream_options={"include_usage": True}):
+            used = _openai_usage(chunk) or used  # 사용량은 choices가 빈 마지막 청크에 온다
+            if chunk.choices and chunk.choices[0].delta.content:
+                text += chunk.choices[0].delta.content
+                on_text(text)
+        return text, used
+
+    text = _cached_llm_call("openai", openai_model, system, prompt, call,
+                            valid=_response_validator(category, structured))
+    return _parse_response(text, category, structured)
+
+
+# ── 구조화(JSON) 출력 ──────────────────────────────────────────────────
+# 스키마는 SECTION_SCHEMAS에서 만들어 텍스트 파서와 같은 키·타입을 유지한다.
+
+def _system_prompt(category: str, structured: bool) -> str:
+    system = PROMPTS.get(category, PROMPTS["meeting"])
+    return system + JSON_OUTPUT_INSTRUCTION if structured else system
+
+
+def analysis_json_schema(category: str = "meeting", gemini: bool = False) -> dict:
+    """
+    카테고리 분석 결과의 JSON 스키마. 모든 키 필수, 추가 키 없음 (OpenAI strict 모드 조건).
+    gemini=True면 Gemini response_schema 형식 (OpenAPI 부분집합: 대문자 타입, additionalProperties 없음).
+    """
+    schema = SECTION_SCHEMAS.get(category, SECTION_SCHEMAS["meeting"])
+    t = str.upper if gemini else (lambda name: name)
+    properties = {
+        key: {"type": t("string")} if kind is str else {"type": t("array"), "items": {"type": t("string")}}
+        for _, key, kind in schema
     }
+    result = {"type": t("object"), "properties": properties, "required": [key for _, key, _ in schema]}
+    if not gemini:
+        result["additionalProperties"] = False
+    return result
+
+
+_JSON_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*(.*?)\s*```\s*$", re.S)
+
+
+def parse_json_analysis(response: str, category: str = "meeting") -> dict | None:
+    """
+    구조화 응답을 스키마에 맞춰 검증·정규화. 코드 펜스(```json)는 벗긴다.
+    JSON이 아니거나 스키마 키가 하나도 없거나 타입이 맞지 않으면 None.
+    빠진 키는 빈 값, 목록 자리에 온 문자열은 한 항목짜리 목록으로 받아들인다.
+    """
+    m = _JSON_FENCE_RE.match(response or "")
+    try:
+        data = json.loads(m.group(1) if m else response)
+    except (TypeError, ValueError):
+        return None
+    schema = SECTION_SCHEMAS.get(category, SECTION_SCHEMAS["meeting"])
+    if not isinstance(data, dict) or not any(key in data for _, key, _ in schema):
+        return None
+    result = {}
+    for _, key, kind in schema:
+        value = data.get(key)
+        if value is None:
+            value = kind()
+        if kind is str:
+            if not isinstance(value, str):
+                return None
+            result[key] = value.strip()
+            continue
+        if isinstance(value, str):
+            value = [value]
+        if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+            return None
+        result[key] = [item.strip() for item in value if item.strip()]
+    return result
+
+
+def _parse_response(text: str, category: str, structured: bool) -> dict:
+    """
+    구조화 모드면 JSON으로 검증하고, 실패하면 텍스트 파서로 한 번 더 시도.
+    둘 다 빈 결과면 ValueError (다음 provider로 넘어가도록).
+    """
+    if not structured:
+        return parse_llm_response(text, category)
+    data = parse_json_analysis(text, category)
+    if data is not None:
+        return data
+    print("[Analyzer] 구조화 응답 검증 실패 — 텍스트 파서로 재시도")
+    result = parse_llm_response(text, category)
+    if not _is_parseable(result):
+        raise ValueError("구조화 응답을 해석할 수 없음")
+    return result
+
+
+def _response_validator(category: str, structured: bool):
+    """해석할 수 있는 응답만 캐시하도록 _cached_llm_call에 넘기는 함수 (텍스트 모드도 섹션이 하나는 있어야 함)."""
+    if not structured:
+        return lambda text: _is_parseable(parse_llm_response(text, category))
+    return lambda text: (parse_json_analysis(text, category) is not None
+                         or _is_parseable(parse_llm_response(text, category)))
+
+
+# ── LLM 응답 캐시 ──────────────────────────────────────────────────────
+# 파싱 전 원문을 저장하므로 파서를 고쳐도 캐시를 비울 필요가 없다.
+
+_llm_cache: DiskCache | None = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> DiskCache:
+    """프로세스 전역 LLM 응답 캐시 (DATA_DIR/llm_cache)."""
+    global _llm_cache
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = DiskCache(config.DATA_DIR / "llm_cache", config.LLM_CACHE_MAX_MB * 1024 * 1024)
+        return _llm_cache
+
+
+def _cached_llm_call(provider: str, model: str, system: str, user: str, call, valid=None) -> str:
+    """
+    (provider, model, system prompt, user prompt) 지문으로 응답을 캐시.
+    미스일 때만 call()을 재시도/서킷 브레이커 정책 아래에서 실행.
+    call()은 (응답 원문, 사용량 dict 또는 None)을 반환. 사용량이 없으면 추정 토큰으로 기록한다.
+    valid(text)가 있으면 True인 응답만 캐시 (해석할 수 없는 응답이 캐시에 남지 않도록).
+    """
+    key = make_key("llm", provider, model, system, user)
+    if config.LLM_CACHE:
+        hit = get_llm_cache().get(key)
+        if hit is not None:
+            print(f"[Analyzer] LLM 캐시 사용 ({provider}/{model}, {key[:12]})")
+            llm_usage.record_call(provider, model, cached=True)
+            return hit["text"]
+    t0 = time.perf_counter()
+    text, used = call_with_retry(provider, lambda: _timed_call(provider, call))
+    llm_usage.record_call(
+        provider, model,
+        input_tokens=used["input_tokens"] if used else estimate_tokens(system) + estimate_tokens(user),
+        output_tokens=used["output_tokens"] if used else estimate_tokens(text or ""),
+        latency_sec=time.perf_counter() - t0, estimated=used is None,
+    )
+    if config.LLM_CACHE and text and (valid is None or valid(text)):
+        get_llm_cache().set(key, {"text": text})
+    return text
 
 
-def parse_llm_response(response: str, category: str = "meeting") -> dict:
-    """카테고리별 파서 디스패처."""
-    if category in ("meeting", "discussion"):
-        return _parse_meeting(response)
-    elif category == "voice_memo":
-        return _parse_voice_memo(response)
-    elif category == "daily":
-        return _parse_daily(response)
-    elif category == "lecture":
-        return _parse_lecture(response)
-    elif category == "reference":
-        return _parse_reference(response)
-    return _parse_meeting(response)
+def _section_emitter(category: str, on_partial):
+    """스트리밍 원문을 받아 완성된 섹션이 바뀔 때만 on_partial(sections)을 호출하는 콜백."""
+    parser = SectionParser(category)
+    last: dict = {}
 
+    def on_text(text: str) -> None:
+        nonlocal last
+        sections = parser.feed(text)
+        if sections and sections != last:
+            last = sections
+            on_partial(sections)
 
-# ── 공통 헬퍼 ──────────────────────────────────────────────────────────
+    return on_text
 
-def _extract_line(text: str, key: str) -> str:
-    m = re.search(rf"{key}:\s*(.+)", text)
-    return m.group(1).strip() if m else ""
 
+def _timed_call(provider: str, call):
+    """실제 API 호출 시간을 provider별 지연 통계에 기록."""
+    t0 = time.perf_counter()
+    try:
+        result = call()
+    except Exception:
+        get_latency_stats().record(provider, time.perf_counter() - t0, ok=False)
+        raise
+    get_latency_stats().record(provider, time.perf_counter() - t0)
+    return result
 
-def _extract_list(text: str, key: str) -> list[str]:
-    m = re.search(rf"{key}:\s*\n((?:- .+\n?)*)", text)
-    if not m:
-        return []
-    return [item.strip() for item in re.findall(r"- (.+)", m.group(1)) if item.strip()]
 
+def _gemini_usage(response) -> dict | None:
+    """Gemini 응답(또는 스트림 청크)의 usage_metadata. 없으면 None."""
+    meta = getattr(response, "usage_metadata", None)
+    if meta is None or getattr(meta, "prompt_token_count", None) is None:
+        return None
+    return {"input_tokens": meta.prompt_token_count, "output_tokens": getattr(meta, "candidates_token_count", 0) or 0}
 
-# ── 카테고리별 파서 ────────────────────────────────────────────────────
 
-def _parse_meeting(response: str) -> dict:
-    sections = {
-        "purpose": "",
-        "discussion": [],
-        "decisions": [],
-        "action_items": [],
-        "follow_up": [],
-    }
-    purpose_match = re.search(r"PURPOSE:\s*(.+)", response)
-    if purpose_match:
-        sections["purpose"] = purpose_match.group(1).strip()
-    for section_key, dict_key in [
-        ("DISCUSSION", "discussion"),
-        ("DECISIONS", "decisions"),
-        ("ACTION_ITEMS", "action_items"),
-        ("FOLLOW_UP", "follow_up"),
-    ]:
-        match = re.search(rf"{section_key}:\s*\n((?:- .+\n?)*)", response)
-        if match:
-            sections[dict_key] = [
-                item.strip()
-                for item in re.findall(r"- (.+)", match.group(1))
-                if item.strip()
-            ]
-    return sections
-
-
-def _parse_voice_memo(response: str) -> dict:
-    return {
-        "summary": _extract_line(response, "SUMMARY"),
-        "key_points": _extract_list(response, "KEY_POINTS"),
-        "action_items": _extract_list(response, "ACTION_ITEMS"),
-    }
+def _openai_usage(response) -> dict | None:
+    """OpenAI 응답(또는 include_usage 스트림의 마지막 청크)의 usage. 없으면 None."""
+    used = getattr(response, "usage", None)
+    if used is None or getattr(used, "prompt_tokens", None) is None:
+        return None
+    return {"input_tokens": used.prompt_tokens, "output_tokens": getattr(used, "completion_tokens", 0) or 0}
 
 
-def _parse_daily(response: str) -> dict:
+def _analyze_basic(transcript_text: str) -> dict:
+    """LLM 없이 기본 분석 (전사본에서 핵심 문장 추출)."""
+    lines = [l.strip() for l in transcript_text.split(".") if len(l.strip()) > 10]
     return {
-        "tasks_done": _extract_list(response, "TASKS_DONE"),
-        "tasks_tomorrow": _extract_list(response, "TASKS_TOMORROW"),
-        "issues": _extract_list(response, "ISSUES"),
-        "reflection": _extract_line(response, "REFLECTION"),
+        "purpose": lines[0] if lines else "회의 분석 불가 (API 연결 실패)",
+        "discussion": lines[1:4] if len(lines) > 1 else [],
+        "decisions": [],
+        "action_items": [],
+        "follow_up": ["API 연결 복구 후 재분석을 권장합니다."],
     }
 
 
-def _parse_lecture(response: str) -> dict:
-    return {
-        "summary": _extract_line(response, "SUMMARY"),
-        "key_concepts": _extract_list(response, "KEY_CONCEPTS"),
-        "important_points": _extract_list(response, "IMPORTANT_POINTS"),
-        "references": _extract_list(response, "REFERENCES"),
-        "questions": _extract_list(response, "QUESTIONS"),
-    }
+# ── 응답 파서 ──────────────────────────────────────────────────────────
+# 카테고리별 섹션 스키마: (응답 헤더, 결과 키, 타입). str은 한 줄 값, list는 bullet 목록.
+
+_MEETING_SCHEMA = (
+    ("PURPOSE", "purpose", str),
+    ("DISCUSSION", "discussion", list),
+    ("DECISIONS", "decisions", list),
+    ("ACTION_ITEMS", "action_items", list),
+    ("FOLLOW_UP", "follow_up", list),
+)
+
+SECTION_SCHEMAS: dict[str, tuple[tuple[str, str, type], ...]] = {
+    "meeting": _MEETING_SCHEMA,
+    "discussion": _MEETING_SCHEMA,
+    "voice_memo": (
+        ("SUMMARY", "summary", str),
+        ("KEY_POINTS", "key_points", list),
+        ("ACTION_ITEMS", "action_items", list),
+    ),
+    "daily": (
+        ("TASKS_DONE", "tasks_done", list),
+        ("TASKS_TOMORROW", "tasks_tomorrow", list),
+        ("ISSUES", "issues", list),
+        ("REFLECTION", "reflection", str),
+    ),
+    "lecture": (
+        ("SUMMARY", "summary", str),
+        ("KEY_CONCEPTS", "key_concepts", list),
+        ("IMPORTANT_POINTS", "important_points", list),
+        ("REFERENCES", "references", list),
+        ("QUESTIONS", "questions", list),
+    ),
+    "reference": (
+        ("SUMMARY", "summary", str),
+        ("KEY_FINDINGS", "key_findings", list),
+        ("METHODOLOGY", "methodology", str),
+        ("APPLICABILITY", "applicability", str),
+        ("CITATIONS", "citations", list),
+    ),
+}
+
+# 섹션 토큰: 헤더("PURPOSE: …", "**DECISIONS:**", "**ACTION_ITEMS**: …", "## DISCUSSION")와
+# 바로 뒤에 이어지는 빈 줄/bullet 줄 블록을 한 번에 읽는다. bullet이 아닌 줄에서 블록이 끝난다.
+# 콜론이 붙은 헤더는 이전 파서처럼 줄 중간에서도 인식하고, 콜론 없는 헤더는 이름만 있는 줄
+# (#, ** 장식 허용)일 때만 인정한다 ("DECISIONS 관련 내용은 아래" 같은 본문 줄은 헤더가 아님).
+# 카테고리마다 스키마의 헤더 이름만 대안으로 넣어 한 번 컴파일해 둔다 (줄 시작 = 앞의 "\n").
+_BULLET = r"(?:[-*•+]|\d{1,3}[.)])[ \t]+"
+_TOKEN_TEMPLATE = (
+    r"(?:(?<![A-Za-z0-9_])\**({names})\**[ \t]*:\**[ \t]*(.*)"
+    r"|\n[ \t]*(?:#{1,6}[ \t]*)?\**({names})\**[ \t]*(?=\n|$))"
+    r"((?:\n[ \t]*(?:" + _BULLET + r".*|(?=\n|$)))*)"
+)
+_TOKEN_RES = {
+    category: re.compile(
+        _TOKEN_TEMPLATE.replace("{names}", "|".join(sorted((h for h, _, _ in schema), key=len, reverse=True)))
+    )
+    for category, schema in SECTION_SCHEMAS.items()
+}
+_SCHEMA_INDEX = {
+    category: {header: (key, kind) for header, key, kind in schema}
+    for category, schema in SECTION_SCHEMAS.items()
+}
+_ITEM_RE = re.compile(r"\n[ \t]*" + _BULLET + r"(.*\S)")
+# 헤더 줄에 값이 없을 때 다음 비어 있지 않은 줄
+_NEXT_LINE_RE = re.compile(r"\s*(?:" + _BULLET + r")?(.*\S)")
+
+
+class SectionParser:
+    """
+    LLM 응답을 섹션 스키마에 따라 한 번 훑어 파싱.
+    스트리밍 중에는 feed()에 지금까지 받은 전체 텍스트를 넘기면 아직 끝나지 않았을 수 있는
+    마지막 섹션 위치부터만 다시 읽는다 (완성된 섹션은 다시 파싱하지 않음).
+    같은 섹션 헤더가 다시 나오면 처음 것을 사용.
+    """
+
+    def __init__(self, category: str = "meeting"):
+        if category not in SECTION_SCHEMAS:
+            category = "meeting"
+        self._token_re = _TOKEN_RES[category]
+        self._index = _SCHEMA_INDEX[category]
+        self._reset()
+
+    def _reset(self) -> None:
+        self.sections = {key: kind() for key, kind in self._index.values()}
+        self.seen: list[str] = []     # 완성된 섹션 키 (등장 순서)
+        self._buf = "\n"
+        self._resume = 0              # 마지막(미완성일 수 있는) 섹션 헤더 위치
+        self._open = None             # 마지막 섹션 토큰
+
+    def feed(self, text: str) -> dict:
+        """
+        지금까지 받은 응답 전체를 넘기고 완성된 섹션만 반환.
+        앞부분이 달라졌으면(재시도로 스트림이 새로 시작) 처음부터 다시 파싱한다.
+        """
+        buf = "\n" + text
+        if not buf.startswith(self._buf[:self._resume]):
+            self._reset()
+        self._buf = buf
+        prev = None  # 마지막 섹션 헤더는 _resume 위치에서 다시 찾는다
+        for m in self._token_re.finditer(buf, self._resume):
+            if prev is not None:
+                self._commit(prev, m.start())
+            prev = m
+        if prev is not None:
+            self._open, self._resume = prev, prev.start()
+        return {key: self.sections[key] for key in self.seen}
+
+    def close(self) -> dict:
+        """응답이 끝났을 때 마지막 섹션까지 반영한 전체 결과 (스키마의 모든 키 포함)."""
+        if self._open is not None:
+            self._commit(self._open, len(self._buf))
+            self._open = None
+            self._resume = len(self._buf)
+        return self.sections
+
+    def _commit(self, m: re.Match, end: int) -> None:
+        # 그룹: 1 콜론 헤더 이름, 2 헤더 줄의 값, 3 콜론 없는 헤더 이름, 4 bullet 블록
+        key, kind = self._index[m.group(1) or m.group(3)]
+        if key in self.seen:
+            return
+        self.seen.append(key)
+        if kind is list:
+            self.sections[key] = _ITEM_RE.findall(m.group(4))
+            return
+        value = (m.group(2) or "").strip()
+        if not value:
+            # 값이 다음 줄에 오는 경우
+            nxt = _NEXT_LINE_RE.match(self._buf, m.end(2) if m.group(2) is not None else m.end(3), end)
+            value = nxt.group(1) if nxt else ""
+        self.sections[key] = value
 
 
-def _parse_reference(response: str) -> dict:
-    return {
-        "summary": _extract_line(response, "SUMMARY"),
-        "key_findings": _extract_list(response, "KEY_FINDINGS"),
-        "methodology": _extract_line(response, "METHODOLOGY"),
-        "applicability": _extract_line(response, "APPLICABILITY"),
-        "citations": _extract_list(response, "CITATIONS"),
-    }
+def parse_llm_response(response: str, category: str = "meeting") -> dict:
+    """카테고리 스키마에 따라 응답을 섹션별로 파싱. 알 수 없는 카테고리는 회의 스키마."""
+    parser = SectionParser(category)
+    parser.feed(response)
+    return parser.close()
+
+
+def parse_partial_response(response: str, category: str = "meeting") -> dict:
+    """
+    생성 중인 응답에서 완성된 섹션만 파싱.
+    다음 섹션 헤더가 나온 섹션을 완성으로 보고, 마지막 섹션은 아직 생성 중일 수 있어 제외한다.
+    """
+    return SectionParser(category).feed(response)
@@ -0,0 +1,52 @@
+"""프로세스 전역 LLM/API 클라이언트 풀.
+
+호출마다 genai.Client / OpenAI 클라이언트를 새로 만들면 매번 TLS 핸드셰이크와 초기화 비용이 든다.
+(provider, API 키)별로 클라이언트를 하나씩 보관해 작업 간에 keep-alive 연결을 재사용하고,
+/settings에서 키가 바뀌면 reset()으로 비운다.
+"""
+import hashlib
+import threading
+
+_clients: dict[tuple[str, str], object] = {}
+_lock = threading.Lock()
+
+
+def _create(provider: str, api_key: str) -> object:
+    if provider == "gemini":
+        from google import genai
+        return genai.Client(api_key=api_key)
+    if provider == "openai":
+        from openai import OpenAI
+        return OpenAI(api_key=api_key)
+    raise ValueError(f"알 수 없는 provider: {provider}")
+
+
+def get_client(provider: str, api_key: str) -> object:
+    """provider("gemini" | "openai")와 API 키에 해당하는 공유 클라이언트."""
+    key = (provider, hashlib.sha256(api_key.encode()).hexdigest()[:12])
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _create(provider, api_key)
+            _clients[key] = client
+        return client
+
+
+def reset(provider: str | None = None) -> int:
+    """보관 중인 클라이언트를 닫고 제거 (provider=None이면 전부). Returns: 제거한 수"""
+    with _lock:
+        keys = [k for k in _clients if provider is None or k[0] == provider]
+        removed = [_clients.pop(k) for k in keys]
+    for client in removed:
+        close = getattr(client, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                print(f"[Clients] 클라이언트 종료 실패: {e}")
+    return len(removed)
+
+
+def cached_keys() -> list[tuple[str, str]]:
+    with _lock:
+        return list(_clients)
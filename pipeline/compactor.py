@@ -0,0 +1,99 @@
+"""LLM 분석 전 전사본 압축.
+
+전사 세그먼트를 그대로 이어붙이면 추임새("어", "음"), 반복 단어, Whisper 환각 반복 구간이
+입력 토큰과 LLM 지연을 늘린다. 같은 화자의 연속 세그먼트를 한 줄로 합치고(화자 라벨 유지),
+추임새와 연속 반복 구를 제거한 텍스트를 만든다. 노트에 저장하는 전사본은 원본 그대로 둔다.
+"""
+import math
+import re
+
+import config
+
+# 연속으로 반복되면 하나만 남길 구의 최대 단어 수 (환각 루프는 보통 짧은 문장 반복)
+MAX_REPEAT_WORDS = 8
+
+_PUNCT = ".,!?…~·\"'()[]"
+_ASCII_RE = re.compile(r"[\x00-\x7f]")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토큰 수 어림값 (토크나이저 없이). ASCII는 4글자당 1토큰,
+    한글 등 비ASCII 문자는 글자당 0.8토큰으로 계산한다 (공백 제외).
+    """
+    if not text:
+        return 0
+    ascii_chars = len(_ASCII_RE.findall(text))
+    spaces = text.count(" ") + text.count("\n")
+    return math.ceil((ascii_chars - spaces) / 4 + (len(text) - ascii_chars) * 0.8)
+
+
+def filler_words() -> frozenset[str]:
+    """COMPACT_FILLERS (쉼표 구분) 추임새 목록."""
+    return frozenset(w.strip() for w in config.COMPACT_FILLERS.split(",") if w.strip())
+
+
+def compact_segments(segments: list[dict], fillers: frozenset[str] | None = None) -> tuple[list[dict], dict]:
+    """
+    Returns: (압축 세그먼트, 보고서)
+      압축 세그먼트: 화자가 바뀔 때마다 하나, text는 "화자: 내용" (화자가 없으면 내용만)
+      보고서: tokens_before/after/saved, fillers_removed, repeats_removed, segments_before/after
+    """
+    fillers = filler_words() if fillers is None else fillers
+    report = {"fillers_removed": 0, "repeats_removed": 0}
+
+    runs: list[tuple[str | None, list[str]]] = []
+    for seg in segments:
+        words = seg.get("text", "").split()
+        if not words:
+            continue
+        speaker = seg.get("speaker")
+        if runs and runs[-1][0] == speaker:
+            runs[-1][1].extend(words)
+        else:
+            runs.append((speaker, list(words)))
+
+    compacted = []
+    for speaker, words in runs:
+        kept = [w for w in words if _norm_word(w) not in fillers]
+        report["fillers_removed"] += len(words) - len(kept)
+        kept, removed = _collapse_repeats(kept)
+        report["repeats_removed"] += removed
+        if not kept:
+            continue
+        text = " ".join(kept)
+        compacted.append({"speaker": speaker, "text": f"{speaker}: {text}" if speaker else text})
+
+    before = " ".join(s.get("text", "") for s in segments if s.get("text"))
+    after = "\n".join(s["text"] for s in compacted)
+    report.update({
+        "segments_before": len(segments),
+        "segments_after": len(compacted),
+        "tokens_before": estimate_tokens(before),
+        "tokens_after": estimate_tokens(after),
+    })
+    report["tokens_saved"] = report["tokens_before"] - report["tokens_after"]
+    return compacted, report
+
+
+def _norm_word(word: str) -> str:
+    return word.strip(_PUNCT).lower()
+
+
+def _collapse_repeats(words: list[str], max_n: int = MAX_REPEAT_WORDS) -> tuple[list[str], int]:
+    """
+    바로 앞 구와 같은 구(1~max_n 단어)가 이어지면 제거 ("네 네 네", "감사합니다. 감사합니다." 루프).
+    비교는 문장부호·대소문자를 무시한다. Returns: (남은 단어, 제거한 단어 수)
+    """
+    out: list[str] = []
+    norm: list[str] = []
+    removed = 0
+    for w in words:
+        out.append(w)
+        norm.append(_norm_word(w))
+        for n in range(1, min(max_n, len(norm) // 2) + 1):
+            if norm[-n:] == norm[-2 * n:-n]:
+                del out[-n:], norm[-n:]
+                removed += n
+                break
+    return out, removed
@@ -0,0 +1,108 @@
+"""디스크 JSON 캐시.
+
+항목 하나를 파일 하나(root/ab/<key>.json)로 저장하고, 전체 크기가 max_bytes를 넘으면
+가장 오래 쓰지 않은 항목(mtime 기준, 조회 시 갱신)부터 삭제한다.
+전사 결과, LLM 분석 결과처럼 다시 계산하기 비싼 값을 재시작 후에도 재사용하는 데 쓴다.
+"""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+
+def make_key(*parts) -> str:
+    """캐시 키 구성 요소를 SHA-256 hex로 요약."""
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    def __init__(self, root: Path, max_bytes: int | None = None):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total: int | None = None  # 첫 기록 시 계산
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str):
+        """없거나 읽을 수 없으면 None."""
+        path = self._path(key)
+        try:
+            value = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)  # LRU 순서 갱신
+        except OSError:
+            pass
+        return value
+
+    def set(self, key: str, value) -> None:
+        path = self._path(key)
+        data = json.dumps(value, ensure_ascii=False, default=str).encode("utf-8")
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            old = path.stat().st_size if path.exists() else 0
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(data)
+            tmp.replace(path)
+            if self._total is None:
+                self._total = self._scan_size()
+            else:
+                self._total += len(data) - old
+            self._evict_locked()
+
+    def delete(self, key: str) -> None:
+        path = self._path(key)
+        with self._lock:
+            try:
+                size = path.stat().st_size
+                path.unlink()
+            except OSError:
+                return
+            if self._total is not None:
+                self._total -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in self._entries():
+                path.unlink(missing_ok=True)
+            self._total = 0
+
+    def size_bytes(self) -> int:
+        with self._lock:
+            if self._total is None:
+                self._total = self._scan_size()
+            return self._total
+
+    def _entries(self) -> list[Path]:
+        return list(self.root.glob("*/*.json")) if self.root.exists() else []
+
+    def _scan_size(self) -> int:
+        total = 0
+        for path in self._entries():
+            try:
+                total += path.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def _evict_locked(self) -> None:
+        if self.max_bytes is None or self._total <= self.max_bytes:
+            return
+        entries = []
+        for path in self._entries():
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        entries.sort()
+        for _, size, path in entries:
+            if self._total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            self._total -= size
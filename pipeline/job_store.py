@@ -0,0 +1,320 @@
+"""작업 상태 저장소.
+
+진행 중인 작업만 메모리(dict)에 두고, 종료된 작업은 백엔드(SQLite)로 내려보낸 뒤 메모리에서 제거한다.
+segments, logs 같은 큰 필드는 jobs 테이블과 분리된 job_payloads 테이블에 저장해
+목록/상태 조회가 큰 데이터를 읽지 않도록 한다. 서버를 오래 켜둬도 메모리가 늘지 않고 재시작 후에도 결과가 남는다.
+"""
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import MutableMapping
+from pathlib import Path
+
+TERMINAL_STATUSES = ("done", "error", "cancelled")
+
+# 별도 테이블에 저장하는 큰 필드
+PAYLOAD_FIELDS = (
+    "segments", "partial_segments", "full_text", "analysis", "analysis_edited",
+    "md_source_text", "logs",
+)
+
+
+class MemoryJobBackend:
+    """프로세스 메모리 백엔드 (테스트 및 lifespan 이전 기본값)."""
+
+    def __init__(self):
+        self._jobs: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def save(self, job_id: str, job: dict) -> None:
+        copy = json.loads(json.dumps(dict(job), default=str))
+        copy["updated_at"] = time.time()
+        with self._lock:
+            self._jobs[job_id] = copy
+
+    def load(self, job_id: str, fields: tuple[str, ...] | None = PAYLOAD_FIELDS) -> dict | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            job = json.loads(json.dumps(job))
+        for k in set(PAYLOAD_FIELDS) - set(fields or ()):
+            job.pop(k, None)
+        return job
+
+    def exists(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._jobs
+
+    def delete(self, job_id: str) -> None:
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def ids(self) -> list[str]:
+        with self._lock:
+            return list(self._jobs)
+
+    def ids_with_status(self, statuses: tuple[str, ...]) -> list[str]:
+        with self._lock:
+            return [k for k, v in self._jobs.items() if v.get("status") in statuses]
+
+    def gc(self, older_than: float) -> int:
+        with self._lock:
+            stale = [
+                k for k, v in self._jobs.items()
+                if v.get("status") in TERMINAL_STATUSES and v.get("updated_at", 0) < older_than
+            ]
+            for k in stale:
+                del self._jobs[k]
+        return len(stale)
+
+
+class SQLiteJobBackend:
+    """SQLite(WAL) 백엔드. 작업 id·상태 인덱스, 큰 필드는 job_payloads 테이블에 분리 저장."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id         TEXT PRIMARY KEY,
+                status     TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                meta       TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, updated_at);
+            CREATE TABLE IF NOT EXISTS job_payloads (
+                job_id TEXT NOT NULL,
+                field  TEXT NOT NULL,
+                value  TEXT NOT NULL,
+                PRIMARY KEY (job_id, field)
+            );
+        """)
+
+    def save(self, job_id: str, job: dict) -> None:
+        job = dict(job)  # 처리 스레드가 갱신 중이어도 안전하게 순회
+        meta = {k: v for k, v in job.items() if k not in PAYLOAD_FIELDS}
+        payloads = [
+            (job_id, k, json.dumps(job[k], ensure_ascii=False, default=str))
+            for k in PAYLOAD_FIELDS if k in job
+        ]
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    "INSERT INTO jobs (id, status, created_at, updated_at, meta) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET status=excluded.status, "
+                    "updated_at=excluded.updated_at, meta=excluded.meta",
+                    (job_id, job.get("status", ""), job.get("created_at", now), now,
+                     json.dumps(meta, ensure_ascii=False, default=str)),
+                )
+                self._conn.execute("DELETE FROM job_payloads WHERE job_id = ?", (job_id,))
+                self._conn.executemany(
+                    "INSERT INTO job_payloads (job_id, field, value) VALUES (?, ?, ?)", payloads
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def load(self, job_id: str, fields: tuple[str, ...] | None = PAYLOAD_FIELDS) -> dict | None:
+        """fields: 함께 읽을 큰 필드 (None이면 메타데이터만)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT meta, updated_at FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            job = json.loads(row[0])
+            job["updated_at"] = row[1]
+            if fields:
+                marks = ",".join("?" * len(fields))
+                for field, value in self._conn.execute(
+                    f"SELECT field, value FROM job_payloads WHERE job_id = ? AND field IN ({marks})",
+                    (job_id, *fields),
+                ):
+                    job[field] = json.loads(value)
+        return job
+
+    def exists(self, job_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM jobs WHERE id = ?", (job_id,)).fetchone() is not None
+
+    def delete(self, job_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+            self._conn.execute("DELETE FROM job_payloads WHERE job_id = ?", (job_id,))
+
+    def ids(self) -> list[str]:
+        with self._lock:
+            return [r[0] for r in self._conn.execute("SELECT id FROM jobs")]
+
+    def ids_with_status(self, statuses: tuple[str, ...]) -> list[str]:
+        marks = ",".join("?" * len(statuses))
+        with self._lock:
+            return [r[0] for r in self._conn.execute(
+                f"SELECT id FROM jobs WHERE status IN ({marks})", statuses
+            )]
+
+    def gc(self, older_than: float) -> int:
+        marks = ",".join("?" * len(TERMINAL_STATUSES))
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute(
+                f"DELETE FROM job_payloads WHERE job_id IN (SELECT id FROM jobs "
+                f"WHERE status IN ({marks}) AND updated_at < ?)",
+                (*TERMINAL_STATUSES, older_than),
+            )
+            cur = self._conn.execute(
+                f"DELETE FROM jobs WHERE status IN ({marks}) AND updated_at < ?",
+                (*TERMINAL_STATUSES, older_than),
+            )
+            self._conn.execute("COMMIT")
+            return cur.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class JobStore(MutableMapping):
+    """
+    job_id → 작업 dict 매핑.
+    진행 중 작업은 메모리에서 직접 수정하고 save()로 백엔드에 반영하며,
+    종료 시 finish()로 백엔드에 저장 후 메모리에서 내린다.
+    메모리에 없는 작업은 조회 시 백엔드에서 읽어온다 (읽기 전용 사본).
+    """
+
+    def __init__(self, backend=None, ttl_sec: float = 7 * 86400, gc_interval_sec: float = 600):
+        self.backend = backend or MemoryJobBackend()
+        self.ttl_sec = ttl_sec
+        self.gc_interval_sec = gc_interval_sec
+        self._active: dict[str, dict] = {}
+        self._resume_lock = threading.Lock()
+        self._last_gc = 0.0
+
+    def open(self, backend, ttl_sec: float | None = None) -> None:
+        """영구 백엔드 연결 (서버 시작 시). 메모리에 있던 작업은 새 백엔드로 옮긴다."""
+        self.backend = backend
+        if ttl_sec is not None:
+            self.ttl_sec = ttl_sec
+        for job_id, job in self._active.items():
+            backend.save(job_id, job)
+
+    # ── MutableMapping ──────────────────────────────────────
+    def __getitem__(self, job_id: str) -> dict:
+        job = self._active.get(job_id)
+        if job is not None:
+            return job
+        job = self.backend.load(job_id)
+        if job is None:
+            raise KeyError(job_id)
+        return job
+
+    def __setitem__(self, job_id: str, job: dict) -> None:
+        job.setdefault("created_at", time.time())
+        self._active[job_id] = job
+        self.backend.save(job_id, job)
+
+    def __delitem__(self, job_id: str) -> None:
+        found = self._active.pop(job_id, None) is not None
+        if not found and not self.backend.exists(job_id):
+            raise KeyError(job_id)
+        self.backend.delete(job_id)
+
+    def __contains__(self, job_id: object) -> bool:
+        return job_id in self._active or self.backend.exists(job_id)
+
+    def __iter__(self):
+        seen = set(self._active)
+        yield from list(self._active)
+        yield from (k for k in self.backend.ids() if k not in seen)
+
+    def __len__(self) -> int:
+        return len(set(self._active) | set(self.backend.ids()))
+
+    def view(self, job_id: str, fields: tuple[str, ...] | None = PAYLOAD_FIELDS) -> dict:
+        """큰 필드는 fields에 지정한 것만 포함한 사본 (메모리 작업은 얕은 사본)."""
+        job = self._active.get(job_id)
+        if job is None:
+            job = self.backend.load(job_id, fields=fields)
+            if job is None:
+                raise KeyError(job_id)
+            return job
+        skip = set(PAYLOAD_FIELDS) - set(fields or ())
+        return {k: v for k, v in list(job.items()) if k not in skip}
+
+    # ── 영속화 ─────────────────────────────────────────────
+    def active_ids(self) -> list[str]:
+        return list(self._active)
+
+    def save(self, job_id: str) -> None:
+        """메모리의 현재 상태를 백엔드에 반영 (상태 전이 시 호출)."""
+        job = self._active.get(job_id)
+        if job is not None:
+            self.backend.save(job_id, job)
+
+    def park(self, job_id: str) -> None:
+        """작업을 저장하고 메모리에서 내린다 (검토 대기처럼 처리 스레드 없이 기다리는 작업)."""
+        job = self._active.pop(job_id, None)
+        if job is not None:
+            self.backend.save(job_id, job)
+
+    def resume(self, job_id: str) -> dict:
+        """park()한 작업을 다시 메모리로 올려 수정 가능한 dict를 반환."""
+        with self._resume_lock:
+            job = self._active.get(job_id)
+            if job is None:
+                job = self.backend.load(job_id)
+                if job is None:
+                    raise KeyError(job_id)
+                self._active[job_id] = job
+            return job
+
+    def finish(self, job_id: str) -> None:
+        """종료된 작업을 저장하고 메모리에서 내린다."""
+        self.park(job_id)
+        self.maybe_gc()
+
+    def recover_interrupted(self, keep: tuple[str, ...] = ()) -> list[str]:
+        """
+        재시작 전 진행 중이던 작업을 오류로 표시 (처리 스레드가 사라졌으므로).
+        keep: 재시작 후에도 이어갈 수 있는 상태
+        """
+        stale = [
+            job_id for job_id in self.backend.ids_with_status(
+                ("queued", "transcribing", "analyzing", "review", "confirmed",
+                 "building", "saving", "cancelling")
+            )
+            if job_id not in self._active
+        ]
+        recovered = []
+        for job_id in stale:
+            job = self.backend.load(job_id)
+            if job is None or job.get("status") in keep:
+                continue
+            msg = "서버 재시작으로 작업이 중단됐습니다. 다시 업로드하세요."
+            job.update({"status": "error", "step": "오류", "progress": 0,
+                        "detail": msg, "error": msg, "result": None})
+            self.backend.save(job_id, job)
+            recovered.append(job_id)
+        return recovered
+
+    def gc(self) -> int:
+        """TTL이 지난 종료 작업 삭제."""
+        self._last_gc = time.time()
+        removed = self.backend.gc(time.time() - self.ttl_sec)
+        if removed:
+            print(f"[JobStore] 만료 작업 {removed}건 정리")
+        return removed
+
+    def maybe_gc(self) -> None:
+        if time.time() - self._last_gc >= self.gc_interval_sec:
+            self.gc()
@@ -0,0 +1,90 @@
+"""외부 API 응답 시간 통계.
+
+provider별 최근 응답 시간 표본과 성공/실패 횟수를 보관해 백분위 지연을 계산한다.
+헤지(hedged) 요청의 대기 시간 결정과 /metrics 노출에 쓰며, 재시작 후에도 이어지도록 JSON 파일에 보존한다.
+"""
+import json
+import threading
+from collections import deque
+from pathlib import Path
+
+import config
+
+MIN_SAMPLES = 5  # 이보다 적으면 백분위를 신뢰하지 않음
+
+
+class LatencyStats:
+    def __init__(self, path: Path | None, max_samples: int = 200):
+        self.path = Path(path) if path else None
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._samples: dict[str, deque] = {}
+        self._errors: dict[str, int] = {}
+        if self.path:
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                for name, entry in data.items():
+                    self._samples[name] = deque(entry.get("samples", []), maxlen=max_samples)
+                    self._errors[name] = entry.get("errors", 0)
+            except (OSError, ValueError, AttributeError):
+                pass
+
+    def record(self, name: str, seconds: float, ok: bool = True) -> None:
+        with self._lock:
+            if ok:
+                self._samples.setdefault(name, deque(maxlen=self.max_samples)).append(round(seconds, 3))
+            else:
+                self._errors[name] = self._errors.get(name, 0) + 1
+            # 잠금 안에서 기록해 오래된 스냅샷이 최신 파일을 덮어쓰지 않도록
+            self._save(self._dump_locked())
+
+    def percentile(self, name: str, pct: float) -> float | None:
+        """최근 표본의 pct 백분위 (초). 표본이 MIN_SAMPLES 미만이면 None."""
+        with self._lock:
+            samples = sorted(self._samples.get(name, ()))
+        if len(samples) < MIN_SAMPLES:
+            return None
+        idx = min(len(samples) - 1, max(0, round(pct / 100 * (len(samples) - 1))))
+        return samples[idx]
+
+    def summary(self) -> dict[str, dict]:
+        names = set(self._samples) | set(self._errors)
+        out = {}
+        for name in sorted(names):
+            with self._lock:
+                count = len(self._samples.get(name, ()))
+                errors = self._errors.get(name, 0)
+            out[name] = {
+                "count": count, "errors": errors,
+                **{f"p{p}": self.percentile(name, p) for p in (50, 90, 99)},
+            }
+        return out
+
+    def _dump_locked(self) -> str:
+        names = set(self._samples) | set(self._errors)
+        return json.dumps({
+            name: {"samples": list(self._samples.get(name, ())), "errors": self._errors.get(name, 0)}
+            for name in names
+        })
+
+    def _save(self, text: str) -> None:
+        if not self.path:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(text, encoding="utf-8")
+        except OSError as e:
+            print(f"[Latency] 통계 저장 실패: {e}")
+
+
+_stats: LatencyStats | None = None
+_stats_lock = threading.Lock()
+
+
+def get_latency_stats() -> LatencyStats:
+    """프로세스 전역 API 지연 통계 (DATA_DIR/api_latency.json)."""
+    global _stats
+    with _stats_lock:
+        if _stats is None:
+            _stats = LatencyStats(config.DATA_DIR / "api_latency.json")
+        return _stats
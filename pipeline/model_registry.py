@@ -0,0 +1,196 @@
+"""프로세스 전역 WhisperX 모델 레지스트리.
+
+업로드마다 모델을 새로 만들지 않도록 ASR 모델, 단어 정렬 모델, 화자 분리 파이프라인을
+키별로 보관하고 작업 간에 재사용한다. 전체 상주 메모리가 MODEL_CACHE_MAX_MB를 넘으면
+가장 오래 사용하지 않은 항목부터 해제한다 (LRU by resident bytes).
+"""
+import gc
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import config
+
+# 모델 메모리 추정 실패 시 사용할 근사치 (MB, float16 기준)
+_ASR_SIZE_MB = {
+    "tiny": 75, "base": 145, "small": 485, "medium": 1530,
+    "large": 3090, "large-v2": 3090, "large-v3": 3090, "turbo": 1620,
+}
+_DEFAULT_SIZE_MB = 500
+
+
+class _Entry:
+    __slots__ = ("value", "nbytes")
+
+    def __init__(self, value: object, nbytes: int):
+        self.value = value
+        self.nbytes = nbytes
+
+
+_lock = threading.Lock()
+_cache: "OrderedDict[tuple, _Entry]" = OrderedDict()
+# 로드 락 (키 해시로 고른 고정 개수의 락): 같은 모델은 한 번만 로드하되, 서로 다른 모델은 대개 동시에 로드 가능.
+# 키마다 락을 만들면 모델 이름·토큰이 바뀔 때마다 락이 쌓이므로 개수를 고정한다.
+_LOAD_STRIPES = 16
+_load_locks = [threading.Lock() for _ in range(_LOAD_STRIPES)]
+
+
+def _load_lock(key: tuple) -> threading.Lock:
+    return _load_locks[hash(key) % _LOAD_STRIPES]
+
+
+def _get_or_load(key: tuple, loader, size_hint_mb: int = _DEFAULT_SIZE_MB) -> tuple[object, float]:
+    start = time.perf_counter()
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None:
+            _cache.move_to_end(key)
+            return entry.value, time.perf_counter() - start
+
+    with _load_lock(key):
+        with _lock:
+            entry = _cache.get(key)
+            if entry is not None:
+                _cache.move_to_end(key)
+                return entry.value, time.perf_counter() - start
+        print(f"[ModelRegistry] 로드: {key}")
+        value = loader()
+        nbytes = _estimate_bytes(value) or size_hint_mb * 1024 * 1024
+        with _lock:
+            _cache[key] = _Entry(value, nbytes)
+            _evict_locked(keep=key)
+    return value, time.perf_counter() - start
+
+
+def get_asr_model(model_name: str, device: str, compute_type: str, language: str = "ko") -> tuple[object, float]:
+    """
+    캐시된 ASR 모델 반환. 없으면 로드 후 등록.
+    Returns: (model, load_sec) — 캐시 적중 시 load_sec ≈ 0
+    """
+    def _load():
+        import whisperx
+        return whisperx.load_model(
+            model_name, device,
+            compute_type=compute_type, language=language
+        )
+
+    size_mb = _ASR_SIZE_MB.get(model_name, _DEFAULT_SIZE_MB)
+    if compute_type == "int8":
+        size_mb //= 2
+    return _get_or_load(("asr", model_name, device, compute_type), _load, size_mb)
+
+
+def get_align_model(language_code: str, device: str) -> tuple[tuple[object, dict], float]:
+    """단어 정렬 모델. Returns: ((align_model, metadata), load_sec)"""
+    def _load():
+        import whisperx
+        return whisperx.load_align_model(language_code=language_code, device=device)
+
+    return _get_or_load(("align", language_code, device), _load, 1200)
+
+
+def get_diarize_pipeline(hf_token: str, device: str) -> tuple[object, float]:
+    """pyannote 화자 분리 파이프라인. Returns: (pipeline, load_sec)"""
+    def _load():
+        from whisperx.diarize import DiarizationPipeline
+        return DiarizationPipeline(token=hf_token, device=device)
+
+    # 토큰 원문을 키에 남기지 않음
+    token_id = hashlib.sha256(hf_token.encode()).hexdigest()[:12]
+    return _get_or_load(("diarize", token_id, device), _load, 100)
+
+
+def loaded_keys(kind: str | None = None) -> list[tuple]:
+    """현재 메모리에 올라와 있는 모델 키 목록 (오래 사용 안 한 순)."""
+    with _lock:
+        return [k for k in _cache if kind is None or k[0] == kind]
+
+
+def resident_bytes() -> int:
+    """레지스트리가 보유한 모델들의 추정 메모리 합계."""
+    with _lock:
+        return sum(e.nbytes for e in _cache.values())
+
+
+def unload(model_name: str | None = None, kind: str = "asr") -> int:
+    """
+    모델 해제. kind("asr"/"align"/"diarize")가 None이면 전 종류 대상.
+    model_name이 주어지면 ASR 중 해당 모델만 해제.
+    Returns: 해제된 모델 수
+    """
+    with _lock:
+        keys = [
+            k for k in _cache
+            if (kind is None or k[0] == kind)
+            and (model_name is None or (k[0] == "asr" and k[1] == model_name))
+        ]
+        for k in keys:
+            del _cache[k]
+    if keys:
+        print(f"[ModelRegistry] 해제: {keys}")
+        _release_memory()
+    return len(keys)
+
+
+def _evict_locked(keep: tuple) -> None:
+    """상한 초과 시 LRU 순으로 해제. 방금 로드한 항목은 유지. _lock 보유 상태에서 호출."""
+    budget = config.MODEL_CACHE_MAX_MB * 1024 * 1024
+    total = sum(e.nbytes for e in _cache.values())
+    evicted = []
+    for k in list(_cache):
+        if total <= budget:
+            break
+        if k == keep:
+            continue
+        total -= _cache.pop(k).nbytes
+        evicted.append(k)
+    if evicted:
+        print(f"[ModelRegistry] 메모리 상한 초과로 해제: {evicted}")
+        gc.collect()
+
+
+def _estimate_bytes(obj: object) -> int:
+    """torch 모듈의 파라미터/버퍼 크기를 합산. 추정 불가면 0."""
+    try:
+        import torch
+    except Exception:
+        return 0
+
+    seen: set[int] = set()
+
+    def module_bytes(m) -> int:
+        total = 0
+        for t in list(m.parameters()) + list(m.buffers()):
+            if id(t) not in seen:
+                seen.add(id(t))
+                total += t.numel() * t.element_size()
+        return total
+
+    def walk(o, depth: int) -> int:
+        if isinstance(o, torch.nn.Module):
+            return module_bytes(o)
+        if depth == 0:
+            return 0
+        if isinstance(o, (tuple, list)):
+            children = o
+        elif isinstance(o, dict):
+            children = o.values()
+        else:
+            children = getattr(o, "__dict__", {}).values()
+        return sum(walk(c, depth - 1) for c in children)
+
+    try:
+        return walk(obj, 3)
+    except Exception:
+        return 0
+
+
+def _release_memory() -> None:
+    gc.collect()
+    try:
+        import torch
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except Exception:
+        pass
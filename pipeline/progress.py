@@ -0,0 +1,203 @@
+"""전사 진행률/ETA 추정.
+
+고정 마일스톤(0→40→70→90) 대신 단계별로 처리한 오디오 길이(초)를 기준으로 진행률을 계산한다.
+실제 처리 위치를 알 수 없는 단계는 이 머신에서 측정한 과거 실시간 배율(RTF: 처리 시간 ÷ 오디오 길이)로
+경과 시간을 오디오 위치로 환산하며, 같은 RTF로 남은 시간(ETA)을 추정한다.
+"""
+import json
+import threading
+import time
+from pathlib import Path
+
+import config
+
+STAGES = ("asr", "align", "diarize")
+
+# 측정값이 없을 때 쓰는 기본 RTF (처리 초 / 오디오 초)
+_DEFAULT_RTF = {
+    "cuda": {"asr": 0.05, "align": 0.02, "diarize": 0.03},
+    "cpu":  {"asr": 0.5,  "align": 0.1,  "diarize": 0.3},
+}
+_EMA_ALPHA = 0.3
+_MIN_AUDIO_SEC = 5.0  # 너무 짧은 녹음은 고정 비용이 커서 RTF 측정에서 제외
+
+# 전사 단계가 차지하는 전체 진행률 범위 (이후 AI 분석 96%~)
+PCT_START, PCT_END = 2, 95
+
+
+class RtfStats:
+    """(device, model, stage)별 RTF 이동평균. JSON 파일에 보존."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._data: dict[str, float] = {}
+        self._dirty = False
+        try:
+            self._data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def _key(device: str, model: str, stage: str) -> str:
+        # 정렬/화자 분리는 Whisper 모델과 무관
+        return f"{device}/{model if stage == 'asr' else '-'}/{stage}"
+
+    def get(self, device: str, model: str, stage: str) -> float:
+        with self._lock:
+            rtf = self._data.get(self._key(device, model, stage))
+        if rtf is None:
+            rtf = _DEFAULT_RTF.get(device, _DEFAULT_RTF["cpu"])[stage]
+        return rtf
+
+    def record(self, device: str, model: str, stage: str, elapsed_sec: float, audio_sec: float) -> None:
+        if audio_sec < _MIN_AUDIO_SEC or elapsed_sec <= 0:
+            return
+        rtf = elapsed_sec / audio_sec
+        key = self._key(device, model, stage)
+        with self._lock:
+            prev = self._data.get(key)
+            self._data[key] = rtf if prev is None else prev + _EMA_ALPHA * (rtf - prev)
+            self._dirty = True
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            text = json.dumps(self._data, indent=2)
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(text, encoding="utf-8")
+        except OSError as e:
+            print(f"[Progress] RTF 통계 저장 실패: {e}")
+
+
+_stats: RtfStats | None = None
+_stats_lock = threading.Lock()
+
+
+def get_stats() -> RtfStats:
+    """프로세스 전역 RTF 통계 (DATA_DIR/rtf_stats.json)."""
+    global _stats
+    with _stats_lock:
+        if _stats is None:
+            _stats = RtfStats(config.DATA_DIR / "rtf_stats.json")
+        return _stats
+
+
+class TranscribeProgress:
+    """
+    단계별 처리 위치로 진행률과 ETA를 계산해 on_progress(pct, detail, eta_sec=...)로 보고.
+    화자 분리가 병렬이면 (전사+정렬)과 화자 분리 중 오래 걸리는 쪽이 남은 시간을 결정한다.
+    """
+
+    def __init__(self, on_progress, audio_sec: float, device: str, model: str,
+                 parallel_diarize: bool, stats: RtfStats | None = None,
+                 clock=time.monotonic, tick_sec: float = 1.0):
+        self._on_progress = on_progress
+        self.audio_sec = max(audio_sec, 0.001)
+        self.device = device
+        self.model = model
+        self.parallel = parallel_diarize
+        self.stats = stats or get_stats()
+        self._clock = clock
+        self._tick_sec = tick_sec
+        self._lock = threading.Lock()
+        self._est = {s: self.stats.get(device, model, s) * self.audio_sec for s in STAGES}
+        self._started: dict[str, float] = {}
+        self._done: dict[str, float] = {}
+        self._position: dict[str, float] = {}
+        self._detail = ""
+        self._last_pct = PCT_START
+        self._stop = threading.Event()
+        self._ticker: threading.Thread | None = None
+
+    # ── 단계 보고 ─────────────────────────────────────────────
+    def begin(self, stage: str, detail: str = "") -> None:
+        with self._lock:
+            self._started[stage] = self._clock()
+            if detail:
+                self._detail = detail
+        self._emit()
+
+    def advance(self, stage: str, processed_sec: float, detail: str = "", segments: list | None = None) -> None:
+        """실제 처리한 오디오 위치(초) 보고 (구간 전사 등)."""
+        with self._lock:
+            self._position[stage] = min(processed_sec, self.audio_sec)
+            if detail:
+                self._detail = detail
+        self._emit(segments=segments)
+
+    def end(self, stage: str, detail: str = "", record: bool = True) -> None:
+        with self._lock:
+            now = self._clock()
+            start = self._started.setdefault(stage, now)
+            self._done[stage] = now
+            if detail:
+                self._detail = detail
+        if record:
+            self.stats.record(self.device, self.model, stage, now - start, self.audio_sec)
+        self._emit()
+
+    def message(self, detail: str) -> None:
+        with self._lock:
+            self._detail = detail
+        self._emit()
+
+    # ── 주기적 갱신 ──────────────────────────────────────────
+    def start(self) -> None:
+        """실제 위치를 모르는 구간에서도 진행률이 멈추지 않도록 주기적으로 보고."""
+        if self._on_progress is None or self._ticker is not None:
+            return
+        self._ticker = threading.Thread(target=self._run_ticker, daemon=True, name="progress-ticker")
+        self._ticker.start()
+
+    def finish(self) -> None:
+        self._stop.set()
+        self.stats.save()
+
+    def _run_ticker(self) -> None:
+        while not self._stop.wait(self._tick_sec):
+            self._emit()
+
+    # ── 계산 ────────────────────────────────────────────────
+    def _fraction(self, stage: str, now: float) -> float:
+        if stage in self._done:
+            return 1.0
+        if stage not in self._started:
+            return 0.0
+        if stage in self._position:
+            return self._position[stage] / self.audio_sec
+        est = self._est[stage]
+        return min(0.95, (now - self._started[stage]) / est) if est > 0 else 0.95
+
+    def _remaining(self, now: float) -> tuple[float, float]:
+        """Returns: (남은 예상 시간, 전체 예상 시간)"""
+        rem = {s: self._est[s] * (1 - self._fraction(s, now)) for s in STAGES}
+        if self.parallel:
+            # 화자 분리는 전사 시작부터 이미 진행 중이므로 (전사+정렬)과 겹친다
+            total = max(self._est["asr"] + self._est["align"], self._est["diarize"])
+            remaining = max(rem["asr"] + rem["align"], rem["diarize"])
+        else:
+            total = sum(self._est.values())
+            remaining = sum(rem.values())
+        return remaining, total
+
+    def snapshot(self) -> tuple[int, float]:
+        """Returns: (진행률 %, ETA 초). 진행률은 단조 증가."""
+        with self._lock:
+            remaining, total = self._remaining(self._clock())
+            frac = 1 - remaining / total if total > 0 else 0.0
+            pct = PCT_START + int((PCT_END - PCT_START) * max(0.0, min(1.0, frac)))
+            self._last_pct = max(self._last_pct, pct)
+            return self._last_pct, remaining
+
+    def _emit(self, segments: list | None = None) -> None:
+        if self._on_progress is None:
+            return
+        pct, eta = self.snapshot()
+        kwargs = {"eta_sec": round(eta)}
+        if segments is not None:
+            kwargs["segments"] = segments
+        self._on_progress(pct, self._detail, **kwargs)
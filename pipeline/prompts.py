@@ -94,3 +94,10 @@ PROMPTS: dict[str, str] = {
     "lecture":    LECTURE_PROMPT,
     "reference":  REFERENCE_PROMPT,
 }
+
+# 구조화 출력(LLM_JSON) 모드에서 카테고리 프롬프트 뒤에 붙이는 지시
+JSON_OUTPUT_INSTRUCTION = """
+
+출력은 위 텍스트 형식 대신 JSON 객체 하나로만 작성하세요.
+각 섹션 이름을 소문자 키로 사용하고 (예: PURPOSE → "purpose", ACTION_ITEMS → "action_items"),
+한 줄 섹션은 문자열, '- ' 목록 섹션은 문자열 배열로 넣으세요. 항목이 없으면 빈 문자열 또는 빈 배열로 두세요."""
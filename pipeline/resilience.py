@@ -0,0 +1,165 @@
+"""외부 API 호출 재시도 + provider별 서킷 브레이커.
+
+429/5xx/타임아웃 같은 일시적 오류는 지수 백오프(full jitter)로 재시도하고,
+연속 실패가 BREAKER_FAILURES회에 이르면 해당 provider 브레이커를 열어 BREAKER_RESET_SEC 동안
+호출 없이 즉시 실패시킨다(다음 provider로 바로 폴백). 시간이 지나면 한 번의 시험 호출(half-open)로
+복구 여부를 확인한다. 브레이커는 프로세스 전역이라 모든 작업이 상태를 공유한다.
+"""
+import random
+import threading
+import time
+
+import config
+
+_RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """브레이커가 열려 있어 호출하지 않음."""
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int, reset_sec: float, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_sec = reset_sec
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state_locked()
+
+    def _state_locked(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.reset_sec:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """호출해도 되는지. half-open에서는 시험 호출 하나만 허용."""
+        with self._lock:
+            state = self._state_locked()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                print(f"[Resilience] {self.name} 복구 — 브레이커 닫힘")
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._probing:
+                    print(f"[Resilience] {self.name} 연속 실패 {self._failures}회 — {self.reset_sec:.0f}초간 호출 중단")
+                self._opened_at = self._clock()
+            self._probing = False
+
+    def record_neutral(self) -> None:
+        """provider 상태와 무관한 결과(4xx 등). 연속 실패 수와 열림 상태는 그대로 두고 시험 호출만 끝낸다."""
+        with self._lock:
+            self._probing = False
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"state": self._state_locked(), "failures": self._failures}
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """provider별 공유 브레이커."""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, config.BREAKER_FAILURES, config.BREAKER_RESET_SEC)
+            _breakers[name] = breaker
+        return breaker
+
+
+def breaker_states() -> dict[str, dict]:
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {b.name: b.snapshot() for b in breakers}
+
+
+def reset_breakers() -> None:
+    with _breakers_lock:
+        _breakers.clear()
+
+
+def _status_code(exc: Exception) -> int | None:
+    for attr in ("status_code", "code", "status"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(exc, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def is_retryable(exc: Exception) -> bool:
+    """일시적 오류(429, 5xx, 타임아웃, 연결 오류)인지."""
+    status = _status_code(exc)
+    if status is not None:
+        return status in _RETRYABLE_STATUS
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    # SDK별 예외 클래스(APITimeoutError, APIConnectionError, ReadTimeout 등)
+    name = type(exc).__name__
+    return "Timeout" in name or "Connection" in name
+
+
+def _retry_after(exc: Exception) -> float | None:
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def call_with_retry(name: str, fn, *, retries: int | None = None, sleep=time.sleep):
+    """
+    fn()을 provider 브레이커와 재시도 정책 아래에서 호출.
+    Raises: CircuitOpenError (브레이커 열림), 또는 마지막 시도의 예외
+    """
+    breaker = get_breaker(name)
+    retries = config.API_RETRIES if retries is None else retries
+    for attempt in range(retries + 1):
+        if not breaker.allow():
+            raise CircuitOpenError(f"{name} 브레이커 열림 — 호출 생략")
+        try:
+            result = fn()
+        except Exception as e:
+            if not is_retryable(e):
+                # 요청 자체의 문제(4xx 등) — 장애도 복구도 아니므로 브레이커 상태를 바꾸지 않음
+                breaker.record_neutral()
+                raise
+            breaker.record_failure()
+            if attempt >= retries or breaker.state != "closed":
+                # 재시도 소진, 또는 이번 실패로 브레이커가 열림
+                raise
+            cap = min(config.API_RETRY_MAX_SEC, config.API_RETRY_BASE_SEC * 2 ** attempt)
+            delay = _retry_after(e)
+            delay = min(delay, config.API_RETRY_MAX_SEC) if delay is not None else random.uniform(0, cap)
+            print(f"[Resilience] {name} 일시 오류 ({e}) — {delay:.1f}초 후 재시도 ({attempt + 1}/{retries})")
+            sleep(delay)
+        else:
+            breaker.record_success()
+            return result
@@ -0,0 +1,122 @@
+"""작업 스케줄러.
+
+레인(lane)별로 고정 개수의 워커 스레드와 우선순위 대기열을 둔다.
+전사처럼 무거운 작업은 "audio" 레인 슬롯 수만큼만 동시에 실행되고(모델 중복 로드/OOM 방지),
+MD 임포트 같은 가벼운 작업은 "light" 레인에서 처리돼 긴 전사 뒤에 줄 서지 않는다.
+"""
+import heapq
+import itertools
+import threading
+import traceback
+
+
+class _Lane:
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = max(1, workers)
+        self.queue: list[tuple] = []   # (-priority, seq, job_id, fn, args, kwargs)
+        self.running: set[str] = set()
+        self.threads: list[threading.Thread] = []
+
+
+class JobScheduler:
+    def __init__(self, lanes: dict[str, int]):
+        """lanes: 레인 이름 → 동시 실행 슬롯 수"""
+        self._lanes = {name: _Lane(name, n) for name, n in lanes.items()}
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._started = False
+        self._stopping = False
+
+    def submit(self, job_id: str, fn, *args, lane: str = "audio", priority: int = 0, **kwargs) -> int:
+        """
+        작업을 대기열에 추가. priority가 클수록 먼저, 같으면 먼저 들어온 순서(FIFO).
+        Returns: 대기열 순번 (1부터)
+        """
+        with self._cond:
+            q = self._lanes[lane].queue
+            heapq.heappush(q, (-priority, next(self._seq), job_id, fn, args, kwargs))
+            self._cond.notify_all()
+            return self._position_locked(lane, job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """아직 시작하지 않은 작업을 대기열에서 제거. 제거했으면 True."""
+        with self._cond:
+            for lane in self._lanes.values():
+                for i, item in enumerate(lane.queue):
+                    if item[2] == job_id:
+                        lane.queue.pop(i)
+                        heapq.heapify(lane.queue)
+                        return True
+        return False
+
+    def position(self, job_id: str) -> int | None:
+        """대기 중이면 레인 내 순번(1부터), 실행 중이면 0, 없으면 None."""
+        with self._cond:
+            for name, lane in self._lanes.items():
+                if job_id in lane.running:
+                    return 0
+                pos = self._position_locked(name, job_id)
+                if pos is not None:
+                    return pos
+        return None
+
+    def _position_locked(self, lane: str, job_id: str) -> int | None:
+        for i, item in enumerate(sorted(self._lanes[lane].queue)):
+            if item[2] == job_id:
+                return i + 1
+        return None
+
+    def stats(self) -> dict[str, dict]:
+        with self._cond:
+            return {
+                name: {"workers": lane.workers, "running": len(lane.running), "queued": len(lane.queue)}
+                for name, lane in self._lanes.items()
+            }
+
+    # ── 워커 ────────────────────────────────────────────────
+    def start(self) -> None:
+        """워커 스레드 시작 (서버 lifespan에서 호출). 그 전에 들어온 작업은 대기열에서 기다린다."""
+        with self._cond:
+            if self._started:
+                return
+            self._started = True
+            self._stopping = False
+            for lane in self._lanes.values():
+                for i in range(lane.workers):
+                    t = threading.Thread(
+                        target=self._worker, args=(lane,), daemon=True,
+                        name=f"{lane.name}-worker-{i}",
+                    )
+                    lane.threads.append(t)
+                    t.start()
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            threads = [t for lane in self._lanes.values() for t in lane.threads]
+        if wait:
+            for t in threads:
+                t.join()
+        with self._cond:
+            for lane in self._lanes.values():
+                lane.threads.clear()
+            self._started = False
+
+    def _worker(self, lane: _Lane) -> None:
+        while True:
+            with self._cond:
+                while not lane.queue and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                _, _, job_id, fn, args, kwargs = heapq.heappop(lane.queue)
+                lane.running.add(job_id)
+            try:
+                fn(*args, **kwargs)
+            except Exception:
+                print(f"[Scheduler] {lane.name} 작업 {job_id} 처리 중 예외:\n{traceback.format_exc()}")
+            finally:
+                with self._cond:
+                    lane.running.discard(job_id)
@@ -1,5 +1,15 @@
+import subprocess
+import threading
+import time
+import uuid
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor, wait
 from pathlib import Path
 import config
+from pipeline import clients, model_registry
+from pipeline.disk_cache import DiskCache, make_key
+from pipeline.progress import PCT_END, TranscribeProgress
+from pipeline.resilience import call_with_retry
+from pipeline.uploads import file_sha256
 
 
 def _build_initial_prompt(domain_vocab: str, context: str) -> str:
@@ -8,19 +18,42 @@ def _build_initial_prompt(domain_vocab: str, context: str) -> str:
     return ". ".join(parts)
 
 
-def transcribe(audio_path: Path, on_progress=None, context: str = "") -> dict:
+def transcribe(audio_path: Path, on_progress=None, context: str = "", category: str = "meeting",
+               audio_sha256: str | None = None) -> dict:
     """
     오디오 파일을 전사. 화자 분리 포함.
     로컬 Whisper + pyannote 우선, 실패 시 OpenAI API 폴백.
+    on_progress(pct, detail, eta_sec=...)는 처리한 오디오 위치 기준 진행률과 남은 시간을 받는다.
+    강의(lecture)이거나 CHUNK_MIN_SEC 이상인 녹음은 구간 단위로 전사하며,
+    on_progress(..., segments=[...])로 중간 결과를 함께 전달한다.
+    같은 오디오(audio_sha256, 없으면 파일 해시)·모델·프롬프트의 로컬 전사 결과는 디스크 캐시에서 재사용한다.
     Returns:
         segments: [{"timestamp": "MM:SS", "speaker": "Speaker A", "text": "..."}]
         full_text: str
         duration:  str (MM:SS 또는 HH:MM:SS)
         method:    "local" | "api"
+        failed_stages: 로컬 전사에서 실패해 건너뛴 단계 ("align", "diarize")
+        cached:    캐시에서 읽었으면 True
     """
     initial_prompt = _build_initial_prompt(config.DOMAIN_VOCAB, context)
+    cache_key = None
+    if config.TRANSCRIPT_CACHE:
+        cache_key = _transcript_cache_key(audio_path, audio_sha256, initial_prompt)
+        hit = get_transcript_cache().get(cache_key)
+        if hit is not None:
+            print(f"[Transcriber] 전사 캐시 사용 ({cache_key[:12]})")
+            if on_progress:
+                on_progress(PCT_END, "이전 전사 결과 재사용", eta_sec=0)
+            return {**hit, "cached": True, "timings": {}}
     try:
-        return _transcribe_local(audio_path, on_progress, initial_prompt)
+        result = _transcribe_local(audio_path, on_progress, initial_prompt, category)
+        if cache_key is not None:
+            if result.get("failed_stages"):
+                # 정렬/화자 분리가 빠진 결과를 캐시하면 같은 오디오를 다시 올려도 재시도하지 않게 됨
+                print(f"[Transcriber] {', '.join(result['failed_stages'])} 단계 실패 — 전사 캐시에 저장하지 않음")
+            else:
+                get_transcript_cache().set(cache_key, {k: result[k] for k in _CACHED_FIELDS})
+        return result
     except RuntimeError:
         raise  # 다운로드 실패 등 치명적 오류는 폴백 없이 즉시 전파
     except Exception as e:
@@ -28,6 +61,32 @@ def transcribe(audio_path: Path, on_progress=None, context: str = "") -> dict:
         return _transcribe_api(audio_path)
 
 
+# ── 전사 결과 캐시 ──────────────────────────────────────────────────
+_CACHED_FIELDS = ("segments", "full_text", "duration", "method")
+_transcript_cache: DiskCache | None = None
+_transcript_cache_lock = threading.Lock()
+
+
+def get_transcript_cache() -> DiskCache:
+    """프로세스 전역 전사 캐시 (DATA_DIR/transcripts)."""
+    global _transcript_cache
+    with _transcript_cache_lock:
+        if _transcript_cache is None:
+            _transcript_cache = DiskCache(
+                config.DATA_DIR / "transcripts", config.TRANSCRIPT_CACHE_MAX_MB * 1024 * 1024
+            )
+        return _transcript_cache
+
+
+def _transcript_cache_key(audio_path: Path, audio_sha256: str | None, initial_prompt: str) -> str:
+    """(오디오 내용 해시, 모델, compute_type, initial_prompt, 화자 분리 토큰 유무) 캐시 키."""
+    _, compute_type = _detect_device()
+    return make_key(
+        "transcript", audio_sha256 or file_sha256(audio_path),
+        config.WHISPER_MODEL, compute_type, initial_prompt, bool(config.HF_TOKEN),
+    )
+
+
 def is_cuda_available() -> bool:
     """CUDA 사용 가능 여부 확인."""
     try:
@@ -44,25 +103,158 @@ def _detect_device() -> tuple[str, str]:
     return "cpu", "int8"
 
 
-def _transcribe_local(audio_path: Path, on_progress=None, initial_prompt: str = "") -> dict:
-    import whisperx
-    import whisperx.audio
+def preload_model() -> float:
+    """현재 설정의 ASR 모델을 미리 로드 (서버 시작 시 호출). Returns: 로드 시간(초)"""
+    device, compute_type = _detect_device()
+    _, load_sec = model_registry.get_asr_model(config.WHISPER_MODEL, device, compute_type)
+    print(f"[Transcriber] 모델 사전 로드 완료 ({config.WHISPER_MODEL}, {load_sec:.1f}s)")
+    return load_sec
+
 
+def _transcribe_local(audio_path: Path, on_progress=None, initial_prompt: str = "", category: str = "meeting") -> dict:
     device, compute_type = _detect_device()
     model_name = config.WHISPER_MODEL
+    timings: dict[str, float] = {}
     if on_progress:
         on_progress(0, f"모델 로딩 중... ({device.upper()}, {model_name})")
     print(f"[Transcriber] WhisperX device={device}, compute_type={compute_type}, model={model_name}")
 
     # batch_size: GPU는 16, CPU는 4 (메모리 절약)
     batch_size = 16 if device == "cuda" else 4
+    wall_start = time.perf_counter()
+
+    # 0. 디코딩은 한 번만 — 같은 파형 버퍼를 전사/정렬/화자 분리가 공유
+    t0 = time.perf_counter()
+    audio, pcm_path = _decode_audio(audio_path)
+    timings["decode"] = time.perf_counter() - t0
+    from whisperx.audio import SAMPLE_RATE
+    audio_sec = len(audio) / SAMPLE_RATE
+    chunked = category == "lecture" or audio_sec >= config.CHUNK_MIN_SEC
+
+    # 진행률은 단계별 처리 위치 + 과거 RTF 기반으로 계산
+    progress = TranscribeProgress(on_progress, audio_sec, device, model_name, config.DIARIZE_PARALLEL)
+    progress.message(f"디코딩 완료 ({_fmt(audio_sec)}), 모델 준비 중...")
+    progress.start()
+
+    # 화자 분리는 전사 결과가 필요 없으므로 별도 스레드에서 ASR과 동시에 실행
+    diarize_pool = None
+    diarize_future = None
+    diarize_abort = threading.Event()
+    if config.DIARIZE_PARALLEL:
+        diarize_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="diarize")
+        diarize_future = diarize_pool.submit(_run_diarization, audio, device, progress, diarize_abort)
 
-    # 1. 전사
     try:
-        model = whisperx.load_model(
-            model_name, device,
-            compute_type=compute_type, language="ko"
+        return _transcribe_local_stages(
+            audio, progress, initial_prompt,
+            device, compute_type, model_name, batch_size,
+            timings, wall_start, diarize_future, chunked,
         )
+    finally:
+        if diarize_future is not None and not diarize_future.done():
+            # 전사 단계가 실패해 화자 분리 결과가 필요 없음: 시작 전이면 취소, 모델 로딩 중이면 실행하지 않게 하고,
+            # 이미 실행 중이면 끝날 때까지 기다림 (다음 작업과 GPU를 같이 쓰거나 진행률을 덮어쓰지 않도록)
+            diarize_abort.set()
+            if not diarize_future.cancel():
+                print("[Transcriber] 전사 실패 — 진행 중인 화자 분리 종료 대기")
+                wait([diarize_future])
+        if diarize_pool is not None:
+            diarize_pool.shutdown(wait=True)
+        progress.finish()
+        del audio
+        if pcm_path is not None:
+            try:
+                pcm_path.unlink(missing_ok=True)
+            except OSError as e:
+                # Windows: 아직 매핑이 살아있으면 삭제 불가 — 다음 정리 때 제거
+                print(f"[Transcriber] PCM 임시 파일 삭제 실패: {e}")
+
+
+def _decode_audio(audio_path: Path):
+    """
+    ffmpeg로 16kHz mono float32 PCM을 한 번만 디코딩.
+    whisperx.load_audio(s16le → float32 변환)와 달리 중간 int16 버퍼 없이 파형 하나만 만든다.
+    디코딩 결과가 AUDIO_MMAP_MIN_MB 이상이면 힙에 올리지 않고 메모리 맵으로 연다.
+    PCM 임시 파일은 UPLOAD_DIR에 만든다 (일괄 처리의 원본 폴더는 읽기 전용일 수 있고, 녹음 사이에 남으면 안 됨).
+    Returns: (audio, pcm_path) — pcm_path는 메모리 맵을 쓴 경우에만 남아있는 임시 파일
+    """
+    import numpy as np
+    from whisperx.audio import SAMPLE_RATE
+
+    config.UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    pcm_path = config.UPLOAD_DIR / f"{uuid.uuid4().hex}.f32"
+    cmd = [
+        "ffmpeg", "-nostdin", "-threads", "0", "-i", str(audio_path),
+        "-f", "f32le", "-ac", "1", "-acodec", "pcm_f32le", "-ar", str(SAMPLE_RATE),
+        "-y", str(pcm_path),
+    ]
+    try:
+        subprocess.run(cmd, capture_output=True, check=True)
+        mmap_min = config.AUDIO_MMAP_MIN_MB * 1024 * 1024
+        if config.AUDIO_MMAP_MIN_MB >= 0 and pcm_path.stat().st_size >= mmap_min:
+            # copy-on-write: 소비자가 torch.from_numpy로 감싸도 원본 파일은 변하지 않음
+            return np.memmap(pcm_path, dtype=np.float32, mode="c"), pcm_path
+        audio = np.fromfile(pcm_path, dtype=np.float32)
+    except subprocess.CalledProcessError as e:
+        pcm_path.unlink(missing_ok=True)
+        raise RuntimeError(f"오디오 디코딩 실패: {e.stderr.decode(errors='ignore')[-500:]}") from e
+    except BaseException:
+        pcm_path.unlink(missing_ok=True)
+        raise
+    pcm_path.unlink()
+    return audio, None
+
+
+def cleanup_pcm_files(max_age_sec: float = 3600) -> int:
+    """비정상 종료로 UPLOAD_DIR에 남은 PCM 임시 파일 삭제 (디코딩 직후의 파일은 건드리지 않도록 max_age_sec 이전 것만)."""
+    removed = 0
+    cutoff = time.time() - max_age_sec
+    for path in config.UPLOAD_DIR.glob("*.f32"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            # Windows: 다른 프로세스(일괄 처리 등)가 아직 메모리 맵으로 쓰는 중
+            continue
+    return removed
+
+
+def _run_diarization(audio, device: str, progress: TranscribeProgress | None = None,
+                     abort: threading.Event | None = None) -> tuple[object, float, float]:
+    """
+    디코딩된 파형으로 화자 분리 실행. Returns: (diarize_segments, load_sec, run_sec)
+    abort가 모델 로딩 중에 설정되면 화자 분리를 시작하지 않고 CancelledError.
+    """
+    diarize_model, load_sec = model_registry.get_diarize_pipeline(config.HF_TOKEN, device)
+    if abort is not None and abort.is_set():
+        raise CancelledError()
+    if progress:
+        progress.begin("diarize")
+    t0 = time.perf_counter()
+    try:
+        diarize_segments = diarize_model(audio)
+    except Exception:
+        if progress:
+            progress.end("diarize", record=False)
+        raise
+    if progress:
+        progress.end("diarize")
+    return diarize_segments, load_sec, time.perf_counter() - t0
+
+
+def _transcribe_local_stages(
+    audio, progress: TranscribeProgress, initial_prompt: str,
+    device: str, compute_type: str, model_name: str, batch_size: int,
+    timings: dict[str, float], wall_start: float, diarize_future: Future | None,
+    chunked: bool = False,
+) -> dict:
+    import whisperx
+    import whisperx.audio
+
+    # 1. 전사 (모델은 레지스트리에서 재사용)
+    try:
+        model, timings["model_load"] = model_registry.get_asr_model(model_name, device, compute_type)
     except Exception as e:
         err_msg = str(e)
         if "Connection" in err_msg or "download" in err_msg.lower() or "HTTP" in err_msg:
@@ -72,87 +264,182 @@ def _transcribe_local(audio_path: Path, on_progress=None, initial_prompt: str =
             )
         if "out of memory" in err_msg.lower() and device == "cuda":
             print(f"[Transcriber] CUDA OOM ({compute_type}), int8로 재시도...")
-            if on_progress:
-                on_progress(5, f"VRAM 부족 — int8 모드로 재시도 중... ({model_name})")
+            progress.message(f"VRAM 부족 — int8 모드로 재시도 중... ({model_name})")
             compute_type = "int8"
-            model = whisperx.load_model(
-                model_name, device,
-                compute_type=compute_type, language="ko"
-            )
+            model, timings["model_load"] = model_registry.get_asr_model(model_name, device, compute_type)
         else:
             raise
-    audio = whisperx.load_audio(str(audio_path))
+    if timings["model_load"] < 0.1:
+        print(f"[Transcriber] 캐시된 모델 재사용 ({model_name}, {compute_type})")
+    t0 = time.perf_counter()
     transcribe_kwargs = {"batch_size": batch_size}
     if initial_prompt:
         transcribe_kwargs["initial_prompt"] = initial_prompt
-    try:
-        result = model.transcribe(audio, **transcribe_kwargs)
-    except TypeError as e:
-        if "initial_prompt" in str(e):
-            print(f"[Transcriber] 이 WhisperX 버전은 initial_prompt 미지원 — 프롬프트 없이 재시도")
-            transcribe_kwargs.pop("initial_prompt")
-            result = model.transcribe(audio, **transcribe_kwargs)
-        else:
-            raise
-    if on_progress:
-        on_progress(40, "전사 완료, 단어 정렬 중...")
+    progress.begin("asr", f"전사 중... ({device.upper()}, {model_name})")
+    if chunked:
+        result = _transcribe_chunked(model, audio, transcribe_kwargs, progress)
+    else:
+        result = _asr_call(model, audio, transcribe_kwargs)
+    timings["transcribe"] = time.perf_counter() - t0
+    progress.end("asr", "전사 완료, 단어 정렬 중...")
+
+    failed_stages = []
 
     # 2. 단어 단위 정렬 (speaker 매핑 정확도 향상)
     try:
-        align_model, metadata = whisperx.load_align_model(
-            language_code="ko", device=device
-        )
+        (align_model, metadata), timings["align_load"] = model_registry.get_align_model("ko", device)
+        progress.begin("align")
+        t0 = time.perf_counter()
         result = whisperx.align(
             result["segments"], align_model, metadata, audio, device,
             return_char_alignments=False
         )
-        if on_progress:
-            on_progress(70, "화자 분리 중...")
+        timings["align"] = time.perf_counter() - t0
+        progress.end("align")
     except Exception as e:
         print(f"[Transcriber] 단어 정렬 생략: {e}")
-        if on_progress:
-            on_progress(70, "화자 분리 중...")
+        progress.end("align", record=False)
+        failed_stages.append("align")
+    progress.message("화자 분리 중..." if diarize_future is None else "화자 분리 결과 대기 중...")
 
-    # 3. 화자 분리 (HF 토큰 필요 - 실패해도 계속)
+    # 3. 화자 분리 (HF 토큰 필요 - 실패해도 계속). 병렬 모드면 여기서 합류
     try:
-        from whisperx.diarize import DiarizationPipeline as _DiarizationPipeline
-        diarize_model = _DiarizationPipeline(
-            token=config.HF_TOKEN, device=device
-        )
-        diarize_segments = diarize_model(str(audio_path))
+        t0 = time.perf_counter()
+        if diarize_future is not None:
+            diarize_segments, timings["diarize_load"], timings["diarize"] = diarize_future.result()
+            timings["diarize_wait"] = time.perf_counter() - t0
+        else:
+            diarize_segments, timings["diarize_load"], timings["diarize"] = _run_diarization(audio, device, progress)
         result = whisperx.assign_word_speakers(diarize_segments, result)
-        if on_progress:
-            on_progress(90, "변환 중...")
     except Exception as e:
         print(f"[Transcriber] 화자 분리 생략: {e}")
-        if on_progress:
-            on_progress(90, "변환 중...")
+        progress.end("diarize", record=False)
+        # HF 토큰이 없으면 화자 분리는 원래 불가 (토큰 유무는 캐시 키에 포함)
+        if config.HF_TOKEN:
+            failed_stages.append("diarize")
+    progress.message("변환 중...")
 
     # 4. 기존 인터페이스로 변환
     segments = _convert_whisperx_segments(result["segments"])
     full_text = " ".join(s["text"] for s in segments if s["text"])
     duration_sec = len(audio) / whisperx.audio.SAMPLE_RATE
+    timings["total"] = time.perf_counter() - wall_start
 
     return {
         "segments": segments,
         "full_text": full_text,
         "duration": _fmt(duration_sec),
         "method": "local",
+        "failed_stages": failed_stages,
+        "timings": {k: round(v, 2) for k, v in timings.items()},
     }
 
 
-def _transcribe_api(audio_path: Path) -> dict:
-    from openai import OpenAI
-
-    client = OpenAI(api_key=config.OPENAI_API_KEY)
-    with open(audio_path, "rb") as f:
-        response = client.audio.transcriptions.create(
-            model="whisper-1",
-            file=f,
-            response_format="verbose_json",
-            timestamp_granularities=["segment"],
-            language="ko",
+def _asr_call(model, audio, transcribe_kwargs: dict) -> dict:
+    try:
+        return model.transcribe(audio, **transcribe_kwargs)
+    except TypeError as e:
+        if "initial_prompt" in str(e):
+            print(f"[Transcriber] 이 WhisperX 버전은 initial_prompt 미지원 — 프롬프트 없이 재시도")
+            transcribe_kwargs.pop("initial_prompt")
+            return model.transcribe(audio, **transcribe_kwargs)
+        raise
+
+
+def _transcribe_chunked(model, audio, transcribe_kwargs: dict, progress: TranscribeProgress) -> dict:
+    """긴 녹음을 무음 경계 구간으로 나눠 순서대로 전사하고 타임스탬프를 이어 붙인다."""
+    from whisperx.audio import SAMPLE_RATE
+
+    chunks = _plan_chunks(audio, SAMPLE_RATE, config.CHUNK_SEC, config.CHUNK_OVERLAP_SEC)
+    print(f"[Transcriber] 구간 전사 모드: {len(chunks)}개 구간")
+    stitched: list[dict] = []
+    for i, chunk in enumerate(chunks):
+        part = _asr_call(model, audio[chunk["start"]:chunk["end"]], transcribe_kwargs)
+        stitched.extend(_stitch_chunk_segments(part["segments"], chunk, SAMPLE_RATE, stitched))
+        progress.advance(
+            "asr", chunk["keep_to"] / SAMPLE_RATE,
+            f"구간 전사 중... ({i + 1}/{len(chunks)})",
+            segments=_convert_whisperx_segments(stitched),
         )
+    return {"segments": stitched, "language": "ko"}
+
+
+def _plan_chunks(audio, sample_rate: int, chunk_sec: float, overlap_sec: float) -> list[dict]:
+    """
+    전사 구간 계획. 목표 경계 주변 ±10%에서 에너지가 가장 낮은 지점(무음)을 경계로 고르고,
+    앞뒤로 overlap_sec만큼 겹쳐 잘라 경계에 걸린 발화가 잘리지 않게 한다.
+    Returns: [{"start", "end", "keep_from", "keep_to"}] (샘플 단위)
+        start~end: 모델에 넣을 구간, keep_from~keep_to: 이 구간에서 채택할 세그먼트 시작 범위
+    """
+    total = len(audio)
+    chunk = int(chunk_sec * sample_rate)
+    overlap = int(overlap_sec * sample_rate)
+    if total <= chunk:
+        return [{"start": 0, "end": total, "keep_from": 0, "keep_to": total}]
+
+    boundaries = [0]
+    while total - boundaries[-1] > chunk:
+        boundaries.append(_quietest_point(audio, boundaries[-1] + chunk, int(chunk * 0.1), sample_rate))
+    boundaries.append(total)
+
+    return [
+        {
+            "start": max(0, lo - overlap),
+            "end": min(total, hi + overlap),
+            "keep_from": lo,
+            "keep_to": hi,
+        }
+        for lo, hi in zip(boundaries, boundaries[1:])
+    ]
+
+
+def _quietest_point(audio, target: int, radius: int, sample_rate: int) -> int:
+    """target ± radius 범위에서 100ms 프레임 RMS가 가장 낮은 프레임의 중앙 샘플 위치."""
+    import numpy as np
+
+    frame = sample_rate // 10
+    lo = max(frame, target - radius)
+    hi = min(len(audio) - frame, target + radius)
+    n = (hi - lo) // frame
+    if n <= 0:
+        return target
+    window = np.asarray(audio[lo:lo + n * frame], dtype=np.float32).reshape(n, frame)
+    rms = np.sqrt(np.mean(window * window, axis=1))
+    return lo + int(np.argmin(rms)) * frame + frame // 2
+
+
+def _stitch_chunk_segments(segments: list[dict], chunk: dict, sample_rate: int, previous: list[dict]) -> list[dict]:
+    """구간 기준 타임스탬프를 전체 기준으로 옮기고 채택 범위 밖·겹침 중복 세그먼트를 버린다."""
+    offset = chunk["start"] / sample_rate
+    keep_from = chunk["keep_from"] / sample_rate
+    keep_to = chunk["keep_to"] / sample_rate
+    last_end = previous[-1]["end"] if previous else 0.0
+    kept = []
+    for seg in segments:
+        start = seg.get("start", 0) + offset
+        end = seg.get("end", start) + offset
+        if not (keep_from <= start < keep_to):
+            continue
+        if end <= last_end:  # 이전 구간 세그먼트가 이미 덮는 겹침 구간
+            continue
+        kept.append({**seg, "start": start, "end": end})
+    return kept
+
+
+def _transcribe_api(audio_path: Path) -> dict:
+    client = clients.get_client("openai", config.OPENAI_API_KEY)
+
+    def call():
+        with open(audio_path, "rb") as f:
+            return client.audio.transcriptions.create(
+                model="whisper-1",
+                file=f,
+                response_format="verbose_json",
+                timestamp_granularities=["segment"],
+                language="ko",
+            )
+
+    response = call_with_retry("openai", call)
 
     segments = [
         {
@@ -0,0 +1,293 @@
+"""업로드 파일 저장.
+
+요청 본문을 고정 크기 청크로 읽어 UPLOAD_DIR에 바로 기록한다 (파일 전체를 메모리에 올리지 않음).
+multipart 폼 업로드도 도착하는 대로 파싱해 파일 파트를 바로 기록한다 (프레임워크가 본문을 임시 파일로 먼저 받지 않음).
+기록하는 동안 형식별 크기 제한을 검사하고 SHA-256 해시를 함께 계산해 이후 중복 판별에 쓴다.
+끊긴 연결에서 이어 올릴 수 있는 청크 업로드(ResumableUploads)도 제공한다.
+"""
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+from pathlib import Path
+
+import config
+
+CHUNK_SIZE = 1024 * 1024
+MAX_FIELD_BYTES = 64 * 1024  # multipart 폼의 파일 외 필드 하나의 상한
+RESUMABLE_CHUNK_SIZE = 4 * 1024 * 1024  # 클라이언트가 PUT 한 번에 보내는 크기
+
+
+class UploadTooLarge(Exception):
+    """업로드가 형식별 크기 제한을 넘음."""
+
+    def __init__(self, limit_bytes: int):
+        self.limit_bytes = limit_bytes
+        super().__init__(f"파일이 너무 큽니다 (최대 {limit_bytes // (1024 * 1024)}MB)")
+
+
+class InvalidUpload(ValueError):
+    """multipart 본문 형식 오류, 지원하지 않는 파일 형식, 파일 파트 누락 등."""
+
+
+def max_upload_bytes(suffix: str) -> int:
+    """확장자별 업로드 크기 상한 (MD는 텍스트라 훨씬 작게 제한)."""
+    mb = config.MAX_MD_UPLOAD_MB if suffix.lower() == ".md" else config.MAX_UPLOAD_MB
+    return mb * 1024 * 1024
+
+
+async def save_stream(read, dest: Path, max_bytes: int) -> tuple[int, str]:
+    """
+    read(n)이 돌려주는 청크를 dest에 기록. 빈 bytes를 받으면 종료.
+    임시 파일(.part)에 쓰고 끝까지 받은 경우에만 dest로 이름을 바꾼다.
+    Returns: (바이트 수, SHA-256 hex)
+    Raises: UploadTooLarge (기록 중이던 파일은 삭제)
+    """
+    dest = Path(dest)
+    part = dest.with_name(dest.name + ".part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(part, "wb") as f:
+            while chunk := await read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(max_bytes)
+                digest.update(chunk)
+                await asyncio.to_thread(f.write, chunk)
+        part.replace(dest)
+    except BaseException:
+        part.unlink(missing_ok=True)
+        raise
+    return size, digest.hexdigest()
+
+
+async def save_multipart(chunks, content_type: str, dest_stem: Path, allowed_suffixes) -> tuple[dict, dict]:
+    """
+    multipart/form-data 본문(chunks: 비동기 바이트 이터레이터)을 받는 대로 파싱.
+    파일 파트는 dest_stem + 확장자 경로에 바로 기록하며, 파일명을 안 순간부터 형식별 크기 제한을 적용해
+    상한을 넘는 바이트가 도착하면 즉시 중단한다. 디스크 쓰기는 이벤트 루프를 막지 않도록 스레드에서.
+    Returns: (파일 외 폼 필드 {이름: 값}, {"filename", "path", "size", "sha256"})
+    Raises: UploadTooLarge, InvalidUpload (기록 중이던 파일은 삭제)
+    """
+    import multipart
+    from multipart.multipart import parse_options_header
+
+    mime, params = parse_options_header(content_type)
+    boundary = params.get(b"boundary")
+    if mime != b"multipart/form-data" or not boundary:
+        raise InvalidUpload("multipart/form-data 형식이 아닙니다")
+
+    # 콜백은 이벤트만 쌓고, 파일 쓰기(await)는 write() 사이에서 처리
+    events: list[tuple[str, bytes]] = []
+    header: dict[str, bytes] = {"field": b"", "value": b""}
+    headers: dict[bytes, bytes] = {}
+
+    def on_header_end():
+        headers[header["field"].lower()] = header["value"]
+        header["field"] = header["value"] = b""
+
+    parser = multipart.MultipartParser(boundary, {
+        "on_part_begin": lambda: headers.clear(),
+        "on_header_field": lambda d, a, b: header.update(field=header["field"] + d[a:b]),
+        "on_header_value": lambda d, a, b: header.update(value=header["value"] + d[a:b]),
+        "on_header_end": on_header_end,
+        "on_headers_finished": lambda: events.append(("headers", headers.get(b"content-disposition", b""))),
+        "on_part_data": lambda d, a, b: events.append(("data", d[a:b])),
+        "on_part_end": lambda: events.append(("end", b"")),
+    })
+
+    fields: dict[str, str] = {}
+    saved: dict | None = None
+    name, value, f, part, digest, max_bytes = "", b"", None, None, None, 0
+    try:
+        async for chunk in chunks:
+            parser.write(chunk)
+            for kind, data in events:
+                if kind == "headers":
+                    _, disposition = parse_options_header(data)
+                    name = disposition.get(b"name", b"").decode("utf-8", "replace")
+                    filename = disposition.get(b"filename")
+                    if filename is None:
+                        value = b""
+                        continue
+                    if saved is not None or f is not None:
+                        raise InvalidUpload("파일은 하나만 올릴 수 있습니다")
+                    filename = Path(filename.decode("utf-8", "replace")).name
+                    suffix = Path(filename).suffix.lower()
+                    if suffix not in allowed_suffixes:
+                        raise InvalidUpload(f"지원하지 않는 파일 형식: {suffix}")
+                    max_bytes = max_upload_bytes(suffix)
+                    dest = Path(f"{dest_stem}{suffix}")
+                    part = dest.with_name(dest.name + ".part")
+                    f = open(part, "wb")
+                    digest = hashlib.sha256()
+                    saved = {"filename": filename, "path": dest, "size": 0, "sha256": ""}
+                elif kind == "data":
+                    if f is None:
+                        value += data
+                        if len(value) > MAX_FIELD_BYTES:
+                            raise InvalidUpload(f"폼 필드가 너무 깁니다: {name}")
+                        continue
+                    saved["size"] += len(data)
+                    if saved["size"] > max_bytes:
+                        raise UploadTooLarge(max_bytes)
+                    digest.update(data)
+                    await asyncio.to_thread(f.write, data)
+                elif f is not None:
+                    f.close()
+                    f = None
+                    part.replace(saved["path"])
+                    part = None
+                    saved["sha256"] = digest.hexdigest()
+                else:
+                    fields[name] = value.decode("utf-8", "replace")
+            events.clear()
+        parser.finalize()
+        if saved is None or f is not None:
+            raise InvalidUpload("파일이 없거나 본문이 중간에 끊겼습니다")
+    except BaseException:
+        if f is not None:
+            f.close()
+        if part is not None:
+            part.unlink(missing_ok=True)
+        elif saved is not None:
+            saved["path"].unlink(missing_ok=True)
+        raise
+    return fields, saved
+
+
+def file_sha256(path: Path) -> str:
+    """디스크에 있는 파일의 SHA-256 hex (CHUNK_SIZE씩 읽음)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ── 이어받기(resumable) 업로드 ──────────────────────────────────────
+# init → PUT 청크(offset) → finalize. 받은 바이트는 UPLOAD_DIR/{id}.part에 바로 이어 쓰고,
+# 메타데이터는 {id}.upload.json 사이드카에 둔다. 연결이 끊겨도 디스크에 남은 길이부터 이어서 받는다.
+
+class UploadNotFound(KeyError):
+    pass
+
+
+class OffsetMismatch(Exception):
+    """클라이언트가 보낸 offset이 서버에 기록된 길이와 다름."""
+
+    def __init__(self, offset: int):
+        self.offset = offset
+        super().__init__(f"offset 불일치 (서버 기록 {offset} bytes)")
+
+
+def _write_flush(f, chunk: bytes) -> None:
+    f.write(chunk)
+    f.flush()
+
+
+class ResumableUploads:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def _paths(self, upload_id: str) -> tuple[Path, Path]:
+        # upload_id는 파일 경로에 쓰이므로 uuid hex 형식만 허용
+        if len(upload_id) != 32 or any(c not in "0123456789abcdef" for c in upload_id):
+            raise UploadNotFound(upload_id)
+        return self.root / f"{upload_id}.upload.json", self.root / f"{upload_id}.part"
+
+    def init(self, filename: str, size: int, meta: dict) -> dict:
+        """새 업로드 생성. Returns: status()와 같은 형식"""
+        suffix = Path(filename).suffix.lower()
+        max_bytes = max_upload_bytes(suffix)
+        if size > max_bytes:
+            raise UploadTooLarge(max_bytes)
+        upload_id = uuid.uuid4().hex
+        sidecar, part = self._paths(upload_id)
+        self.root.mkdir(parents=True, exist_ok=True)
+        part.touch()
+        sidecar.write_text(json.dumps({
+            "filename": filename, "size": size, "meta": meta, "created_at": time.time(),
+        }, ensure_ascii=False), encoding="utf-8")
+        return self.status(upload_id)
+
+    def info(self, upload_id: str) -> dict:
+        sidecar, _ = self._paths(upload_id)
+        try:
+            return json.loads(sidecar.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            raise UploadNotFound(upload_id)
+
+    def status(self, upload_id: str) -> dict:
+        """Returns: {"upload_id", "offset": 받은 바이트 수, "size": 전체 크기, "chunk_size"}"""
+        info = self.info(upload_id)
+        _, part = self._paths(upload_id)
+        offset = part.stat().st_size if part.exists() else 0
+        return {"upload_id": upload_id, "offset": offset, "size": info["size"], "chunk_size": RESUMABLE_CHUNK_SIZE}
+
+    async def append(self, upload_id: str, offset: int, chunks) -> int:
+        """
+        chunks(비동기 바이트 이터레이터)를 offset 위치에 이어 쓴다.
+        offset은 서버에 기록된 길이와 같아야 한다 (다르면 OffsetMismatch로 현재 길이를 알려줌).
+        중간에 연결이 끊겨도 그때까지 받은 바이트는 남는다.
+        Returns: 기록 후 offset
+        """
+        self.info(upload_id)  # 없는 업로드에는 잠금을 만들지 않음
+        lock = self._locks.setdefault(upload_id, asyncio.Lock())
+        async with lock:
+            info = self.info(upload_id)
+            _, part = self._paths(upload_id)
+            current = part.stat().st_size
+            if offset != current:
+                raise OffsetMismatch(current)
+            with open(part, "ab") as f:
+                async for chunk in chunks:
+                    if current + len(chunk) > info["size"]:
+                        raise UploadTooLarge(info["size"])
+                    # 디스크 쓰기가 느려도 이벤트 루프(다른 요청, SSE)를 막지 않도록 스레드에서
+                    await asyncio.to_thread(_write_flush, f, chunk)
+                    current += len(chunk)
+            return current
+
+    async def finalize(self, upload_id: str, dest: Path) -> tuple[int, str]:
+        """
+        모든 바이트를 받았으면 dest로 옮기고 사이드카 삭제.
+        append와 같은 잠금 아래에서 실행 (쓰는 중인 .part를 옮기거나 두 번 finalize하지 않도록).
+        Returns: (바이트 수, SHA-256 hex)
+        Raises: OffsetMismatch (아직 덜 받음)
+        """
+        self.info(upload_id)  # 없는 업로드에는 잠금을 만들지 않음
+        lock = self._locks.setdefault(upload_id, asyncio.Lock())
+        async with lock:
+            info = self.info(upload_id)  # 잠금을 기다리는 동안 먼저 finalize됐으면 UploadNotFound
+            sidecar, part = self._paths(upload_id)
+            size = part.stat().st_size
+            if size != info["size"]:
+                raise OffsetMismatch(size)
+            sha256 = await asyncio.to_thread(file_sha256, part)
+            part.replace(dest)
+            sidecar.unlink(missing_ok=True)
+            self._locks.pop(upload_id, None)
+        return size, sha256
+
+    def cleanup(self, max_age_sec: float) -> int:
+        """오래 방치된 미완료 업로드 삭제."""
+        removed = 0
+        cutoff = time.time() - max_age_sec
+        for sidecar in self.root.glob("*.upload.json"):
+            upload_id = sidecar.name.removesuffix(".upload.json")
+            try:
+                info = self.info(upload_id)
+            except UploadNotFound:
+                continue
+            _, part = self._paths(upload_id)
+            last = max(info.get("created_at", 0), part.stat().st_mtime if part.exists() else 0)
+            if last < cutoff:
+                part.unlink(missing_ok=True)
+                sidecar.unlink(missing_ok=True)
+                self._locks.pop(upload_id, None)
+                removed += 1
+        return removed
@@ -0,0 +1,130 @@
+"""LLM 토큰 사용량·호출 시간 집계.
+
+작업마다 UsageMeter를 만들어 analyze_transcript(usage=...)에 넘기면 그 작업의 LLM 호출이 기록되고,
+모든 호출은 프로세스 전역 누적 집계(DATA_DIR/llm_usage.json, /metrics)에도 더해진다.
+구간 분석·헤지 요청은 워커 스레드에서 실행되므로 bind()로 현재 작업의 집계 대상을 넘긴다.
+"""
+import contextvars
+import copy
+import json
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import config
+
+
+def _empty() -> dict:
+    return {"calls": 0, "cache_hits": 0, "input_tokens": 0, "output_tokens": 0,
+            "estimated_calls": 0, "latency_sec": 0.0, "by_provider": {}}
+
+
+class UsageMeter:
+    """
+    LLM 호출 수, 입력/출력 토큰, 호출 시간 합계.
+    provider가 사용량을 돌려주지 않은 호출은 추정 토큰 수로 기록하고 estimated_calls로 센다.
+    """
+
+    def __init__(self, path: Path | None = None, on_change=None):
+        self.path = Path(path) if path else None
+        self._on_change = on_change
+        self._lock = threading.Lock()
+        self._data = _empty()
+        if self.path:
+            try:
+                loaded = json.loads(self.path.read_text(encoding="utf-8"))
+                if isinstance(loaded, dict):
+                    self._data.update(loaded)
+            except (OSError, ValueError):
+                pass
+
+    def set_estimate(self, input_tokens: int) -> None:
+        """보내기 전에 추정한 입력 토큰 수 (전사본 기준)."""
+        with self._lock:
+            self._data["estimated_input_tokens"] = input_tokens
+            snap = copy.deepcopy(self._data)
+        if self._on_change:
+            self._on_change(snap)
+
+    def record(self, provider: str, model: str, input_tokens: int = 0, output_tokens: int = 0,
+               latency_sec: float = 0.0, estimated: bool = False, cached: bool = False) -> None:
+        with self._lock:
+            d = self._data
+            p = d["by_provider"].setdefault(
+                f"{provider}/{model}",
+                {"calls": 0, "cache_hits": 0, "input_tokens": 0, "output_tokens": 0, "latency_sec": 0.0},
+            )
+            for target in (d, p):
+                if cached:
+                    target["cache_hits"] += 1
+                    continue
+                target["calls"] += 1
+                target["input_tokens"] += input_tokens
+                target["output_tokens"] += output_tokens
+                target["latency_sec"] = round(target["latency_sec"] + latency_sec, 3)
+            if estimated and not cached:
+                d["estimated_calls"] += 1
+            snap = copy.deepcopy(d)
+            # 잠금 안에서 저장해 오래된 스냅샷이 최신 파일을 덮어쓰지 않도록
+            self._save(snap)
+        if self._on_change:
+            self._on_change(snap)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return copy.deepcopy(self._data)
+
+    def _save(self, data: dict) -> None:
+        if not self.path:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(data), encoding="utf-8")
+        except OSError as e:
+            print(f"[Usage] 사용량 저장 실패: {e}")
+
+
+_totals: UsageMeter | None = None
+_totals_lock = threading.Lock()
+
+
+def get_usage_totals() -> UsageMeter:
+    """프로세스 전역 누적 사용량 (DATA_DIR/llm_usage.json)."""
+    global _totals
+    with _totals_lock:
+        if _totals is None:
+            _totals = UsageMeter(config.DATA_DIR / "llm_usage.json")
+        return _totals
+
+
+# ── 작업별 집계 대상 ────────────────────────────────────────────────────
+
+_current: contextvars.ContextVar[UsageMeter | None] = contextvars.ContextVar("llm_usage_meter", default=None)
+
+
+@contextmanager
+def metering(meter: UsageMeter | None):
+    """이 블록 안의 LLM 호출을 meter에 기록 (None이면 누적 집계에만)."""
+    token = _current.set(meter)
+    try:
+        yield meter
+    finally:
+        _current.reset(token)
+
+
+def bind(fn):
+    """현재 집계 대상을 유지한 채 다른 스레드에서 실행할 함수 (스레드 풀 submit용)."""
+    ctx = contextvars.copy_context()
+    return lambda *args, **kwargs: ctx.run(fn, *args, **kwargs)
+
+
+def current_meter() -> UsageMeter | None:
+    return _current.get()
+
+
+def record_call(provider: str, model: str, **kwargs) -> None:
+    """현재 작업 집계와 전역 누적 집계에 호출 한 건을 기록."""
+    meter = _current.get()
+    if meter is not None:
+        meter.record(provider, model, **kwargs)
+    get_usage_totals().record(provider, model, **kwargs)
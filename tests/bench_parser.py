@@ -0,0 +1,106 @@
+"""LLM 응답 파서 마이크로벤치마크.
+
+SectionParser가 개선한 것은 스트리밍 중 완성 섹션 전달이다: feed()는 아직 열린 마지막 섹션부터만 다시 읽어,
+청크마다 누적 응답 전체를 다시 파싱하지 않는다.
+응답 전체를 한 번 파싱하는 비용은 이전 섹션별 정규식 파서와 같은 수준이며 (속도 향상 없음),
+첫 번째 표는 결과가 같고 느려지지 않았는지 확인하는 용도다.
+
+실행: python tests/bench_parser.py
+"""
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline.analyzer import SECTION_SCHEMAS, SectionParser, parse_llm_response  # noqa: E402
+
+
+# ── 비교용: 섹션마다 정규식을 새로 만들어 응답 전체를 다시 훑던 이전 구현 ──
+
+def _legacy_extract_line(text: str, key: str) -> str:
+    m = re.search(rf"{key}:\s*(.+)", text)
+    return m.group(1).strip() if m else ""
+
+
+def _legacy_extract_list(text: str, key: str) -> list[str]:
+    m = re.search(rf"{key}:\s*\n((?:- .+\n?)*)", text)
+    if not m:
+        return []
+    return [item.strip() for item in re.findall(r"- (.+)", m.group(1)) if item.strip()]
+
+
+def legacy_parse(response: str, category: str = "meeting") -> dict:
+    return {
+        key: (_legacy_extract_line if kind is str else _legacy_extract_list)(response, header)
+        for header, key, kind in SECTION_SCHEMAS.get(category, SECTION_SCHEMAS["meeting"])
+    }
+
+
+_LEGACY_HEADER = re.compile(r"^([A-Z][A-Z_]+):", re.M)
+
+
+def legacy_partial(response: str, category: str = "meeting") -> dict:
+    """
+    SectionParser 이전의 parse_partial_response (스트리밍 미리보기를 추가할 때의 구현):
+    청크마다 누적 텍스트 전체를 이전 파서로 다시 파싱한다.
+    """
+    headers = list(_LEGACY_HEADER.finditer(response))
+    if len(headers) < 2:
+        return {}
+    complete = {m.group(1) for m in headers[:-1]}
+    parsed = legacy_parse(response[:headers[-1].start()], category)
+    return {k: v for k, v in parsed.items() if k.upper() in complete}
+
+
+def synthetic_response(category: str, items_per_section: int) -> str:
+    parts = []
+    for header, _, kind in SECTION_SCHEMAS[category]:
+        if kind is str:
+            parts.append(f"{header}: {header.lower()} 한 줄 요약 " + "내용 " * 20)
+        else:
+            items = "\n".join(f"- {header.lower()} 항목 {i}: " + "세부 설명 " * 8 for i in range(items_per_section))
+            parts.append(f"{header}:\n{items}")
+    return "\n\n".join(parts) + "\n"
+
+
+def bench(category: str, items_per_section: int, repeat: int = 5) -> None:
+    text = synthetic_response(category, items_per_section)
+    assert parse_llm_response(text, category) == legacy_parse(text, category)
+    number = max(1, 2000 // items_per_section)
+    new = min(timeit.repeat(lambda: parse_llm_response(text, category), number=number, repeat=repeat)) / number
+    old = min(timeit.repeat(lambda: legacy_parse(text, category), number=number, repeat=repeat)) / number
+    print(f"{category:<11} {items_per_section:>6}개/섹션 {len(text) / 1024:>9.1f}KB  "
+          f"이전 {old * 1000:>8.2f}ms  SectionParser {new * 1000:>8.2f}ms  (이전 대비 ×{old / new:.1f})")
+
+
+def bench_stream(category: str, items_per_section: int, chunk_chars: int = 40) -> None:
+    """chunk_chars 글자씩 도착하는 스트림에서 매 청크마다 완성 섹션을 구하는 총 비용."""
+    text = synthetic_response(category, items_per_section)
+    prefixes = [text[:i] for i in range(chunk_chars, len(text) + chunk_chars, chunk_chars)]
+
+    def new():
+        parser = SectionParser(category)
+        for p in prefixes:
+            parser.feed(p)
+
+    def old():
+        for p in prefixes:
+            legacy_partial(p, category)
+
+    t_new = min(timeit.repeat(new, number=1, repeat=3))
+    t_old = min(timeit.repeat(old, number=1, repeat=3))
+    print(f"{category:<11} {items_per_section:>6}개/섹션 {len(text) / 1024:>9.1f}KB  청크 {len(prefixes):>5}개  "
+          f"이전 {t_old * 1000:>8.1f}ms  이어서 파싱 {t_new * 1000:>8.1f}ms  ×{t_old / t_new:.1f}")
+
+
+if __name__ == "__main__":
+    print("── 전체 응답 한 번 파싱: 이전 파서와 같은 결과·비슷한 속도인지 확인 (개선 대상 아님) ──")
+    for category in ("meeting", "lecture", "reference"):
+        for n in (5, 100, 2000):
+            bench(category, n)
+    print("── 스트리밍: 청크마다 완성 섹션 구하기 (누적 전체 재파싱 vs 이어서 파싱) ──")
+    for category in ("meeting", "lecture"):
+        for n in (5, 30, 100):
+            bench_stream(category, n)
@@ -0,0 +1,118 @@
+"""공용 테스트 fixture."""
+import sys
+import time
+import types
+
+import pytest
+
+from pipeline import analyzer, clients, latency, usage
+from pipeline.disk_cache import DiskCache
+
+LLM_RESPONSE = "PURPOSE: 배포 일정 확정\n\nDECISIONS:\n- 3월 20일 배포\n"
+
+
+@pytest.fixture
+def fake_llm(request, monkeypatch, tmp_path):
+    """
+    openai / google.genai SDK를 가짜 모듈로 대체하고 LLM 캐시·지연 통계·사용량을 tmp_path로 돌린다.
+
+    간접 파라미터(dict)로 설정을 바꾼다:
+        @pytest.mark.parametrize("fake_llm", [{"reply": "...", "config": {"LLM_JSON": True}}], indirect=True)
+      reply: 응답 원문 (문자열이면 두 provider 공통, dict면 provider별)
+      keys: API 키를 설정할 provider (기본 ("openai",))
+      usage: provider가 보고할 토큰 수 {"input_tokens", "output_tokens"} (기본 None = 보고 안 함)
+      config: 추가로 덮어쓸 config 값
+    반환된 상태의 reply/usage/delay/error를 테스트 중에 바꿀 수 있다.
+    요청은 calls [(provider, stream)]와 provider별 openai/gemini 목록에 기록된다.
+    """
+    import config
+    opts = getattr(request, "param", {})
+    reply = opts.get("reply", LLM_RESPONSE)
+    state = types.SimpleNamespace(
+        reply=dict(reply) if isinstance(reply, dict) else {"openai": reply, "gemini": reply},
+        usage=opts.get("usage"), delay={}, error={}, chunk_chars=7,
+        calls=[], openai=[], gemini=[],
+    )
+
+    def answer(provider: str, req: dict, stream: bool) -> str:
+        state.calls.append((provider, stream))
+        getattr(state, provider).append(req)
+        time.sleep(state.delay.get(provider, 0))
+        if state.error.get(provider):
+            raise state.error[provider]
+        return state.reply[provider]
+
+    def pieces(text: str) -> list[str]:
+        return [text[i:i + state.chunk_chars] for i in range(0, len(text), state.chunk_chars)]
+
+    def openai_usage():
+        if state.usage is None:
+            return None
+        return types.SimpleNamespace(prompt_tokens=state.usage["input_tokens"],
+                                     completion_tokens=state.usage["output_tokens"])
+
+    def gemini_usage():
+        if state.usage is None:
+            return None
+        return types.SimpleNamespace(prompt_token_count=state.usage["input_tokens"],
+                                     candidates_token_count=state.usage["output_tokens"])
+
+    class FakeCompletions:
+        def create(self, **req):
+            text = answer("openai", req, req.get("stream", False))
+            if not req.get("stream"):
+                msg = types.SimpleNamespace(content=text)
+                return types.SimpleNamespace(choices=[types.SimpleNamespace(message=msg)], usage=openai_usage())
+            chunks = [
+                types.SimpleNamespace(choices=[types.SimpleNamespace(delta=types.SimpleNamespace(content=p))],
+                                      usage=None)
+                for p in pieces(text)
+            ]
+            # include_usage: 사용량은 choices가 빈 마지막 청크에
+            return iter(chunks + [types.SimpleNamespace(choices=[], usage=openai_usage())])
+
+    class FakeOpenAI:
+        def __init__(self, api_key=None):
+            self.chat = types.SimpleNamespace(completions=FakeCompletions())
+
+    class FakeModels:
+        def generate_content(self, model, contents, config=None):
+            text = answer("gemini", {"model": model, "contents": contents, "config": config}, False)
+            return types.SimpleNamespace(text=text, usage_metadata=gemini_usage())
+
+        def generate_content_stream(self, model, contents):
+            text = answer("gemini", {"model": model, "contents": contents, "config": None}, True)
+            chunks = [types.SimpleNamespace(text=p, usage_metadata=None) for p in pieces(text)]
+            if chunks:
+                chunks[-1].usage_metadata = gemini_usage()
+            return iter(chunks)
+
+    class FakeGenaiClient:
+        def __init__(self, api_key=None):
+            self.models = FakeModels()
+
+    openai_mod = types.ModuleType("openai")
+    openai_mod.OpenAI = FakeOpenAI
+    genai_mod = types.ModuleType("google.genai")
+    genai_mod.Client = FakeGenaiClient
+    google_mod = types.ModuleType("google")
+    google_mod.genai = genai_mod
+    monkeypatch.setitem(sys.modules, "openai", openai_mod)
+    monkeypatch.setitem(sys.modules, "google", google_mod)
+    monkeypatch.setitem(sys.modules, "google.genai", genai_mod)
+
+    keys = opts.get("keys", ("openai",))
+    settings = {
+        "GEMINI_API_KEY": "g-test" if "gemini" in keys else "",
+        "OPENAI_API_KEY": "sk-test" if "openai" in keys else "",
+        "LLM_STREAM": True, "LLM_JSON": False, "LLM_HEDGE": False, "LLM_CACHE": True,
+        **opts.get("config", {}),
+    }
+    for name, value in settings.items():
+        monkeypatch.setattr(config, name, value)
+    monkeypatch.setattr(analyzer, "_llm_cache", DiskCache(tmp_path / "llm_cache"))
+    monkeypatch.setattr(latency, "_stats", latency.LatencyStats(tmp_path / "api_latency.json"))
+    monkeypatch.setattr(usage, "_totals", usage.UsageMeter(tmp_path / "llm_usage.json"))
+    clients.reset()
+    yield state
+    clients.reset()
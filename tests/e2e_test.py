@@ -35,7 +35,7 @@ progress_log: list[str] = []
 start_time = time.time()
 
 
-def on_progress(pct: int, detail: str):
+def on_progress(pct: int, detail: str, **_):
     elapsed = time.time() - start_time
     msg = f"[{elapsed:5.1f}s] {pct:3d}% {detail}"
     print(msg, flush=True)
@@ -167,3 +167,69 @@ def test_parse_reference():
 def test_unknown_category_falls_back_to_meeting():
     result = parse_llm_response(SAMPLE_RESPONSE, "unknown_cat")
     assert "purpose" in result
+
+
+# ── 형식 변형 허용 ─────────────────────────────────────────────────
+
+MARKDOWN_RESPONSE = """
+## PURPOSE
+**배포 일정 확정**
+
+**DISCUSSION:**
+* 일정 검토
+* QA 범위
+
+### DECISIONS
+1. 3월 20일 배포
+2) 롤백 계획 수립
+
+**ACTION_ITEMS**:
+- 김철수: 릴리스 노트 작성
+-
+
+FOLLOW_UP:
+"""
+
+
+def test_parses_markdown_headers_and_bullets():
+    result = parse_llm_response(MARKDOWN_RESPONSE)
+    assert result["purpose"] == "**배포 일정 확정**"
+    assert result["discussion"] == ["일정 검토", "QA 범위"]
+    assert result["decisions"] == ["3월 20일 배포", "롤백 계획 수립"]
+    assert result["action_items"] == ["김철수: 릴리스 노트 작성"]
+    assert result["follow_up"] == []
+
+
+def test_empty_line_section_does_not_swallow_next_header():
+    result = parse_llm_response("PURPOSE:\n\nDISCUSSION:\n- 항목\n")
+    assert result["purpose"] == ""
+    assert result["discussion"] == ["항목"]
+
+
+def test_list_ends_at_non_bullet_line_and_first_header_wins():
+    response = "DECISIONS:\n- 결정 1\n추가 설명 문장\n- 목록 밖 항목\n\nDECISIONS:\n- 중복 섹션\n"
+    assert parse_llm_response(response)["decisions"] == ["결정 1"]
+
+
+def test_section_parser_resumes_streamed_text():
+    from pipeline.analyzer import SectionParser
+    parser = SectionParser("voice_memo")
+    assert parser.feed("SUMMARY: 메모") == {}
+    assert parser.feed("SUMMARY: 메모 요약\n\nKEY_POINTS:\n- 하나") == {"summary": "메모 요약"}
+    assert parser.feed("SUMMARY: 메모 요약\n\nKEY_POINTS:\n- 하나\n- 둘\n\nACTION_ITEMS:\n") == {
+        "summary": "메모 요약", "key_points": ["하나", "둘"],
+    }
+    # 재시도로 스트림이 새로 시작되면 처음부터 다시 파싱
+    assert parser.feed("SUMMARY: 다른 요약\n\nKEY_POINTS:\n") == {"summary": "다른 요약"}
+    assert parser.close() == {"summary": "다른 요약", "key_points": [], "action_items": []}
+
+
+def test_header_without_colon_must_be_alone_on_line():
+    response = "PURPOSE: x\nDISCUSSION:\n- Decisions 논의\nDECISIONS 관련 내용은 아래\n\nDECISIONS:\n- c\n"
+    result = parse_llm_response(response)
+    assert result["discussion"] == ["Decisions 논의"]
+    assert result["decisions"] == ["c"]
+
+
+def test_header_with_colon_mid_line():
+    assert parse_llm_response("The PURPOSE: foo")["purpose"] == "foo"
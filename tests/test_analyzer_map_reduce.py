@@ -0,0 +1,114 @@
+"""긴 전사본 map-reduce 분석 테스트."""
+import threading
+import time
+
+from pipeline import analyzer
+from pipeline.analyzer import _split_transcript, merge_analyses
+
+
+def _segs(*pairs):
+    return [{"timestamp": "00:00", "speaker": sp, "text": t} for sp, t in pairs]
+
+
+def test_split_cuts_at_speaker_change_after_limit():
+    segs = _segs(("A", "a" * 6), ("A", "b" * 6), ("B", "c" * 6), ("B", "d" * 6))
+    chunks = _split_transcript("", segs, limit=10)
+    # 10자 도달 후 같은 화자(A) 발언은 이어붙이고, 화자가 B로 바뀔 때 자름
+    assert chunks == ["a" * 6 + " " + "b" * 6, "c" * 6 + " " + "d" * 6]
+
+
+def test_split_forces_cut_for_long_monologue():
+    segs = _segs(*[("A", "x" * 5)] * 6)
+    chunks = _split_transcript("", segs, limit=10)
+    assert len(chunks) == 3
+
+
+def test_split_plain_text_on_sentence_boundaries():
+    text = "첫 문장입니다. 둘째 문장입니다. 셋째 문장입니다."
+    chunks = _split_transcript(text, None, limit=20)
+    assert chunks == ["첫 문장입니다. 둘째 문장입니다.", "셋째 문장입니다."]
+    assert all(len(c) <= 20 for c in _split_transcript("가" * 50, None, limit=20))
+
+
+def test_merge_by_value_type():
+    merged = merge_analyses([
+        {"purpose": "예산 검토", "decisions": ["3월 배포"], "action_items": ["문서화 (A)"]},
+        {"purpose": "일정 조정", "decisions": ["3월  배포", "QA 추가"], "action_items": []},
+        {"purpose": "예산 검토", "decisions": [], "action_items": ["테스트 (B)"]},
+    ])
+    assert merged == {
+        "purpose": "예산 검토 일정 조정",
+        "decisions": ["3월 배포", "QA 추가"],
+        "action_items": ["문서화 (A)", "테스트 (B)"],
+    }
+
+
+def test_long_transcript_is_analyzed_in_parallel_chunks(monkeypatch):
+    import config
+    monkeypatch.setattr(config, "ANALYSIS_CHUNK_CHARS", 10)
+    monkeypatch.setattr(config, "ANALYSIS_MAP_WORKERS", 4)
+    calls, active, peak = [], [0], [0]
+    lock = threading.Lock()
+
+    def fake_single(text, category, context):
+        with lock:
+            calls.append((text, context))
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return {"summary": text[:1], "key_points": [text[:1]]}
+
+    monkeypatch.setattr(analyzer, "_analyze_single", fake_single)
+    segs = _segs(("A", "a" * 10), ("B", "b" * 10), ("A", "c" * 10))
+
+    result = analyzer.analyze_transcript("x" * 32, category="voice_memo", context="주간", segments=segs)
+
+    assert len(calls) == 3 and peak[0] > 1
+    assert sorted(c[1] for c in calls)[0] == "주간 / 전체 3개 구간 중 1번째"
+    assert result == {"summary": "a b c", "key_points": ["a", "b", "c"]}
+
+
+def test_short_transcript_single_pass(monkeypatch):
+    calls = []
+    monkeypatch.setattr(analyzer, "_analyze_single", lambda t, c, ctx, on_partial=None: calls.append(t) or {})
+    analyzer.analyze_transcript("짧은 전사본")
+    assert calls == ["짧은 전사본"]
+
+
+def test_split_cuts_oversized_segment_at_sentences():
+    # 화자 분리 없이 한 세그먼트로 합쳐진 발언도 문장 경계에서 나눔
+    segs = _segs(("A", "첫 문장입니다. 둘째 문장입니다. 셋째 문장입니다."), ("B", "짧음"))
+    chunks = _split_transcript("", segs, limit=10)
+    assert chunks == ["첫 문장입니다. 둘째 문장입니다.", "셋째 문장입니다.", "짧음"]
+
+
+def _monologue(n):
+    """화자 분리 없는 전사본 (모든 세그먼트가 Speaker A)."""
+    return [{"timestamp": "00:00", "speaker": "Speaker A", "text": f"{i}번 안건은 담당자가 다음 주까지 검토합니다."}
+            for i in range(n)]
+
+
+def test_compacted_single_speaker_transcript_is_still_split(monkeypatch):
+    import config
+    import main
+    monkeypatch.setattr(config, "TRANSCRIPT_COMPACT", True)
+    monkeypatch.setattr(config, "LLM_INPUT_TOKEN_BUDGET", 0)
+    monkeypatch.setattr(config, "ANALYSIS_CHUNK_CHARS", 1000)
+    monkeypatch.setattr(config, "ANALYSIS_MAP_WORKERS", 2)
+    chunks = []
+    monkeypatch.setattr(analyzer, "_analyze_single",
+                        lambda text, category, context: chunks.append(text) or {"key_points": [text[:2]]})
+    segs = _monologue(300)
+    transcript = {"full_text": " ".join(s["text"] for s in segs), "segments": segs, "duration": "30:00"}
+    job_id = "test-compacted-split"
+    main.job_status[job_id] = {"status": "transcribing", "logs": []}
+    try:
+        assert main._analyze_for_review(job_id, transcript, "meeting", "", "", "", "a.m4a", "audio", "")
+        # 압축으로 세그먼트가 하나로 합쳐져도 구간 분석은 그대로
+        assert main.job_status[job_id]["compaction"]["segments_after"] == 1
+    finally:
+        del main.job_status[job_id]
+    assert len(chunks) >= 7
+    assert all(len(c) <= 1000 * 1.2 + 40 for c in chunks)
@@ -0,0 +1,94 @@
+"""녹음 폴더 일괄 처리 CLI(batch.py) 테스트 (전사·분석은 가짜로 대체)."""
+import threading
+
+import pytest
+
+import batch
+from pipeline.job_store import JobStore
+
+
+@pytest.fixture
+def pipeline(monkeypatch, tmp_path):
+    import config
+    import main
+    vault = tmp_path / "vault"
+    monkeypatch.setattr(config, "VAULT_PATH", vault)
+    monkeypatch.setattr(main, "job_status", JobStore())
+    state = {"transcribed": [], "fail": set(), "active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def fake_transcribe(path, on_progress=None, context="", category="meeting", audio_sha256=None):
+        with lock:
+            state["transcribed"].append(path.name)
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        try:
+            if path.name in state["fail"]:
+                raise RuntimeError("전사 실패")
+            return {"segments": [{"timestamp": "00:01", "speaker": "A", "text": f"{path.stem} 논의"}],
+                    "full_text": f"{path.stem} 논의", "duration": "30:00", "method": "fake"}
+        finally:
+            with lock:
+                state["active"] -= 1
+
+    monkeypatch.setattr(main, "transcribe", fake_transcribe)
+    monkeypatch.setattr(main, "analyze_transcript",
+                        lambda text, category="meeting", **kw: {"purpose": text, "decisions": ["결정"]})
+    return state, vault
+
+
+def _recordings(folder, contents):
+    folder.mkdir(exist_ok=True)
+    for name, data in contents.items():
+        (folder / name).parent.mkdir(parents=True, exist_ok=True)
+        (folder / name).write_bytes(data)
+    return folder
+
+
+def test_find_recordings_filters_extensions(tmp_path):
+    folder = _recordings(tmp_path / "rec", {"a.m4a": b"a", "notes.md": b"#", "x.txt": b"x", "sub/b.MP3": b"b"})
+    assert [p.name for p in batch.find_recordings(folder)] == ["a.m4a", "b.MP3"]
+    assert [p.name for p in batch.find_recordings(folder, recursive=False)] == ["a.m4a"]
+    assert batch.duration_sec("01:02:03") == 3723 and batch.duration_sec("30:00") == 1800
+    assert batch.duration_sec("?") == 0
+    assert batch.main([str(tmp_path / "없음")]) == 2
+
+
+def test_auto_confirm_saves_notes_and_skips_processed_files(pipeline, tmp_path):
+    state, vault = pipeline
+    folder = _recordings(tmp_path / "rec", {"회의1.m4a": b"one", "회의2.m4a": b"two", "복사본.m4a": b"one"})
+    manifest = batch.BatchManifest(tmp_path / "manifest.json")
+
+    summary = batch.run_batch(folder, workers=2, auto_confirm=True, manifest=manifest)
+
+    assert (summary["done"], summary["skipped"], summary["failed"]) == (2, 1, 0)
+    assert len(state["transcribed"]) == 2  # 같은 내용의 복사본은 전사하지 않음
+    assert summary["audio_sec"] == 3600 and summary["audio_hours_per_hour"] > 0
+    assert len(list(vault.rglob("*.md"))) >= 2
+    assert all(p.exists() for p in folder.iterdir())  # 원본 녹음은 지우지 않음
+
+    again = batch.run_batch(folder, workers=2, auto_confirm=True,
+                            manifest=batch.BatchManifest(tmp_path / "manifest.json"))
+    assert (again["done"], again["skipped"]) == (0, 3)
+    assert len(state["transcribed"]) == 2
+
+
+def test_without_auto_confirm_leaves_review_and_retries_failures(pipeline, tmp_path):
+    import main
+    state, vault = pipeline
+    state["fail"].add("b.m4a")
+    folder = _recordings(tmp_path / "rec", {"a.m4a": b"a", "b.m4a": b"b"})
+    manifest = batch.BatchManifest(tmp_path / "manifest.json")
+
+    summary = batch.run_batch(folder, workers=1, manifest=manifest)
+
+    assert (summary["review"], summary["failed"]) == (1, 1)
+    assert state["peak"] == 1
+    assert not vault.exists()
+    review_ids = main.job_status.backend.ids_with_status(("review",))
+    assert len(review_ids) == 1 and main.job_status[review_ids[0]]["analysis"]["purpose"] == "A: a 논의"
+
+    state["fail"].clear()
+    retry = batch.run_batch(folder, workers=1, manifest=manifest)
+    assert (retry["review"], retry["skipped"]) == (1, 1)
+    assert state["transcribed"][-1] == "b.m4a"
@@ -0,0 +1,60 @@
+"""LLM/API 클라이언트 풀 테스트."""
+import sys
+import types
+
+import pytest
+
+from pipeline import clients
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    created = []
+
+    class FakeOpenAI:
+        def __init__(self, api_key=None):
+            self.api_key = api_key
+            self.closed = False
+            created.append(self)
+
+        def close(self):
+            self.closed = True
+
+    mod = types.ModuleType("openai")
+    mod.OpenAI = FakeOpenAI
+    monkeypatch.setitem(sys.modules, "openai", mod)
+    clients.reset()
+    yield created
+    clients.reset()
+
+
+def test_client_reused_per_provider_and_key(fake_openai):
+    a = clients.get_client("openai", "sk-1")
+    assert clients.get_client("openai", "sk-1") is a
+    b = clients.get_client("openai", "sk-2")
+    assert b is not a
+    assert len(fake_openai) == 2
+    # 키 원문은 보관하지 않음
+    assert all("sk-" not in k[1] for k in clients.cached_keys())
+
+
+def test_reset_closes_and_recreates(fake_openai):
+    a = clients.get_client("openai", "sk-1")
+    assert clients.reset("gemini") == 0
+    assert clients.reset("openai") == 1
+    assert a.closed
+    assert clients.get_client("openai", "sk-1") is not a
+
+
+def test_settings_key_change_resets_clients(fake_openai, monkeypatch, tmp_path):
+    import config
+    import main
+    monkeypatch.setattr(main, "_ENV_PATH", tmp_path / ".env")
+    monkeypatch.setattr(config, "OPENAI_API_KEY", "sk-old")
+    old = clients.get_client("openai", "sk-old")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-old")
+
+    main.save_settings(main.SettingsPayload(OPENAI_API_KEY="sk-new"))
+
+    assert old.closed
+    assert clients.cached_keys() == []
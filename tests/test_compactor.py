@@ -0,0 +1,45 @@
+"""AI 분석 전 전사본 압축 테스트."""
+from pipeline.compactor import compact_segments, estimate_tokens
+
+FILLERS = frozenset({"어", "음", "그러니까"})
+
+
+def _seg(speaker, text):
+    return {"timestamp": "00:00", "speaker": speaker, "text": text}
+
+
+def test_merges_same_speaker_and_keeps_labels():
+    segs = [_seg("Speaker A", "배포는"), _seg("Speaker A", "다음 주입니다."), _seg("Speaker B", "좋습니다.")]
+    compacted, report = compact_segments(segs, FILLERS)
+    assert [s["text"] for s in compacted] == ["Speaker A: 배포는 다음 주입니다.", "Speaker B: 좋습니다."]
+    assert report["segments_before"] == 3 and report["segments_after"] == 2
+
+
+def test_strips_fillers_with_punctuation():
+    compacted, report = compact_segments([_seg("A", "어, 그러니까 음... 일정을 당기죠")], FILLERS)
+    assert compacted[0]["text"] == "A: 일정을 당기죠"
+    assert report["fillers_removed"] == 3
+
+
+def test_collapses_repeated_words_and_hallucination_loops():
+    segs = [
+        _seg("A", "네 네 네 알겠습니다."),
+        _seg("A", "감사합니다. 감사합니다. 감사합니다."),
+        _seg("A", "시청해 주셔서 감사합니다. 시청해 주셔서 감사합니다."),
+    ]
+    compacted, report = compact_segments(segs, FILLERS)
+    assert compacted[0]["text"] == "A: 네 알겠습니다. 감사합니다. 시청해 주셔서 감사합니다."
+    assert report["repeats_removed"] == 2 + 2 + 3
+    assert report["tokens_saved"] > 0
+
+
+def test_drops_segments_left_empty_and_handles_missing_speaker():
+    segs = [_seg("A", "음"), {"text": "화자 없는 문장"}, {"text": "  "}]
+    compacted, _ = compact_segments(segs, FILLERS)
+    assert compacted == [{"speaker": None, "text": "화자 없는 문장"}]
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd efgh") == 2
+    assert estimate_tokens("안녕하세요") == 4
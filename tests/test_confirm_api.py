@@ -50,3 +50,92 @@ def test_confirm_returns_400_when_not_in_review():
         confirm_job(job_id, payload)
     assert exc.value.status_code == 400
     del main.job_status[job_id]
+
+
+def test_confirm_parked_job_schedules_finalize(monkeypatch):
+    import main
+    from main import ConfirmPayload, confirm_job
+
+    submitted = []
+    monkeypatch.setattr(main.scheduler, "submit", lambda job_id, fn, *a, **kw: submitted.append((job_id, fn, kw)))
+    job_id = "test-parked-job"
+    main.job_status[job_id] = {"status": "review", "analysis": {}, "logs": []}
+    main.job_status.park(job_id)
+    assert job_id not in main.job_status.active_ids()
+
+    confirm_job(job_id, ConfirmPayload(analysis={"summary": "요약"}))
+
+    assert main.job_status[job_id]["status"] == "confirmed"
+    assert submitted == [(job_id, main._finalize, {"lane": "light"})]
+    del main.job_status[job_id]
+
+
+def test_finalize_builds_note_from_stored_review(monkeypatch):
+    import main
+
+    saved = {}
+
+    class FakeWriter:
+        def __init__(self, vault_path):
+            pass
+
+        def save(self, note_data, main_note, transcript_note):
+            saved["note_data"] = note_data
+            return {"note_path": "note.md"}
+
+    monkeypatch.setattr(main, "VaultWriter", FakeWriter)
+    job_id = "test-finalize-job"
+    main.job_status[job_id] = {
+        "status": "confirmed", "logs": [], "category": "meeting", "source_type": "audio",
+        "title": "주간 회의", "project": "", "original_filename": "a.m4a", "duration": "01:00",
+        "segments": [{"timestamp": "00:01", "speaker": "Speaker A", "text": "안녕하세요"}],
+        "analysis": {"purpose": "원래 목적"},
+        "analysis_edited": {"analysis": {"purpose": "수정한 목적"}, "speaker_map": {"Speaker A": "김철수"}},
+    }
+    main.job_status.park(job_id)
+
+    main._finalize(job_id)
+
+    job = main.job_status[job_id]
+    assert job["status"] == "done"
+    assert job["result"] == {"note_path": "note.md"}
+    assert job_id not in main.job_status.active_ids()
+    assert saved["note_data"].purpose == "수정한 목적"
+    assert saved["note_data"].speakers == ["김철수"]
+    del main.job_status[job_id]
+
+
+def test_cancel_parked_confirmed_job_before_finalize(monkeypatch):
+    import main
+    from main import cancel_job
+
+    # 재시작 후 다시 예약된 확정 작업: 백엔드에만 있고 대기열에서 빠짐
+    monkeypatch.setattr(main.scheduler, "cancel", lambda job_id: True)
+    job_id = "test-cancel-queued-confirmed"
+    main.job_status[job_id] = {"status": "confirmed", "logs": []}
+    main.job_status.park(job_id)
+
+    cancel_job(job_id)
+
+    assert main.job_status[job_id]["status"] == "cancelled"
+    assert job_id not in main.job_status.active_ids()
+    del main.job_status[job_id]
+
+
+def test_cancel_parked_confirmed_job_stops_finalize(monkeypatch):
+    import main
+    from main import cancel_job
+
+    # 대기열에서 이미 꺼냈지만 _finalize가 아직 작업을 resume하지 않은 경우
+    monkeypatch.setattr(main.scheduler, "cancel", lambda job_id: False)
+    monkeypatch.setattr(main, "VaultWriter", lambda vault_path: pytest.fail("취소된 작업이 저장됨"))
+    job_id = "test-cancel-running-confirmed"
+    main.job_status[job_id] = {"status": "confirmed", "logs": [], "analysis_edited": {}}
+    main.job_status.park(job_id)
+
+    cancel_job(job_id)
+    main._finalize(job_id)
+
+    assert main.job_status[job_id]["status"] == "cancelled"
+    assert job_id not in main.job_status.active_ids()
+    del main.job_status[job_id]
@@ -0,0 +1,48 @@
+"""디스크 JSON 캐시 테스트."""
+import os
+import time
+
+from pipeline.disk_cache import DiskCache, make_key
+
+
+def test_make_key_is_stable_and_order_sensitive():
+    assert make_key("a", 1, {"x": 1, "y": 2}) == make_key("a", 1, {"y": 2, "x": 1})
+    assert make_key("a", "b") != make_key("b", "a")
+    assert len(make_key("a")) == 64
+
+
+def test_get_set_delete_survives_reopen(tmp_path):
+    cache = DiskCache(tmp_path)
+    key = make_key("k")
+    assert cache.get(key) is None
+    cache.set(key, {"text": "안녕"})
+
+    assert DiskCache(tmp_path).get(key) == {"text": "안녕"}
+    cache.delete(key)
+    assert cache.get(key) is None
+
+
+def test_corrupted_entry_is_a_miss(tmp_path):
+    cache = DiskCache(tmp_path)
+    key = make_key("k")
+    cache.set(key, [1, 2])
+    cache._path(key).write_text("{broken", encoding="utf-8")
+    assert cache.get(key) is None
+
+
+def test_evicts_least_recently_used_when_over_limit(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=350)
+    keys = [make_key(i) for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.set(key, "x" * 100)
+        # mtime 해상도가 낮은 파일시스템에서도 순서가 분명하도록
+        t = time.time() - 100 + i
+        os.utime(cache._path(key), (t, t))
+    # 조회하면 최근 사용으로 갱신 → 가장 오래된 것은 keys[1]
+    assert cache.get(keys[0]) is not None
+
+    cache.set(make_key("new"), "y" * 100)
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.size_bytes() <= 350
@@ -0,0 +1,81 @@
+"""헤지(hedged) LLM 요청과 지연 통계 테스트."""
+import threading
+import time
+
+import pytest
+
+from pipeline import analyzer, latency
+
+
+@pytest.fixture
+def hedge(fake_llm, monkeypatch):
+    """두 provider 모두 키 설정, 헤지 활성. 반환 함수 (gemini, openai)의 각 인자: (지연초[, 응답[, 예외]])."""
+    import config
+    monkeypatch.setattr(config, "GEMINI_API_KEY", "g-test")
+    monkeypatch.setattr(config, "LLM_HEDGE", True)
+    monkeypatch.setattr(config, "LLM_HEDGE_DELAY_SEC", 0.1)
+    # _hedge_delay 최소값(1초) 없이 빠르게 테스트
+    monkeypatch.setattr(analyzer, "_hedge_delay", lambda p: config.LLM_HEDGE_DELAY_SEC)
+
+    def setup(gemini, openai):
+        for name, (delay, reply, error) in (("gemini", (*gemini, None, None)[:3]),
+                                            ("openai", (*openai, None, None)[:3])):
+            fake_llm.delay[name] = delay
+            fake_llm.reply[name] = reply if reply is not None else f"SUMMARY: {name}"
+            fake_llm.error[name] = error
+    yield setup
+    # 늦게 끝난 쪽 요청이 fixture 정리 뒤 실제 DATA_DIR 캐시·통계에 쓰지 않도록 기다림
+    for t in threading.enumerate():
+        if t.name.startswith("llm-hedge"):
+            t.join()
+
+
+def test_fast_primary_does_not_hedge(hedge, fake_llm):
+    hedge((0.01,), (0.01,))
+    assert analyzer.analyze_transcript("전사본", category="voice_memo")["summary"] == "gemini"
+    assert fake_llm.calls == [("gemini", False)]
+
+
+def test_slow_primary_races_secondary(hedge, fake_llm):
+    hedge((1.0,), (0.05,))
+    t0 = time.perf_counter()
+    result = analyzer.analyze_transcript("전사본", category="voice_memo")
+    assert result["summary"] == "openai"
+    assert [name for name, _ in fake_llm.calls] == ["gemini", "openai"]
+    assert time.perf_counter() - t0 < 0.5
+
+
+def test_primary_failure_falls_through_immediately(hedge):
+    hedge((0.01, None, RuntimeError("503")), (0.01,))
+    assert analyzer.analyze_transcript("전사본", category="voice_memo")["summary"] == "openai"
+
+
+def test_unparseable_answer_waits_for_other(hedge):
+    hedge((0.2, "SUMMARY:\n"), (0.3,))
+    assert analyzer.analyze_transcript("전사본", category="voice_memo")["summary"] == "openai"
+
+
+def test_latency_percentiles_and_persistence(tmp_path):
+    stats = latency.LatencyStats(tmp_path / "lat.json")
+    for sec in (1, 2, 3, 4):
+        stats.record("gemini", sec)
+    assert stats.percentile("gemini", 90) is None  # 표본 부족
+    stats.record("gemini", 10)
+    stats.record("gemini", 0, ok=False)
+    assert stats.percentile("gemini", 90) == 10
+    assert stats.percentile("gemini", 50) == 3
+
+    reopened = latency.LatencyStats(tmp_path / "lat.json")
+    assert reopened.summary()["gemini"] == {"count": 5, "errors": 1, "p50": 3, "p90": 10, "p99": 10}
+
+
+def test_hedge_delay_uses_recorded_percentile(monkeypatch, tmp_path):
+    import config
+    stats = latency.LatencyStats(None)
+    monkeypatch.setattr(latency, "_stats", stats)
+    monkeypatch.setattr(config, "LLM_HEDGE_PERCENTILE", 90)
+    monkeypatch.setattr(config, "LLM_HEDGE_DELAY_SEC", 20)
+    assert analyzer._hedge_delay("gemini") == 20
+    for sec in (3, 4, 5, 6, 8):
+        stats.record("gemini", sec)
+    assert analyzer._hedge_delay("gemini") == 8
@@ -0,0 +1,124 @@
+"""작업 상태 저장소 테스트 (메모리 / SQLite 백엔드)."""
+import time
+
+import pytest
+
+from pipeline.job_store import JobStore, MemoryJobBackend, SQLiteJobBackend
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "sqlite":
+        backend = SQLiteJobBackend(tmp_path / "jobs.db")
+        yield JobStore(backend)
+        backend.close()
+    else:
+        yield JobStore(MemoryJobBackend())
+
+
+def _job(status="queued", **extra):
+    job = {"status": status, "progress": 0, "detail": "", "result": None, "error": None, "logs": []}
+    job.update(extra)
+    return job
+
+
+def test_active_job_is_live_dict(store):
+    store["j1"] = _job()
+    store["j1"]["logs"].append("로그")
+    store["j1"]["status"] = "transcribing"
+    assert store["j1"]["logs"] == ["로그"]
+    assert "j1" in store.active_ids()
+
+
+def test_finish_persists_and_evicts_from_memory(store):
+    store["j1"] = _job(segments=[{"timestamp": "00:01", "speaker": "Speaker A", "text": "안녕"}])
+    store["j1"].update({"status": "done", "result": {"note_path": "a.md"}})
+    store.finish("j1")
+
+    assert store.active_ids() == []
+    loaded = store["j1"]
+    assert loaded["status"] == "done"
+    assert loaded["result"] == {"note_path": "a.md"}
+    assert loaded["segments"][0]["text"] == "안녕"
+
+
+def test_contains_and_delete(store):
+    store["j1"] = _job()
+    store.finish("j1")
+    assert "j1" in store
+    del store["j1"]
+    assert "j1" not in store
+    with pytest.raises(KeyError):
+        store["j1"]
+
+
+def test_gc_removes_only_expired_finished_jobs(store):
+    store.ttl_sec = 0.05
+    store["old"] = _job("done")
+    store.finish("old")
+    store["running"] = _job("transcribing")
+    store.save("running")
+    time.sleep(0.1)
+    store["fresh"] = _job("done")
+    store.finish("fresh")
+
+    store.gc()
+
+    assert "old" not in store
+    assert "running" in store
+    assert "fresh" in store
+
+
+def test_recover_interrupted_marks_orphaned_jobs(store):
+    store["j1"] = _job("transcribing")
+    # 재시작 시뮬레이션: 새 저장소가 같은 백엔드를 연결
+    restarted = JobStore(store.backend)
+    assert restarted.recover_interrupted() == ["j1"]
+    assert restarted["j1"]["status"] == "error"
+
+
+def test_sqlite_payloads_stored_out_of_line(tmp_path):
+    backend = SQLiteJobBackend(tmp_path / "jobs.db")
+    store = JobStore(backend)
+    store["j1"] = _job("done", logs=["a", "b"], md_source_text="원문" * 1000)
+    store.finish("j1")
+
+    meta_only = backend.load("j1", fields=None)
+    assert "logs" not in meta_only and "md_source_text" not in meta_only
+    assert meta_only["status"] == "done"
+    assert backend.load("j1", fields=("logs",))["logs"] == ["a", "b"]
+    assert backend._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    backend.close()
+
+
+def test_sqlite_survives_reopen(tmp_path):
+    backend = SQLiteJobBackend(tmp_path / "jobs.db")
+    store = JobStore(backend)
+    store["j1"] = _job("done", result={"note_uri": "obsidian://open"})
+    store.finish("j1")
+    backend.close()
+
+    reopened = JobStore(SQLiteJobBackend(tmp_path / "jobs.db"))
+    assert reopened["j1"]["result"] == {"note_uri": "obsidian://open"}
+    reopened.backend.close()
+
+
+def test_park_and_resume_review_job(store):
+    store["j1"] = _job("review", analysis={"purpose": "목적"})
+    store.park("j1")
+    assert store.active_ids() == []
+    assert store["j1"]["status"] == "review"
+
+    job = store.resume("j1")
+    job["status"] = "confirmed"
+    assert store["j1"] is job
+    with pytest.raises(KeyError):
+        store.resume("missing")
+
+
+def test_recover_interrupted_keeps_review_jobs(store):
+    store["r"] = _job("review")
+    store.park("r")
+    restarted = JobStore(store.backend)
+    assert restarted.recover_interrupted(keep=("review",)) == []
+    assert restarted["r"]["status"] == "review"
@@ -0,0 +1,43 @@
+"""LLM 응답 캐시 테스트 (openai 모듈을 가짜로 대체)."""
+import pytest
+
+from pipeline import analyzer
+
+
+def test_same_prompt_is_served_from_cache(fake_llm):
+    first = analyzer.analyze_transcript("배포 일정 논의", category="meeting", context="주간 회의")
+    second = analyzer.analyze_transcript("배포 일정 논의", category="meeting", context="주간 회의")
+
+    assert len(fake_llm.calls) == 1
+    assert first == second
+    assert second["decisions"] == ["3월 20일 배포"]
+
+
+def test_different_context_or_category_misses(fake_llm):
+    analyzer.analyze_transcript("배포 일정 논의", category="meeting", context="주간 회의")
+    analyzer.analyze_transcript("배포 일정 논의", category="meeting", context="월간 회의")
+    analyzer.analyze_transcript("배포 일정 논의", category="lecture", context="주간 회의")
+    assert len(fake_llm.calls) == 3
+
+
+def test_cache_disabled(fake_llm, monkeypatch):
+    import config
+    monkeypatch.setattr(config, "LLM_CACHE", False)
+    analyzer.analyze_transcript("배포 일정 논의")
+    analyzer.analyze_transcript("배포 일정 논의")
+    assert len(fake_llm.calls) == 2
+
+
+@pytest.mark.parametrize("fake_llm", [
+    {"reply": "죄송합니다. 요청을 처리할 수 없습니다.", "keys": ("openai",)},
+    {"reply": "죄송합니다. 요청을 처리할 수 없습니다.", "keys": ("gemini",)},
+], indirect=True)
+def test_unparseable_text_reply_is_not_cached(fake_llm):
+    analyzer.analyze_transcript("배포 일정 논의")
+    fake_llm.reply = {p: "DECISIONS:\n- 3월 20일 배포\n" for p in ("openai", "gemini")}
+    result = analyzer.analyze_transcript("배포 일정 논의")
+
+    assert len(fake_llm.calls) == 2
+    assert result["decisions"] == ["3월 20일 배포"]
+    analyzer.analyze_transcript("배포 일정 논의")
+    assert len(fake_llm.calls) == 2  # 해석 가능한 응답은 캐시됨
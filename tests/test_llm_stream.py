@@ -0,0 +1,129 @@
+"""LLM 응답 스트리밍과 완성 섹션 미리보기 테스트 (LLM SDK를 가짜 모듈로 대체)."""
+import pytest
+
+from pipeline import analyzer
+
+RESPONSE = (
+    "PURPOSE: 배포 일정 확정\n\n"
+    "DISCUSSION:\n- 일정 검토\n- QA 범위\n\n"
+    "DECISIONS:\n- 3월 20일 배포\n\n"
+    "ACTION_ITEMS:\n- 김철수: 릴리스 노트 작성\n"
+)
+
+# conftest.fake_llm이 이 응답을 7자씩 나눠 스트리밍
+llm_reply = pytest.mark.parametrize("fake_llm", [{"reply": RESPONSE}], indirect=True)
+
+
+def test_partial_response_keeps_only_completed_sections():
+    text = "PURPOSE: 배포 일정 확정\n\nDISCUSSION:\n- 일정 검토\n- QA"
+    assert analyzer.parse_partial_response(text) == {"purpose": "배포 일정 확정"}
+
+    text += " 범위\n\nDECISIONS:\n"
+    assert analyzer.parse_partial_response(text) == {
+        "purpose": "배포 일정 확정", "discussion": ["일정 검토", "QA 범위"],
+    }
+    assert analyzer.parse_partial_response("PURPOSE: 배포") == {}
+
+
+@llm_reply
+def test_openai_stream_emits_growing_sections(fake_llm):
+    partials = []
+    result = analyzer.analyze_transcript("배포 일정 논의", on_partial=partials.append)
+
+    assert fake_llm.calls == [("openai", True)]
+    assert [list(p) for p in partials] == [
+        ["purpose"],
+        ["purpose", "discussion"],
+        ["purpose", "discussion", "decisions"],
+    ]
+    assert result["action_items"] == ["김철수: 릴리스 노트 작성"]
+    # 스트리밍으로 받은 원문도 캐시되어 다음 요청은 API를 부르지 않음
+    assert analyzer.analyze_transcript("배포 일정 논의", on_partial=partials.append) == result
+    assert len(fake_llm.calls) == 1
+
+
+@llm_reply
+def test_gemini_stream(fake_llm, monkeypatch):
+    import config
+    monkeypatch.setattr(config, "GEMINI_API_KEY", "g-test")
+    partials = []
+    result = analyzer.analyze_transcript("배포 일정 논의", on_partial=partials.append)
+    assert fake_llm.calls == [("gemini", True)]
+    assert partials[-1]["decisions"] == ["3월 20일 배포"]
+    assert result["decisions"] == ["3월 20일 배포"]
+
+
+@llm_reply
+def test_without_callback_or_when_disabled_does_not_stream(fake_llm, monkeypatch):
+    import config
+    analyzer.analyze_transcript("배포 일정 논의")
+    monkeypatch.setattr(config, "LLM_STREAM", False)
+    monkeypatch.setattr(config, "LLM_CACHE", False)
+    analyzer.analyze_transcript("배포 일정 논의", on_partial=lambda s: pytest.fail("스트리밍 비활성"))
+    assert fake_llm.calls == [("openai", False), ("openai", False)]
+
+
+def test_map_reduce_reports_merged_partials(monkeypatch):
+    import config
+    monkeypatch.setattr(config, "ANALYSIS_CHUNK_CHARS", 10)
+    monkeypatch.setattr(config, "ANALYSIS_MAP_WORKERS", 1)
+    monkeypatch.setattr(analyzer, "_analyze_single",
+                        lambda text, category, context: {"key_points": [text[:1]]})
+    segs = [{"speaker": s, "text": t} for s, t in (("A", "a" * 10), ("B", "b" * 10))]
+    partials = []
+
+    result = analyzer.analyze_transcript("x" * 22, category="voice_memo", segments=segs,
+                                         on_partial=partials.append)
+
+    assert partials == [{"key_points": ["a"]}, {"key_points": ["a", "b"]}]
+    assert result == partials[-1]
+
+
+def test_partial_analysis_visible_in_light_status_until_review(monkeypatch):
+    import main
+    job_id = "test-partial-analysis"
+    main.job_status[job_id] = {"status": "transcribing", "logs": []}
+    seen = {}
+
+    def fake_analyze(text, category="meeting", context="", segments=None, on_partial=None, usage=None):
+        on_partial({"purpose": "배포 일정 확정"})
+        seen.update(main._light_status(job_id))
+        return {"purpose": "배포 일정 확정", "decisions": ["3월 20일 배포"]}
+
+    monkeypatch.setattr(main, "analyze_transcript", fake_analyze)
+    try:
+        transcript = {"full_text": "안녕", "segments": [{"speaker": "A", "text": "안녕"}], "duration": "00:01"}
+        assert main._analyze_for_review(job_id, transcript, "meeting", "", "", "", "a.m4a", "audio", "")
+
+        assert seen["status"] == "analyzing"
+        assert seen["partial_analysis"] == {"purpose": "배포 일정 확정"}
+        job = main.job_status[job_id]
+        assert job["status"] == "review" and "partial_analysis" not in job
+    finally:
+        del main.job_status[job_id]
+
+
+def test_partial_analysis_carries_non_meeting_category(monkeypatch, tmp_path):
+    import main
+    monkeypatch.setattr(main.scheduler, "submit", lambda *a, **kw: 0)
+    audio = tmp_path / "memo.m4a"
+    audio.write_bytes(b"x")
+    job_id = main._enqueue_upload("test-partial-category", audio, 1, "0" * 64, "memo.m4a",
+                                  "", "", "", "voice_memo", 0)["job_id"]
+    seen = {}
+
+    def fake_analyze(text, category="meeting", context="", segments=None, on_partial=None, usage=None):
+        on_partial({"summary": "메모 요약"})
+        seen.update(main._light_status(job_id))
+        return {"summary": "메모 요약"}
+
+    monkeypatch.setattr(main, "analyze_transcript", fake_analyze)
+    try:
+        assert main._light_status(job_id)["category"] == "voice_memo"
+        transcript = {"full_text": "메모", "segments": [{"speaker": "A", "text": "메모"}], "duration": "00:01"}
+        assert main._analyze_for_review(job_id, transcript, "voice_memo", "", "", "", "memo.m4a", "audio", "")
+        # 검토 전(analyzing)에도 카테고리가 있어 미리보기를 해당 양식으로 그린다
+        assert seen["status"] == "analyzing" and seen["category"] == "voice_memo"
+        assert seen["partial_analysis"] == {"summary": "메모 요약"}
+    finally:
+        del main.job_status[job_id]
@@ -0,0 +1,113 @@
+"""모델 레지스트리 테스트 (whisperx를 가짜 모듈로 대체)."""
+import sys
+import types
+
+import pytest
+
+
+@pytest.fixture
+def fake_whisperx(monkeypatch):
+    calls = []
+    mod = types.ModuleType("whisperx")
+
+    def load_model(name, device, compute_type="float16", language=None):
+        calls.append((name, device, compute_type))
+        return object()
+
+    def load_align_model(language_code, device):
+        calls.append(("align", language_code, device))
+        return object(), {"language": language_code}
+
+    mod.load_model = load_model
+    mod.load_align_model = load_align_model
+    monkeypatch.setitem(sys.modules, "whisperx", mod)
+    from pipeline import model_registry
+    model_registry.unload(kind=None)
+    yield calls
+    model_registry.unload(kind=None)
+
+
+def test_model_loaded_once_per_key(fake_whisperx):
+    from pipeline import model_registry
+    m1, _ = model_registry.get_asr_model("base", "cpu", "int8")
+    m2, warm_sec = model_registry.get_asr_model("base", "cpu", "int8")
+    assert m1 is m2
+    assert len(fake_whisperx) == 1
+    assert warm_sec < 0.1
+
+
+def test_different_compute_type_is_separate_entry(fake_whisperx):
+    from pipeline import model_registry
+    model_registry.get_asr_model("base", "cuda", "float16")
+    model_registry.get_asr_model("base", "cuda", "int8")
+    assert len(fake_whisperx) == 2
+    assert len(model_registry.loaded_keys()) == 2
+
+
+def test_unload_by_model_name(fake_whisperx):
+    from pipeline import model_registry
+    model_registry.get_asr_model("base", "cpu", "int8")
+    model_registry.get_asr_model("small", "cpu", "int8")
+    assert model_registry.unload("base") == 1
+    assert model_registry.loaded_keys() == [("asr", "small", "cpu", "int8")]
+    model_registry.get_asr_model("base", "cpu", "int8")
+    assert fake_whisperx.count(("base", "cpu", "int8")) == 2
+
+
+def test_align_model_cached(fake_whisperx):
+    from pipeline import model_registry
+    (m1, meta), _ = model_registry.get_align_model("ko", "cpu")
+    (m2, _), _ = model_registry.get_align_model("ko", "cpu")
+    assert m1 is m2
+    assert meta == {"language": "ko"}
+    assert fake_whisperx.count(("align", "ko", "cpu")) == 1
+
+
+def test_lru_eviction_by_resident_bytes(fake_whisperx, monkeypatch):
+    import config
+    from pipeline import model_registry
+    # tiny(75MB)/2 + base(145MB)/2 는 상한 100MB 초과 → 오래된 tiny 해제
+    monkeypatch.setattr(config, "MODEL_CACHE_MAX_MB", 100)
+    model_registry.get_asr_model("tiny", "cpu", "int8")
+    model_registry.get_asr_model("base", "cpu", "int8")
+    assert model_registry.loaded_keys("asr") == [("asr", "base", "cpu", "int8")]
+    assert model_registry.resident_bytes() <= 100 * 1024 * 1024
+
+
+def test_lru_hit_refreshes_recency(fake_whisperx, monkeypatch):
+    import config
+    from pipeline import model_registry
+    monkeypatch.setattr(config, "MODEL_CACHE_MAX_MB", 200)
+    model_registry.get_asr_model("tiny", "cpu", "int8")      # 37MB
+    model_registry.get_asr_model("base", "cpu", "int8")      # 72MB
+    model_registry.get_asr_model("tiny", "cpu", "int8")      # tiny 최근 사용으로 갱신
+    model_registry.get_asr_model("base", "cpu", "float16")   # 145MB → 가장 오래된 base/int8만 해제
+    assert model_registry.loaded_keys() == [
+        ("asr", "tiny", "cpu", "int8"),
+        ("asr", "base", "cpu", "float16"),
+    ]
+
+
+def test_concurrent_loads_share_bounded_lock_set(fake_whisperx):
+    import threading
+    import time
+    from pipeline import model_registry
+    fast_load = sys.modules["whisperx"].load_model
+
+    def slow_load(name, *args, **kwargs):
+        time.sleep(0.05)  # 다른 스레드가 로드 중에 도착하도록
+        return fast_load(name, *args, **kwargs)
+
+    sys.modules["whisperx"].load_model = slow_load
+    threads = [threading.Thread(target=model_registry.get_asr_model, args=("base", "cpu", "int8")) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert fake_whisperx.count(("base", "cpu", "int8")) == 1
+    sys.modules["whisperx"].load_model = fast_load
+
+    # 모델 이름이 계속 바뀌어도 로드 락은 늘어나지 않음
+    for i in range(40):
+        model_registry.get_asr_model(f"custom-{i}", "cpu", "int8")
+    assert len(model_registry._load_locks) == model_registry._LOAD_STRIPES
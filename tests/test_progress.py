@@ -0,0 +1,110 @@
+"""전사 진행률/ETA 추정 테스트."""
+import pytest
+
+from pipeline.progress import PCT_END, PCT_START, RtfStats, TranscribeProgress
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def stats(tmp_path):
+    return RtfStats(tmp_path / "rtf.json")
+
+
+def _tracker(stats, clock, parallel=False, calls=None):
+    def on_progress(pct, detail, eta_sec=None, segments=None):
+        calls.append((pct, detail, eta_sec))
+    return TranscribeProgress(
+        on_progress if calls is not None else None, 100.0, "cpu", "base",
+        parallel_diarize=parallel, stats=stats, clock=clock,
+    )
+
+
+def test_rtf_stats_ema_and_persistence(stats, tmp_path):
+    assert stats.get("cpu", "base", "asr") == 0.5  # 측정 전 기본값
+    stats.record("cpu", "base", "asr", elapsed_sec=20, audio_sec=100)
+    assert stats.get("cpu", "base", "asr") == pytest.approx(0.2)
+    stats.record("cpu", "base", "asr", elapsed_sec=30, audio_sec=100)
+    assert stats.get("cpu", "base", "asr") == pytest.approx(0.2 + 0.3 * (0.3 - 0.2))
+    stats.save()
+    reloaded = RtfStats(tmp_path / "rtf.json")
+    assert reloaded.get("cpu", "base", "asr") == pytest.approx(0.23)
+
+
+def test_rtf_stats_ignores_very_short_audio(stats):
+    stats.record("cpu", "base", "asr", elapsed_sec=3, audio_sec=1)
+    assert stats.get("cpu", "base", "asr") == 0.5
+
+
+def test_align_and_diarize_rtf_shared_across_whisper_models(stats):
+    stats.record("cpu", "small", "diarize", elapsed_sec=10, audio_sec=100)
+    assert stats.get("cpu", "base", "diarize") == pytest.approx(0.1)
+
+
+def test_progress_follows_processed_audio_position(stats):
+    clock, calls = FakeClock(), []
+    p = _tracker(stats, clock, calls=calls)
+    # 예상: asr 50s, align 10s, diarize 30s (총 90s)
+    p.begin("asr")
+    p.advance("asr", 50.0)
+    pct, eta = p.snapshot()
+    assert pct == PCT_START + int((PCT_END - PCT_START) * 25 / 90)
+    assert eta == pytest.approx(65.0)
+    assert calls[-1][2] == 65
+
+
+def test_progress_estimated_from_elapsed_time_without_position(stats):
+    clock = FakeClock()
+    p = _tracker(stats, clock)
+    p.begin("asr")
+    clock.now = 25.0
+    pct, eta = p.snapshot()
+    assert eta == pytest.approx(65.0)
+    # 예상보다 오래 걸려도 단계 완료 전에는 95%에서 멈춤
+    clock.now = 500.0
+    _, eta = p.snapshot()
+    assert eta == pytest.approx(50 * 0.05 + 40)
+
+
+def test_progress_is_monotonic(stats):
+    clock = FakeClock()
+    p = _tracker(stats, clock)
+    p.begin("asr")
+    p.advance("asr", 80.0)
+    high, _ = p.snapshot()
+    p.advance("asr", 10.0)
+    assert p.snapshot()[0] == high
+
+
+def test_parallel_diarization_overlaps_in_eta(stats):
+    clock = FakeClock()
+    p = _tracker(stats, clock, parallel=True)
+    p.begin("diarize")
+    p.begin("asr")
+    clock.now = 30.0
+    # 전사+정렬 남은 시간 30s(asr 20 + align 10) vs 화자 분리 남은 0s(30s 예상, 95% 상한 → 1.5s)
+    _, eta = p.snapshot()
+    assert eta == pytest.approx(30.0)
+    p.end("asr")
+    p.end("align")
+    p.end("diarize")
+    assert p.snapshot() == (PCT_END, 0)
+
+
+def test_end_records_rtf_only_when_requested(stats):
+    clock = FakeClock()
+    p = _tracker(stats, clock)
+    p.begin("align")
+    clock.now = 40.0
+    p.end("align", record=False)
+    assert stats.get("cpu", "base", "align") == 0.1
+    p.begin("asr")
+    clock.now = 60.0
+    p.end("asr")
+    assert stats.get("cpu", "base", "asr") == pytest.approx(0.2)
@@ -0,0 +1,76 @@
+"""/reanalyze/{job_id} 테스트: 전사 결과를 재사용해 분석만 다시 실행."""
+import pytest
+from fastapi import HTTPException
+
+
+@pytest.fixture
+def done_job(monkeypatch):
+    import main
+    job_id = "test-done-source"
+    main.job_status[job_id] = {
+        "status": "done", "logs": [], "category": "meeting", "context": "예산 회의",
+        "title": "주간 회의", "project": "[[P Dashboard]]", "original_filename": "a.m4a",
+        "duration": "01:00", "source_type": "audio", "md_source_text": "",
+        "segments": [{"timestamp": "00:01", "speaker": "김철수", "text": "안녕하세요"}],
+        "full_text": "안녕하세요",
+    }
+    main.job_status.finish(job_id)
+    submitted = []
+    monkeypatch.setattr(main.scheduler, "submit", lambda job_id, fn, *a, **kw: submitted.append((job_id, fn, a, kw)))
+    yield job_id, submitted
+    for k in [job_id] + [s[0] for s in submitted]:
+        if k in main.job_status:
+            del main.job_status[k]
+
+
+def test_reanalyze_creates_job_from_stored_transcript(done_job, monkeypatch):
+    import main
+    from main import ReanalyzePayload, reanalyze_job
+    job_id, submitted = done_job
+    analyzed = {}
+
+    def fake_analyze(text, category="meeting", context="", segments=None, on_partial=None, usage=None):
+        analyzed.update(text=text, category=category, context=context)
+        return {"summary": "요약"}
+
+    monkeypatch.setattr(main, "analyze_transcript", fake_analyze)
+    monkeypatch.setattr(main, "transcribe", lambda *a, **kw: pytest.fail("전사를 다시 실행하면 안 됨"))
+
+    new_id = reanalyze_job(job_id, ReanalyzePayload(category="lecture"))["job_id"]
+    (sub_id, fn, args, kw), = submitted
+    assert sub_id == new_id and kw == {"lane": "light"}
+    assert main.job_status[new_id]["category"] == "lecture"
+    fn(*args)
+
+    job = main.job_status[new_id]
+    assert job["status"] == "review"
+    assert job["reanalyzed_from"] == job_id
+    assert job["analysis"] == {"summary": "요약"}
+    assert job["segments"][0]["speaker"] == "김철수"
+    assert analyzed == {"text": "김철수: 안녕하세요", "category": "lecture", "context": "예산 회의"}
+    assert main.job_status[job_id]["status"] == "done"
+
+
+def test_reanalyze_rebuilds_full_text_for_older_jobs(done_job):
+    import main
+    from main import ReanalyzePayload, reanalyze_job
+    job_id, submitted = done_job
+    backend = main.job_status.backend
+    old = backend.load(job_id)
+    old.pop("full_text")
+    backend.save(job_id, old)
+
+    new_id = reanalyze_job(job_id, ReanalyzePayload(context="새 맥락"))["job_id"]
+
+    assert main.job_status[new_id]["full_text"] == "안녕하세요"
+    assert submitted[0][2] == (new_id, "meeting", "새 맥락")
+
+
+def test_reanalyze_rejects_unfinished_job():
+    import main
+    from main import ReanalyzePayload, reanalyze_job
+    main.job_status["test-running"] = {"status": "transcribing", "logs": []}
+    with pytest.raises(HTTPException) as exc:
+        reanalyze_job("test-running", ReanalyzePayload())
+    assert exc.value.status_code == 400
+    del main.job_status["test-running"]
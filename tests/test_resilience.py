@@ -0,0 +1,147 @@
+"""재시도 + 서킷 브레이커 테스트."""
+import pytest
+
+from pipeline import resilience
+from pipeline.resilience import CircuitBreaker, CircuitOpenError, call_with_retry, is_retryable
+
+
+class ApiError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers(monkeypatch):
+    import config
+    monkeypatch.setattr(config, "API_RETRY_BASE_SEC", 1)
+    monkeypatch.setattr(config, "API_RETRY_MAX_SEC", 8)
+    monkeypatch.setattr(config, "BREAKER_FAILURES", 3)
+    monkeypatch.setattr(config, "BREAKER_RESET_SEC", 60)
+    resilience.reset_breakers()
+    yield
+    resilience.reset_breakers()
+
+
+def test_is_retryable():
+    assert is_retryable(ApiError(429)) and is_retryable(ApiError(503))
+    assert not is_retryable(ApiError(400))
+    assert is_retryable(TimeoutError())
+    assert not is_retryable(ValueError("파싱 오류"))
+
+
+def test_retries_transient_errors_with_bounded_backoff():
+    attempts, sleeps = [], []
+
+    def fn():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ApiError(503)
+        return "ok"
+
+    assert call_with_retry("gemini", fn, retries=3, sleep=sleeps.append) == "ok"
+    assert len(attempts) == 3
+    assert 0 <= sleeps[0] <= 1 and 0 <= sleeps[1] <= 2
+
+
+def test_non_retryable_error_is_raised_immediately():
+    attempts = []
+
+    def fn():
+        attempts.append(1)
+        raise ApiError(400)
+
+    with pytest.raises(ApiError):
+        call_with_retry("gemini", fn, retries=3, sleep=lambda s: None)
+    assert len(attempts) == 1
+    assert resilience.get_breaker("gemini").state == "closed"
+
+
+def test_breaker_opens_and_fails_fast_across_calls():
+    attempts = []
+
+    def down():
+        attempts.append(1)
+        raise ApiError(503)
+
+    with pytest.raises(ApiError):
+        call_with_retry("gemini", down, retries=5, sleep=lambda s: None)
+    assert len(attempts) == 3  # 3회 연속 실패에서 열림
+    with pytest.raises(CircuitOpenError):
+        call_with_retry("gemini", down, sleep=lambda s: None)
+    assert len(attempts) == 3
+    # 다른 provider는 영향 없음
+    assert call_with_retry("openai", lambda: "ok") == "ok"
+
+
+def test_half_open_allows_single_probe():
+    clock = FakeClock()
+    breaker = CircuitBreaker("gemini", failure_threshold=2, reset_sec=30, clock=clock)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    clock.now = 30
+    assert breaker.state == "half_open"
+    assert breaker.allow() and not breaker.allow()
+    breaker.record_failure()  # 시험 호출 실패 → 다시 열림
+    assert breaker.state == "open"
+
+    clock.now = 60
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.snapshot() == {"state": "closed", "failures": 0}
+
+
+def test_honours_retry_after_header():
+    class RateLimited(Exception):
+        status_code = 429
+        response = type("R", (), {"headers": {"retry-after": "3"}})()
+
+    sleeps, attempts = [], []
+
+    def fn():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RateLimited()
+        return "ok"
+
+    call_with_retry("openai", fn, retries=1, sleep=sleeps.append)
+    assert sleeps == [3.0]
+
+
+def test_non_retryable_errors_do_not_reset_failure_count():
+    def unavailable():
+        raise ApiError(503)
+
+    def bad_request():
+        raise ApiError(400)
+
+    # 503과 400이 번갈아 와도 503 연속 실패 수는 유지되어 브레이커가 열림
+    for fn in (unavailable, bad_request, unavailable, bad_request, unavailable):
+        with pytest.raises(ApiError):
+            call_with_retry("gemini", fn, retries=0, sleep=lambda s: None)
+    assert resilience.get_breaker("gemini").state == "open"
+
+
+def test_non_retryable_probe_does_not_close_breaker():
+    clock = FakeClock()
+    breaker = CircuitBreaker("gemini", failure_threshold=1, reset_sec=30, clock=clock)
+    resilience._breakers["gemini"] = breaker
+    breaker.record_failure()
+    clock.now = 30
+
+    with pytest.raises(ApiError):
+        call_with_retry("gemini", lambda: (_ for _ in ()).throw(ApiError(400)), sleep=lambda s: None)
+    # 4xx 시험 호출은 복구 증거가 아님 — half-open 유지, 다음 시험 호출 허용
+    assert breaker.snapshot() == {"state": "half_open", "failures": 1}
+    assert call_with_retry("gemini", lambda: "ok") == "ok"
+    assert breaker.state == "closed"
@@ -0,0 +1,91 @@
+"""작업 스케줄러 테스트 (동시 실행 제한, 우선순위, 취소)."""
+import threading
+import time
+
+import pytest
+
+from pipeline.scheduler import JobScheduler
+
+
+@pytest.fixture
+def scheduler():
+    s = JobScheduler({"audio": 1, "light": 2})
+    yield s
+    s.shutdown()
+
+
+def _wait(pred, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not pred():
+        assert time.monotonic() < deadline, "timeout"
+        time.sleep(0.01)
+
+
+def test_audio_lane_runs_one_at_a_time(scheduler):
+    active, peak, order = [0], [0], []
+    lock = threading.Lock()
+
+    def work(name):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+            order.append(name)
+
+    for name in ("a", "b", "c"):
+        scheduler.submit(name, work, name)
+    scheduler.start()
+    _wait(lambda: len(order) == 3)
+
+    assert peak[0] == 1
+    assert order == ["a", "b", "c"]
+
+
+def test_priority_and_position_before_start(scheduler):
+    noop = lambda: None
+    assert scheduler.submit("a", noop) == 1
+    assert scheduler.submit("b", noop) == 2
+    assert scheduler.submit("urgent", noop, priority=5) == 1
+
+    assert scheduler.position("a") == 2
+    assert scheduler.position("b") == 3
+    assert scheduler.position("missing") is None
+    assert scheduler.stats()["audio"] == {"workers": 1, "running": 0, "queued": 3}
+
+
+def test_cancel_removes_queued_job(scheduler):
+    ran = []
+    scheduler.submit("a", ran.append, "a")
+    scheduler.submit("b", ran.append, "b")
+
+    assert scheduler.cancel("a") is True
+    assert scheduler.cancel("a") is False
+    scheduler.start()
+    _wait(lambda: ran == ["b"])
+    assert scheduler.position("b") is None
+
+
+def test_light_lane_not_blocked_by_audio(scheduler):
+    release = threading.Event()
+    done = threading.Event()
+    scheduler.submit("long", release.wait, 2.0)
+    scheduler.submit("md", done.set, lane="light")
+    scheduler.start()
+
+    assert done.wait(1.0)
+    _wait(lambda: scheduler.position("long") == 0)
+    release.set()
+
+
+def test_failing_job_does_not_kill_worker(scheduler):
+    ran = []
+
+    def boom():
+        raise RuntimeError("실패")
+
+    scheduler.submit("bad", boom)
+    scheduler.submit("good", ran.append, "ok")
+    scheduler.start()
+    _wait(lambda: ran == ["ok"])
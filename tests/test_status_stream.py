@@ -0,0 +1,75 @@
+"""가벼운 /status 응답과 /events SSE 스트림 테스트."""
+import asyncio
+import json
+
+import pytest
+
+
+class _FakeRequest:
+    async def is_disconnected(self):
+        return False
+
+
+@pytest.fixture
+def job(monkeypatch):
+    import main
+    monkeypatch.setattr(main, "_EVENT_POLL_SEC", 0.01)
+    job_id = "test-stream-job"
+    main.job_status[job_id] = {
+        "status": "transcribing", "progress": 10, "detail": "전사 중", "logs": ["a", "b"],
+        "segments": [{"text": "큰 데이터"}], "partial_segments": [{"text": "1"}, {"text": "2"}],
+    }
+    yield job_id
+    if job_id in main.job_status:
+        del main.job_status[job_id]
+
+
+def test_light_status_omits_heavy_fields_and_returns_new_items(job):
+    from main import get_status
+
+    d = get_status(job, logs_from=1, partial_from=1)
+
+    assert "segments" not in d
+    assert d["logs"] == ["b"] and d["logs_from"] == 1
+    assert d["partial_segments"] == [{"text": "2"}] and d["partial_from"] == 1
+    assert get_status(job, full=True)["segments"] == [{"text": "큰 데이터"}]
+
+
+def test_light_status_resends_partial_after_reset(job):
+    from main import get_status
+    d = get_status(job, partial_from=5)
+    assert d["partial_from"] == 0 and len(d["partial_segments"]) == 2
+
+
+def _parse(chunks):
+    events = []
+    for chunk in chunks:
+        if chunk.startswith(":"):
+            continue
+        name, data = chunk.strip().split("\n")
+        events.append((name.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+def test_event_stream_sends_only_deltas(job):
+    import main
+
+    async def run():
+        chunks = []
+        gen = main._job_events(job, _FakeRequest())
+        chunks.append(await gen.__anext__())
+        main.job_status[job]["logs"].append("c")
+        main.job_status[job]["progress"] = 20
+        chunks.append(await gen.__anext__())
+        main.job_status[job]["status"] = "review"
+        async for chunk in gen:
+            chunks.append(chunk)
+        return chunks
+
+    events = _parse(asyncio.run(run()))
+
+    first, second, third, end = events
+    assert first[0] == "update" and first[1]["logs"] == ["a", "b"] and "segments" not in first[1]
+    assert second[1] == {"progress": 20, "logs": ["c"], "logs_from": 2}
+    assert third[1] == {"status": "review"}
+    assert end[0] == "end"
@@ -0,0 +1,88 @@
+"""구조화(JSON) 출력 모드 테스트 (LLM SDK를 가짜 모듈로 대체)."""
+import json
+
+import pytest
+
+from pipeline import analyzer
+
+MEETING_JSON = json.dumps({
+    "purpose": "배포 일정 확정",
+    "discussion": ["일정 검토"],
+    "decisions": ["3월 20일 배포"],
+    "action_items": [],
+    "follow_up": [],
+}, ensure_ascii=False)
+
+json_mode = pytest.mark.parametrize(
+    "fake_llm", [{"reply": MEETING_JSON, "config": {"LLM_JSON": True}}], indirect=True)
+
+
+@pytest.mark.parametrize("category", list(analyzer.SECTION_SCHEMAS))
+def test_schema_keys_match_text_parser(category):
+    schema = analyzer.analysis_json_schema(category)
+    parsed = analyzer.parse_llm_response("", category)
+    assert list(schema["properties"]) == list(parsed) == schema["required"]
+    for key, value in parsed.items():
+        assert schema["properties"][key]["type"] == ("array" if isinstance(value, list) else "string")
+    assert schema["additionalProperties"] is False
+
+    gemini = analyzer.analysis_json_schema(category, gemini=True)
+    assert gemini["type"] == "OBJECT" and "additionalProperties" not in gemini
+
+
+def test_parse_json_analysis_validates_and_normalizes():
+    fenced = f"```json\n{MEETING_JSON}\n```"
+    assert analyzer.parse_json_analysis(fenced)["decisions"] == ["3월 20일 배포"]
+
+    loose = analyzer.parse_json_analysis('{"summary": " 요약 ", "key_points": "하나"}', "voice_memo")
+    assert loose == {"summary": "요약", "key_points": ["하나"], "action_items": []}
+
+    assert analyzer.parse_json_analysis("PURPOSE: 텍스트 응답") is None
+    assert analyzer.parse_json_analysis('{"unrelated": 1}') is None
+    assert analyzer.parse_json_analysis('{"purpose": ["목록"]}') is None
+    assert analyzer.parse_json_analysis('{"discussion": [1, 2]}') is None
+
+
+@json_mode
+def test_openai_requests_strict_json_schema(fake_llm):
+    result = analyzer.analyze_transcript("배포 일정 논의", on_partial=lambda s: pytest.fail("JSON 모드는 스트리밍 안 함"))
+
+    assert result["decisions"] == ["3월 20일 배포"]
+    fmt = fake_llm.openai[0]["response_format"]
+    assert fmt["type"] == "json_schema" and fmt["json_schema"]["strict"] is True
+    assert fmt["json_schema"]["schema"] == analyzer.analysis_json_schema("meeting")
+    assert "JSON 객체" in fake_llm.openai[0]["messages"][0]["content"]
+
+
+@json_mode
+def test_gemini_requests_response_schema(fake_llm, monkeypatch):
+    import config
+    monkeypatch.setattr(config, "GEMINI_API_KEY", "g-test")
+    fake_llm.reply["gemini"] = '{"summary": "제어 기초", "key_concepts": ["PID"]}'
+    result = analyzer.analyze_transcript("강의 내용", category="lecture")
+    assert fake_llm.gemini[0]["config"]["response_mime_type"] == "application/json"
+    assert fake_llm.gemini[0]["config"]["response_schema"] == analyzer.analysis_json_schema("lecture", gemini=True)
+    assert result["key_concepts"] == ["PID"] and result["questions"] == []
+    assert fake_llm.openai == []
+
+
+@json_mode
+def test_text_reply_falls_back_to_section_parser(fake_llm):
+    fake_llm.reply["openai"] = "PURPOSE: 텍스트로 답함\n\nDECISIONS:\n- 결정\n"
+    result = analyzer.analyze_transcript("배포 일정 논의")
+    assert result["purpose"] == "텍스트로 답함" and result["decisions"] == ["결정"]
+
+
+@json_mode
+def test_unusable_reply_tries_next_provider_and_is_not_cached(fake_llm, monkeypatch):
+    import config
+    monkeypatch.setattr(config, "GEMINI_API_KEY", "g-test")
+    fake_llm.reply["gemini"] = "죄송합니다, 분석할 수 없습니다."
+
+    result = analyzer.analyze_transcript("배포 일정 논의")
+    assert result["purpose"] == "배포 일정 확정"
+    assert len(fake_llm.gemini) == 1 and len(fake_llm.openai) == 1
+
+    fake_llm.reply["gemini"] = MEETING_JSON
+    analyzer.analyze_transcript("배포 일정 논의")
+    assert len(fake_llm.gemini) == 2  # 해석 불가 응답은 캐시되지 않아 다시 요청
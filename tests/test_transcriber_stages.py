@@ -0,0 +1,353 @@
+"""로컬 전사 단계 구성 테스트 (whisperx를 가짜 모듈로 대체)."""
+import sys
+import time
+import types
+
+import pytest
+
+STAGE_SEC = 0.3
+
+
+@pytest.fixture
+def fake_whisperx(monkeypatch, tmp_path):
+    from pipeline import model_registry, progress
+
+    mod = types.ModuleType("whisperx")
+    audio_mod = types.ModuleType("whisperx.audio")
+    diarize_mod = types.ModuleType("whisperx.diarize")
+    audio_mod.SAMPLE_RATE = 16000
+    mod.audio = audio_mod
+    mod.diarize = diarize_mod
+
+    seen_buffers = {}
+
+    class FakeModel:
+        def transcribe(self, audio, batch_size=4, **kwargs):
+            seen_buffers["asr"] = audio
+            time.sleep(STAGE_SEC)
+            return {"segments": [{"start": 0.0, "end": 1.0, "text": "안녕하세요"}]}
+
+    class FakeDiarizationPipeline:
+        def __init__(self, token=None, device="cpu"):
+            pass
+
+        def __call__(self, audio):
+            seen_buffers["diarize"] = audio
+            time.sleep(STAGE_SEC)
+            return "diarized"
+
+    def assign_word_speakers(diarize_segments, result):
+        for seg in result["segments"]:
+            seg["speaker"] = "SPEAKER_00"
+        return result
+
+    mod.load_model = lambda *a, **kw: FakeModel()
+    mod.load_align_model = lambda language_code, device: (object(), {})
+    mod.align = lambda segments, *a, **kw: {"segments": segments}
+    mod.assign_word_speakers = assign_word_speakers
+    diarize_mod.DiarizationPipeline = FakeDiarizationPipeline
+
+    monkeypatch.setitem(sys.modules, "whisperx", mod)
+    monkeypatch.setitem(sys.modules, "whisperx.audio", audio_mod)
+    monkeypatch.setitem(sys.modules, "whisperx.diarize", diarize_mod)
+    monkeypatch.setattr("pipeline.transcriber._detect_device", lambda: ("cpu", "int8"))
+    monkeypatch.setattr(progress, "_stats", progress.RtfStats(tmp_path / "rtf_stats.json"))
+    monkeypatch.setattr("pipeline.transcriber._decode_audio", lambda path: ([0.0] * 16000 * 2, None))
+    model_registry.unload(kind=None)
+    audio_path = tmp_path / "sample.wav"
+    audio_path.write_bytes(b"\0")
+    yield types.SimpleNamespace(path=audio_path, buffers=seen_buffers)
+    model_registry.unload(kind=None)
+
+
+def test_diarization_overlaps_with_asr(fake_whisperx, monkeypatch):
+    import config
+    from pipeline.transcriber import _transcribe_local
+    monkeypatch.setattr(config, "DIARIZE_PARALLEL", True)
+
+    result = _transcribe_local(fake_whisperx.path)
+
+    t = result["timings"]
+    assert result["segments"][0]["speaker"] == "Speaker A"
+    assert t["diarize"] >= STAGE_SEC * 0.9
+    # 직렬이면 전사 + 화자 분리 ≥ 2 × STAGE_SEC
+    assert t["total"] < STAGE_SEC * 1.8
+    assert t["diarize_wait"] < STAGE_SEC
+
+
+def test_sequential_mode_when_disabled(fake_whisperx, monkeypatch):
+    import config
+    from pipeline.transcriber import _transcribe_local
+    monkeypatch.setattr(config, "DIARIZE_PARALLEL", False)
+
+    result = _transcribe_local(fake_whisperx.path)
+
+    t = result["timings"]
+    assert "diarize_wait" not in t
+    assert t["total"] >= STAGE_SEC * 2
+    assert result["duration"] == "00:02"
+
+
+def test_waveform_decoded_once_and_shared(fake_whisperx, monkeypatch):
+    import config
+    from pipeline.transcriber import _transcribe_local
+    monkeypatch.setattr(config, "DIARIZE_PARALLEL", True)
+
+    _transcribe_local(fake_whisperx.path)
+
+    assert fake_whisperx.buffers["diarize"] is fake_whisperx.buffers["asr"]
+
+
+@pytest.mark.parametrize("asr_delay, load_delay, diarized", [
+    (0.1, 0, True),            # 화자 분리 실행 중에 실패 → 끝날 때까지 기다림
+    (0, STAGE_SEC, False),     # 화자 분리 모델 로딩 중에 실패 → 화자 분리를 시작하지 않음
+])
+def test_asr_failure_stops_parallel_diarization(fake_whisperx, monkeypatch, asr_delay, load_delay, diarized):
+    import threading
+    import config
+    from pipeline.transcriber import _transcribe_local
+    monkeypatch.setattr(config, "DIARIZE_PARALLEL", True)
+    whisperx = sys.modules["whisperx"]
+    pipeline_cls = whisperx.diarize.DiarizationPipeline
+    finished = []
+
+    class FailingModel:
+        def transcribe(self, audio, batch_size=4, **kwargs):
+            time.sleep(asr_delay)
+            raise RuntimeError("ASR 실패")
+
+    class SlowDiarization(pipeline_cls):
+        def __init__(self, *a, **kw):
+            time.sleep(load_delay)
+
+        def __call__(self, audio):
+            result = super().__call__(audio)
+            finished.append(result)
+            return result
+
+    monkeypatch.setattr(whisperx, "load_model", lambda *a, **kw: FailingModel())
+    monkeypatch.setattr(whisperx.diarize, "DiarizationPipeline", SlowDiarization)
+
+    with pytest.raises(RuntimeError, match="ASR 실패"):
+        _transcribe_local(fake_whisperx.path)
+
+    # 실패를 반환할 때는 화자 분리 스레드가 남아 있지 않음
+    assert not [t for t in threading.enumerate() if t.name.startswith("diarize")]
+    assert finished == (["diarized"] if diarized else [])
+    assert ("diarize" in fake_whisperx.buffers) == diarized
+
+
+@pytest.fixture
+def fake_ffmpeg(monkeypatch, tmp_path):
+    """ffmpeg 대신 출력 경로에 1초 분량 float32 PCM을 기록."""
+    np = pytest.importorskip("numpy")
+    audio_mod = types.ModuleType("whisperx.audio")
+    audio_mod.SAMPLE_RATE = 16000
+    monkeypatch.setitem(sys.modules, "whisperx.audio", audio_mod)
+
+    def run(cmd, capture_output=True, check=True):
+        np.linspace(-1, 1, 16000, dtype=np.float32).tofile(cmd[-1])
+
+    monkeypatch.setattr("pipeline.transcriber.subprocess.run", run)
+    monkeypatch.setattr("config.UPLOAD_DIR", tmp_path / "uploads")
+    return np
+
+
+def test_decode_audio_in_memory(fake_ffmpeg, monkeypatch, tmp_path):
+    import config
+    from pipeline.transcriber import _decode_audio
+    monkeypatch.setattr(config, "AUDIO_MMAP_MIN_MB", 128)
+    src = tmp_path / "a.m4a"
+    src.write_bytes(b"\0")
+
+    audio, pcm_path = _decode_audio(src)
+
+    assert pcm_path is None
+    assert audio.dtype == fake_ffmpeg.float32 and len(audio) == 16000
+    assert list(tmp_path.glob("*.f32")) == [] and list((tmp_path / "uploads").iterdir()) == []
+
+
+def test_decode_audio_memory_mapped(fake_ffmpeg, monkeypatch, tmp_path):
+    import config
+    from pipeline.transcriber import _decode_audio
+    monkeypatch.setattr(config, "AUDIO_MMAP_MIN_MB", 0)
+    src = tmp_path / "a.m4a"
+    src.write_bytes(b"\0")
+
+    audio, pcm_path = _decode_audio(src)
+
+    assert isinstance(audio, fake_ffmpeg.memmap)
+    # 원본 폴더(일괄 처리의 녹음 폴더)가 아니라 UPLOAD_DIR에 임시 파일
+    assert pcm_path.exists() and pcm_path.parent == config.UPLOAD_DIR
+    assert list(tmp_path.glob("*.f32")) == []
+    audio[0] = 5.0  # copy-on-write: 원본 PCM 파일은 유지
+    assert fake_ffmpeg.fromfile(pcm_path, dtype=fake_ffmpeg.float32)[0] == -1.0
+    del audio
+
+
+def test_decode_failure_and_stale_pcm_files_are_removed(fake_ffmpeg, monkeypatch, tmp_path):
+    import os
+    import subprocess
+    import config
+    from pipeline import transcriber
+    src = tmp_path / "a.m4a"
+    src.write_bytes(b"\0")
+
+    def broken_ffmpeg(cmd, capture_output=True, check=True):
+        open(cmd[-1], "wb").write(b"partial")
+        raise subprocess.CalledProcessError(1, cmd, stderr=b"invalid data")
+
+    monkeypatch.setattr("pipeline.transcriber.subprocess.run", broken_ffmpeg)
+    with pytest.raises(RuntimeError):
+        transcriber._decode_audio(src)
+    assert list(config.UPLOAD_DIR.glob("*.f32")) == []
+
+    stale, fresh = config.UPLOAD_DIR / "old.f32", config.UPLOAD_DIR / "new.f32"
+    stale.write_bytes(b"x")
+    fresh.write_bytes(b"x")
+    os.utime(stale, (0, 0))
+    assert transcriber.cleanup_pcm_files(max_age_sec=3600) == 1
+    assert not stale.exists() and fresh.exists()
+
+
+# ── 구간(chunk) 전사 ────────────────────────────────────────────────
+
+def _speech_with_gaps(np, sr, total_sec, gaps_at):
+    """전체가 소리이고 gaps_at(초) 위치에만 0.5초 무음이 있는 파형."""
+    audio = np.full(int(total_sec * sr), 0.5, dtype=np.float32)
+    for g in gaps_at:
+        audio[int(g * sr):int((g + 0.5) * sr)] = 0.0
+    return audio
+
+
+def test_plan_chunks_short_audio_single_chunk():
+    np = pytest.importorskip("numpy")
+    from pipeline.transcriber import _plan_chunks
+    audio = np.zeros(16000 * 5, dtype=np.float32)
+    assert _plan_chunks(audio, 16000, 10, 1) == [
+        {"start": 0, "end": 16000 * 5, "keep_from": 0, "keep_to": 16000 * 5}
+    ]
+
+
+def test_plan_chunks_boundaries_snap_to_silence():
+    np = pytest.importorskip("numpy")
+    from pipeline.transcriber import _plan_chunks
+    sr = 16000
+    audio = _speech_with_gaps(np, sr, 28, gaps_at=[10.5, 20.0])
+
+    chunks = _plan_chunks(audio, sr, chunk_sec=10, overlap_sec=1)
+
+    assert len(chunks) == 3
+    first_cut, second_cut = chunks[0]["keep_to"] / sr, chunks[1]["keep_to"] / sr
+    assert 10.5 <= first_cut <= 11.0
+    assert 20.0 <= second_cut <= 20.5
+    # 채택 범위는 빈틈없이 이어지고, 모델 입력 구간은 앞뒤로 겹친다
+    assert chunks[1]["keep_from"] == chunks[0]["keep_to"]
+    assert chunks[1]["start"] == chunks[0]["keep_to"] - sr
+    assert chunks[-1]["keep_to"] == len(audio)
+
+
+def test_stitch_offsets_and_drops_overlap_duplicates():
+    from pipeline.transcriber import _stitch_chunk_segments
+    sr = 16000
+    chunk = {"start": 9 * sr, "end": 21 * sr, "keep_from": 10 * sr, "keep_to": 20 * sr}
+    previous = [{"start": 8.0, "end": 10.4, "text": "앞 구간"}]
+    segs = [
+        {"start": 0.2, "end": 1.3, "text": "겹침 구간 중복"},   # 9.2s — 채택 범위 이전
+        {"start": 1.1, "end": 1.4, "text": "이미 덮인 꼬리"},   # 10.1~10.4s — 이전 세그먼트가 덮음
+        {"start": 2.0, "end": 4.0, "text": "채택"},            # 11.0s
+        {"start": 11.5, "end": 12.0, "text": "다음 구간 몫"},   # 20.5s
+    ]
+    kept = _stitch_chunk_segments(segs, chunk, sr, previous)
+    assert [s["text"] for s in kept] == ["채택"]
+    assert kept[0]["start"] == 11.0 and kept[0]["end"] == 13.0
+
+
+def test_chunked_transcription_emits_partial_segments(fake_whisperx, monkeypatch):
+    np = pytest.importorskip("numpy")
+    import config
+    from pipeline.transcriber import _transcribe_local
+    sr = 16000
+    audio = _speech_with_gaps(np, sr, 25, gaps_at=[10.0, 20.0])
+    monkeypatch.setattr("pipeline.transcriber._decode_audio", lambda path: (audio, None))
+    monkeypatch.setattr(config, "CHUNK_SEC", 10)
+    monkeypatch.setattr(config, "CHUNK_OVERLAP_SEC", 1)
+    monkeypatch.setattr(config, "DIARIZE_PARALLEL", False)
+
+    class ChunkModel:
+        def transcribe(self, chunk_audio, **kwargs):
+            dur = len(chunk_audio) / sr
+            return {"segments": [{"start": 1.5, "end": dur - 1.5, "text": f"{dur:.0f}초 구간"}]}
+
+    monkeypatch.setattr(
+        "pipeline.model_registry.get_asr_model", lambda *a, **kw: (ChunkModel(), 0.0)
+    )
+    partials = []
+
+    def on_progress(pct, detail, segments=None, eta_sec=None):
+        if segments is not None:
+            partials.append((pct, segments))
+
+    result = _transcribe_local(fake_whisperx.path, on_progress, category="lecture")
+
+    assert len(partials) == 3
+    assert [len(p[1]) for p in partials] == [1, 2, 3]
+    # 진행률은 처리한 오디오 위치에 비례: ASR 완료 시점 = ASR 예상 시간 / 전체 예상 시간 (기본 CPU RTF)
+    pcts = [p[0] for p in partials]
+    assert pcts == sorted(pcts) and pcts[0] < pcts[-1]
+    assert pcts[-1] == 2 + int(93 * 0.5 / (0.5 + 0.1 + 0.3))
+    assert [s["timestamp"] for s in result["segments"]] == ["00:01", "00:10", "00:20"]
+    assert all(set(s) == {"timestamp", "speaker", "text"} for s in result["segments"])
+
+
+# ── 전사 결과 캐시 ──────────────────────────────────────────────────
+
+def test_transcribe_reuses_cached_result_for_same_audio(fake_whisperx, monkeypatch, tmp_path):
+    import config
+    from pipeline import transcriber
+    from pipeline.disk_cache import DiskCache
+    monkeypatch.setattr(config, "TRANSCRIPT_CACHE", True)
+    monkeypatch.setattr(transcriber, "_transcript_cache", DiskCache(tmp_path / "transcripts"))
+    calls = []
+    real = transcriber._transcribe_local
+    monkeypatch.setattr(transcriber, "_transcribe_local", lambda *a, **kw: calls.append(1) or real(*a, **kw))
+
+    first = transcriber.transcribe(fake_whisperx.path, context="예산", category="meeting")
+    # 카테고리만 바꿔 다시 올려도 같은 내용·프롬프트면 재사용
+    progress = []
+    second = transcriber.transcribe(
+        fake_whisperx.path, on_progress=lambda pct, detail, **kw: progress.append(pct),
+        context="예산", category="lecture",
+    )
+
+    assert len(calls) == 1
+    assert second["cached"] is True and not first.get("cached")
+    assert second["segments"] == first["segments"]
+    assert progress == [95]
+
+    # 프롬프트(맥락)가 다르면 새로 전사
+    transcriber.transcribe(fake_whisperx.path, context="다른 맥락", audio_sha256="abc")
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("stage", ["align", "diarize"])
+def test_degraded_transcript_is_not_cached(fake_whisperx, monkeypatch, tmp_path, stage):
+    import config
+    from pipeline import transcriber
+    from pipeline.disk_cache import DiskCache
+    monkeypatch.setattr(config, "TRANSCRIPT_CACHE", True)
+    monkeypatch.setattr(config, "HF_TOKEN", "hf-test")
+    monkeypatch.setattr(transcriber, "_transcript_cache", DiskCache(tmp_path / "transcripts"))
+
+    def broken(*a, **kw):
+        raise OSError(f"{stage} 실패")
+
+    if stage == "align":
+        monkeypatch.setattr(sys.modules["whisperx"], "align", broken)
+    else:
+        monkeypatch.setattr(sys.modules["whisperx.diarize"], "DiarizationPipeline", broken)
+
+    first = transcriber.transcribe(fake_whisperx.path)
+    assert first["failed_stages"] == [stage]
+    # 실패한 단계를 다시 시도하도록 캐시하지 않음
+    assert not transcriber.transcribe(fake_whisperx.path).get("cached")
@@ -5,19 +5,54 @@ category 필드 플러밍 테스트
 import inspect
 
 
-def test_upload_endpoint_accepts_category_param():
-    """업로드 엔드포인트 시그니처에 category 파라미터가 있다."""
-    from main import upload
-    sig = inspect.signature(upload)
-    assert "category" in sig.parameters
+def _multipart(fields: dict, filename: str = "rec.m4a", data: bytes = b"audio") -> tuple[bytes, str]:
+    boundary = "----meetscribe"
+    parts = [
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f'Content-Type: application/octet-stream\r\n\r\n'.encode() + data + b"\r\n"
+    ]
+    for k, v in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{k}"\r\n\r\n{v}\r\n'.encode())
+    body = b"".join(parts) + f"--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def _post_upload(monkeypatch, tmp_path, fields: dict) -> dict:
+    import asyncio
+    from starlette.requests import Request
+    import config
+    import main
+    monkeypatch.setattr(config, "UPLOAD_DIR", tmp_path)
+    monkeypatch.setattr(main.scheduler, "submit", lambda *a, **kw: 0)
+    body, content_type = _multipart(fields)
+    sent = []
+
+    async def receive():
+        if sent:
+            return {"type": "http.disconnect"}
+        sent.append(True)
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    request = Request({
+        "type": "http", "method": "POST", "path": "/upload", "query_string": b"",
+        "headers": [(b"content-type", content_type.encode()), (b"content-length", str(len(body)).encode())],
+    }, receive)
+    job_id = asyncio.run(main.upload(request))["job_id"]
+    job = dict(main.job_status[job_id])
+    del main.job_status[job_id]
+    return job
+
+
+def test_upload_endpoint_accepts_category_param(monkeypatch, tmp_path):
+    """업로드 폼의 category 필드가 작업에 저장된다."""
+    job = _post_upload(monkeypatch, tmp_path, {"title": "강의", "category": "lecture"})
+    assert job["category"] == "lecture"
 
 
-def test_upload_category_default_is_meeting():
-    """category 파라미터의 기본값이 'meeting'이다."""
-    from main import upload
-    sig = inspect.signature(upload)
-    param = sig.parameters["category"]
-    assert param is not None
+def test_upload_category_default_is_meeting(monkeypatch, tmp_path):
+    """category 필드가 없으면 'meeting'이다."""
+    job = _post_upload(monkeypatch, tmp_path, {"title": "회의"})
+    assert job["category"] == "meeting"
 
 
 def test_process_signature_has_category():
@@ -0,0 +1,268 @@
+"""업로드 스트리밍 저장 테스트."""
+import asyncio
+import hashlib
+import io
+
+import pytest
+
+from pipeline.uploads import UploadTooLarge, max_upload_bytes, save_stream
+
+
+def _reader(data: bytes):
+    buf = io.BytesIO(data)
+    reads = []
+
+    async def read(n):
+        reads.append(n)
+        return buf.read(n)
+    return read, reads
+
+
+def test_save_stream_writes_in_chunks_and_hashes(tmp_path, monkeypatch):
+    monkeypatch.setattr("pipeline.uploads.CHUNK_SIZE", 4)
+    data = b"0123456789"
+    read, reads = _reader(data)
+    dest = tmp_path / "a.m4a"
+
+    size, sha = asyncio.run(save_stream(read, dest, max_bytes=100))
+
+    assert size == 10 and dest.read_bytes() == data
+    assert sha == hashlib.sha256(data).hexdigest()
+    assert reads == [4, 4, 4, 4]
+    assert not (tmp_path / "a.m4a.part").exists()
+
+
+def test_save_stream_aborts_when_limit_exceeded(tmp_path, monkeypatch):
+    monkeypatch.setattr("pipeline.uploads.CHUNK_SIZE", 4)
+    read, reads = _reader(b"x" * 100)
+    dest = tmp_path / "a.md"
+
+    with pytest.raises(UploadTooLarge):
+        asyncio.run(save_stream(read, dest, max_bytes=10))
+
+    # 제한을 넘는 순간 중단하고 기록 중이던 파일도 남기지 않음
+    assert len(reads) == 3
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_max_upload_bytes_per_type(monkeypatch):
+    import config
+    monkeypatch.setattr(config, "MAX_UPLOAD_MB", 100)
+    monkeypatch.setattr(config, "MAX_MD_UPLOAD_MB", 5)
+    assert max_upload_bytes(".MD") == 5 * 1024 * 1024
+    assert max_upload_bytes(".mp4") == 100 * 1024 * 1024
+
+
+def _multipart_body(filename: str, data: bytes, **fields) -> tuple[bytes, str]:
+    boundary = "bnd"
+    body = (f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n\r\n'.encode()
+            + data + b"\r\n")
+    for k, v in fields.items():
+        body += f'--{boundary}\r\nContent-Disposition: form-data; name="{k}"\r\n\r\n{v}\r\n'.encode()
+    return body + f"--{boundary}--\r\n".encode(), f"multipart/form-data; boundary={boundary}"
+
+
+def _streamed(body: bytes, size: int, sent: list):
+    async def gen():
+        for i in range(0, len(body), size):
+            sent.append(i)
+            yield body[i:i + size]
+    return gen()
+
+
+def test_save_multipart_streams_file_and_fields(tmp_path):
+    from pipeline.uploads import save_multipart
+    data = bytes(range(256)) * 40
+    body, ctype = _multipart_body("회의 녹음.m4a", data, title="주간 회의", category="lecture")
+
+    fields, saved = asyncio.run(save_multipart(_streamed(body, 1000, []), ctype, tmp_path / "job", {".m4a"}))
+
+    assert fields == {"title": "주간 회의", "category": "lecture"}
+    assert saved["filename"] == "회의 녹음.m4a" and saved["path"] == tmp_path / "job.m4a"
+    assert saved["path"].read_bytes() == data and saved["size"] == len(data)
+    assert saved["sha256"] == hashlib.sha256(data).hexdigest()
+    assert list(tmp_path.iterdir()) == [saved["path"]]
+
+
+def test_save_multipart_enforces_per_type_limit_as_bytes_arrive(tmp_path, monkeypatch):
+    import config
+    from pipeline.uploads import save_multipart
+    monkeypatch.setattr(config, "MAX_MD_UPLOAD_MB", 1)
+    body, ctype = _multipart_body("note.md", b"#" * (3 * 1024 * 1024))
+    sent = []
+
+    with pytest.raises(UploadTooLarge):
+        asyncio.run(save_multipart(_streamed(body, 64 * 1024, sent), ctype, tmp_path / "job", {".md", ".m4a"}))
+
+    # MD 상한(1MB)을 넘는 순간 중단 — 본문 나머지는 읽지 않고 기록 중이던 파일도 삭제
+    assert len(sent) * 64 * 1024 < 1.2 * 1024 * 1024
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_save_multipart_rejects_bad_requests(tmp_path):
+    from pipeline.uploads import InvalidUpload, save_multipart
+    body, ctype = _multipart_body("run.exe", b"MZ")
+    with pytest.raises(InvalidUpload):
+        asyncio.run(save_multipart(_streamed(body, 100, []), ctype, tmp_path / "job", {".m4a"}))
+    with pytest.raises(InvalidUpload):
+        asyncio.run(save_multipart(_streamed(b"{}", 100, []), "application/json", tmp_path / "job", {".m4a"}))
+    # 파일 파트 없이 필드만
+    body, ctype = _multipart_body("a.m4a", b"x", title="t")
+    fields_only = body[body.index(b"--bnd", 5):]
+    with pytest.raises(InvalidUpload):
+        asyncio.run(save_multipart(_streamed(fields_only, 100, []), ctype, tmp_path / "job", {".m4a"}))
+    # 파일 도중에 끊긴 본문
+    body, ctype = _multipart_body("a.m4a", b"x" * 500)
+    with pytest.raises(InvalidUpload):
+        asyncio.run(save_multipart(_streamed(body[:300], 100, []), ctype, tmp_path / "job", {".m4a"}))
+    assert list(tmp_path.iterdir()) == []
+
+
+# ── 이어받기 업로드 ────────────────────────────────────────────────
+
+async def _chunks(*parts):
+    for p in parts:
+        yield p
+
+
+def test_resumable_upload_resumes_from_server_offset(tmp_path):
+    from pipeline.uploads import OffsetMismatch, ResumableUploads
+    uploads = ResumableUploads(tmp_path)
+    data = b"abcdefghij"
+    upload_id = uploads.init("rec.m4a", len(data), {"title": "회의"})["upload_id"]
+
+    assert asyncio.run(uploads.append(upload_id, 0, _chunks(b"abc", b"de"))) == 5
+    # 클라이언트가 응답을 못 받고 0부터 다시 보내면 현재 위치를 알려줌
+    with pytest.raises(OffsetMismatch) as exc:
+        asyncio.run(uploads.append(upload_id, 0, _chunks(b"abc")))
+    assert exc.value.offset == 5
+    assert uploads.status(upload_id)["offset"] == 5
+    with pytest.raises(OffsetMismatch):
+        asyncio.run(uploads.finalize(upload_id, tmp_path / "job.m4a"))
+
+    asyncio.run(uploads.append(upload_id, 5, _chunks(b"fghij")))
+    size, sha = asyncio.run(uploads.finalize(upload_id, tmp_path / "job.m4a"))
+
+    assert (tmp_path / "job.m4a").read_bytes() == data
+    assert sha == hashlib.sha256(data).hexdigest() and size == 10
+    assert list(tmp_path.glob("*.upload.json")) == []
+
+
+def test_resumable_upload_rejects_bytes_past_declared_size(tmp_path):
+    from pipeline.uploads import ResumableUploads
+    uploads = ResumableUploads(tmp_path)
+    upload_id = uploads.init("rec.m4a", 4, {})["upload_id"]
+    with pytest.raises(UploadTooLarge):
+        asyncio.run(uploads.append(upload_id, 0, _chunks(b"abc", b"de")))
+    assert uploads.status(upload_id)["offset"] == 3
+
+
+def test_resumable_upload_ids_and_cleanup(tmp_path, monkeypatch):
+    import config
+    from pipeline.uploads import ResumableUploads, UploadNotFound
+    monkeypatch.setattr(config, "MAX_MD_UPLOAD_MB", 1)
+    uploads = ResumableUploads(tmp_path)
+
+    with pytest.raises(UploadNotFound):
+        uploads.status("../../etc/passwd")
+    with pytest.raises(UploadTooLarge):
+        uploads.init("big.md", 2 * 1024 * 1024, {})
+
+    uploads.init("rec.m4a", 10, {})
+    assert uploads.cleanup(max_age_sec=3600) == 0
+    assert uploads.cleanup(max_age_sec=-1) == 1
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_resumable_upload_locks_released_and_writes_off_loop(tmp_path, monkeypatch):
+    import threading
+    from pipeline import uploads as uploads_mod
+    from pipeline.uploads import ResumableUploads, UploadNotFound
+    uploads = ResumableUploads(tmp_path)
+    writer_threads = []
+    write_flush = uploads_mod._write_flush
+
+    def recording_write(f, chunk):
+        writer_threads.append(threading.current_thread())
+        write_flush(f, chunk)
+
+    monkeypatch.setattr(uploads_mod, "_write_flush", recording_write)
+
+    with pytest.raises(UploadNotFound):
+        asyncio.run(uploads.append("0" * 32, 0, _chunks(b"abc")))
+    assert uploads._locks == {}
+
+    done = uploads.init("rec.m4a", 3, {})["upload_id"]
+    asyncio.run(uploads.append(done, 0, _chunks(b"abc")))
+    assert writer_threads and threading.main_thread() not in writer_threads
+    asyncio.run(uploads.finalize(done, tmp_path / "job.m4a"))
+    assert done not in uploads._locks
+
+    stale = uploads.init("rec.m4a", 10, {})["upload_id"]
+    asyncio.run(uploads.append(stale, 0, _chunks(b"abc")))
+    assert uploads.cleanup(max_age_sec=-1) == 1
+    assert uploads._locks == {}
+
+
+def test_resumable_finalize_waits_for_in_flight_append(tmp_path):
+    from pipeline.uploads import ResumableUploads, UploadNotFound
+    uploads = ResumableUploads(tmp_path)
+    data = b"abcdef"
+    upload_id = uploads.init("rec.m4a", len(data), {})["upload_id"]
+
+    async def scenario():
+        first_written = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_chunks():
+            yield b"abc"
+            first_written.set()
+            await release.wait()
+            yield b"def"
+
+        appending = asyncio.create_task(uploads.append(upload_id, 0, slow_chunks()))
+        await first_written.wait()
+        # 쓰는 중에 finalize 두 번: 첫 번째는 append가 끝난 뒤 전체를 옮기고, 두 번째는 이미 없음
+        finalizing = [asyncio.create_task(uploads.finalize(upload_id, tmp_path / name))
+                      for name in ("job.m4a", "again.m4a")]
+        await asyncio.sleep(0.01)
+        assert not any(t.done() for t in finalizing)
+        release.set()
+        return await appending, await asyncio.gather(*finalizing, return_exceptions=True)
+
+    offset, (first, second) = asyncio.run(scenario())
+
+    assert offset == 6
+    assert first == (6, hashlib.sha256(data).hexdigest())
+    assert isinstance(second, UploadNotFound)
+    assert (tmp_path / "job.m4a").read_bytes() == data
+    assert uploads._locks == {}
+
+
+def _upload_request(headers: dict, method: str = "POST", path: str = "/upload"):
+    from starlette.requests import Request
+    return Request({
+        "type": "http", "method": method, "path": path, "query_string": b"",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+    })
+
+
+def test_upload_size_checked_before_body_is_read(monkeypatch):
+    import config
+    import main
+    monkeypatch.setattr(config, "MAX_UPLOAD_MB", 1)
+    monkeypatch.setattr(config, "MAX_MD_UPLOAD_MB", 1)
+    passed = []
+
+    async def call_next(request):
+        passed.append(request.url.path)
+        return "handler"
+
+    def run(headers, **kw):
+        return asyncio.run(main.upload_size_middleware(_upload_request(headers, **kw), call_next))
+
+    too_big = run({"content-length": str(2 * 1024 * 1024)})
+    assert too_big.status_code == 413 and passed == []
+    assert run({}).status_code == 411
+    assert run({"content-length": "1000"}) == "handler"
+    assert run({}, path="/uploads") == "handler"  # 이어받기 업로드는 청크별로 검사
@@ -0,0 +1,160 @@
+"""LLM 토큰 예산과 사용량(토큰·호출 시간) 집계 테스트."""
+import pytest
+
+from pipeline import analyzer, usage
+
+RESPONSE = "PURPOSE: 배포 일정 확정\n\nDECISIONS:\n- 3월 20일 배포\n"
+
+provider_usage = pytest.mark.parametrize(
+    "fake_llm", [{"reply": RESPONSE, "usage": {"input_tokens": 812, "output_tokens": 64}}], indirect=True)
+
+
+def test_meter_aggregates_by_provider_and_persists(tmp_path):
+    changes = []
+    meter = usage.UsageMeter(tmp_path / "llm_usage.json", on_change=changes.append)
+    meter.record("openai", "gpt-4o-mini", input_tokens=100, output_tokens=20, latency_sec=1.5)
+    meter.record("openai", "gpt-4o-mini", input_tokens=50, output_tokens=10, latency_sec=0.5, estimated=True)
+    meter.record("gemini", "gemini-2.0-flash", cached=True)
+
+    snap = meter.snapshot()
+    assert (snap["calls"], snap["cache_hits"], snap["estimated_calls"]) == (2, 1, 1)
+    assert (snap["input_tokens"], snap["output_tokens"], snap["latency_sec"]) == (150, 30, 2.0)
+    assert snap["by_provider"]["openai/gpt-4o-mini"]["calls"] == 2
+    assert snap["by_provider"]["gemini/gemini-2.0-flash"] == {
+        "calls": 0, "cache_hits": 1, "input_tokens": 0, "output_tokens": 0, "latency_sec": 0.0,
+    }
+    assert changes[-1] == snap
+    assert usage.UsageMeter(tmp_path / "llm_usage.json").snapshot() == snap
+
+
+@provider_usage
+def test_provider_usage_recorded_per_job_and_in_totals(fake_llm):
+    meter = usage.UsageMeter()
+    analyzer.analyze_transcript("배포 일정 논의", usage=meter)
+
+    snap = meter.snapshot()
+    assert snap["estimated_input_tokens"] == analyzer.estimate_tokens("배포 일정 논의")
+    assert (snap["calls"], snap["input_tokens"], snap["output_tokens"]) == (1, 812, 64)
+    assert snap["estimated_calls"] == 0 and "openai/gpt-4o-mini" in snap["by_provider"]
+
+    # 같은 요청은 캐시에서 — 호출 없이 캐시 적중만 기록
+    analyzer.analyze_transcript("배포 일정 논의", usage=meter)
+    assert len(fake_llm.calls) == 1
+    assert meter.snapshot()["cache_hits"] == 1
+    totals = usage.get_usage_totals().snapshot()
+    assert (totals["calls"], totals["cache_hits"], totals["input_tokens"]) == (1, 1, 812)
+
+
+@provider_usage
+def test_stream_usage_from_final_chunk(fake_llm):
+    meter = usage.UsageMeter()
+    analyzer.analyze_transcript("배포 일정 논의", on_partial=lambda s: None, usage=meter)
+    assert fake_llm.openai[0]["stream_options"] == {"include_usage": True}
+    assert meter.snapshot()["input_tokens"] == 812
+
+
+@provider_usage
+def test_missing_provider_usage_is_estimated(fake_llm):
+    fake_llm.usage = None
+    meter = usage.UsageMeter()
+    analyzer.analyze_transcript("배포 일정 논의", usage=meter)
+    snap = meter.snapshot()
+    assert snap["estimated_calls"] == 1
+    assert snap["input_tokens"] > 0 and snap["output_tokens"] == analyzer.estimate_tokens(RESPONSE)
+
+
+def test_token_budget_forces_map_reduce_and_meters_worker_threads(monkeypatch, tmp_path):
+    import config
+    monkeypatch.setattr(usage, "_totals", usage.UsageMeter(tmp_path / "llm_usage.json"))
+    monkeypatch.setattr(config, "ANALYSIS_CHUNK_CHARS", 0)
+    monkeypatch.setattr(config, "ANALYSIS_MAP_WORKERS", 3)
+    monkeypatch.setattr(config, "LLM_INPUT_TOKEN_BUDGET", 10)
+    estimate = analyzer.estimate_tokens
+    chunks = []
+
+    def fake_single(text, category, context):
+        chunks.append(text)
+        usage.record_call("openai", "m", input_tokens=estimate(text))
+        return {"key_points": [text[:1]]}
+
+    monkeypatch.setattr(analyzer, "_analyze_single", fake_single)
+    text = "가나다라마바사. " * 6  # 약 34 토큰 → 예산 10 토큰 구간으로
+    meter = usage.UsageMeter()
+
+    analyzer.analyze_transcript(text, category="voice_memo", usage=meter)
+
+    assert len(chunks) >= 3
+    assert all(estimate(c) <= 10 for c in chunks)
+    assert meter.snapshot()["calls"] == len(chunks)
+
+
+def test_budget_zero_is_unlimited(monkeypatch):
+    import config
+    monkeypatch.setattr(config, "ANALYSIS_CHUNK_CHARS", 0)
+    monkeypatch.setattr(config, "LLM_INPUT_TOKEN_BUDGET", 0)
+    calls = []
+    monkeypatch.setattr(analyzer, "_analyze_single", lambda t, c, ctx, on_partial=None: calls.append(t) or {})
+    analyzer.analyze_transcript("가" * 1000)
+    assert len(calls) == 1
+
+
+def test_job_usage_in_status_and_metrics(monkeypatch, tmp_path):
+    import main
+    monkeypatch.setattr(usage, "_totals", usage.UsageMeter(tmp_path / "llm_usage.json"))
+    job_id = "test-llm-usage"
+    main.job_status[job_id] = {"status": "transcribing", "logs": [], "category": "meeting"}
+    seen = {}
+
+    def fake_analyze(text, category="meeting", context="", segments=None, on_partial=None, usage=None):
+        with analyzer.llm_usage.metering(usage):
+            analyzer.llm_usage.record_call("openai", "m", input_tokens=120, output_tokens=30, latency_sec=2.0)
+        seen.update(main._light_status(job_id))
+        return {"purpose": "배포"}
+
+    monkeypatch.setattr(main, "analyze_transcript", fake_analyze)
+    try:
+        transcript = {"full_text": "안녕", "segments": [{"speaker": "A", "text": "안녕"}], "duration": "00:01"}
+        assert main._analyze_for_review(job_id, transcript, "meeting", "", "", "", "a.m4a", "audio", "")
+
+        assert seen["llm_usage"]["input_tokens"] == 120
+        job = main.job_status[job_id]
+        assert job["llm_usage"]["output_tokens"] == 30
+        assert any("LLM 사용량" in line for line in job["logs"])
+    finally:
+        del main.job_status[job_id]
+
+    metrics = main.get_metrics()
+    assert set(metrics) == {"llm_usage", "api_latency", "breakers", "queue"}
+    assert metrics["llm_usage"]["calls"] == 1
+
+
+def _turns(n_sentences, turn_len):
+    """turn_len 문장마다 화자가 바뀌는 세그먼트 (turn_len >= n_sentences면 화자 분리 없는 전사본과 같음)."""
+    return [{"timestamp": "00:00", "speaker": "AB"[i // turn_len % 2],
+             "text": f"{i}번 안건은 담당자가 다음 주까지 검토합니다."} for i in range(n_sentences)]
+
+
+@pytest.mark.parametrize("turn_len", [300, 40])
+def test_over_budget_transcript_split_within_budget_through_review(monkeypatch, tmp_path, turn_len):
+    import config
+    import main
+    monkeypatch.setattr(usage, "_totals", usage.UsageMeter(tmp_path / "llm_usage.json"))
+    monkeypatch.setattr(config, "TRANSCRIPT_COMPACT", False)
+    monkeypatch.setattr(config, "ANALYSIS_CHUNK_CHARS", 0)
+    monkeypatch.setattr(config, "ANALYSIS_MAP_WORKERS", 2)
+    monkeypatch.setattr(config, "LLM_INPUT_TOKEN_BUDGET", 1000)
+    chunks = []
+    monkeypatch.setattr(analyzer, "_analyze_single",
+                        lambda text, category, context: chunks.append(text) or {"key_points": [text[:2]]})
+    segs = _turns(300, turn_len)
+    transcript = {"full_text": " ".join(s["text"] for s in segs), "segments": segs, "duration": "30:00"}
+    job_id = "test-budget-review"
+    main.job_status[job_id] = {"status": "transcribing", "logs": []}
+    try:
+        assert main._analyze_for_review(job_id, transcript, "meeting", "", "", "", "a.m4a", "audio", "")
+        # 예산 초과로 압축은 강제되지만 (한 화자 발언이 한 세그먼트로 합쳐짐) 구간은 예산 안
+        assert "compaction" in main.job_status[job_id]
+    finally:
+        del main.job_status[job_id]
+    assert len(chunks) >= 5
+    assert all(analyzer.estimate_tokens(c) <= 1000 for c in chunks)